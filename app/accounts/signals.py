@@ -1,11 +1,12 @@
 # User / Group / Permission signals go here
 # set_up_coordinator / tear_down_coordinator
 from django.contrib.auth.models import Group
+from django.db import transaction
 from django.db.models.signals import m2m_changed, pre_save
 from django.dispatch import receiver
 
 from core.models import Issue
-from case.middleware import COORDINATOR_GROUPS
+from case.middleware import COORDINATOR_GROUPS, clear_group_names_cache
 from accounts.models import User, CaseGroups
 from microsoft.service import (
     remove_user_from_case,
@@ -18,6 +19,8 @@ from microsoft.service import (
 
 POST_ADD = "post_add"
 POST_REMOVE = "post_remove"
+POST_CLEAR = "post_clear"
+PRE_CLEAR = "pre_clear"
 
 
 @receiver(pre_save, sender=User)
@@ -40,10 +43,21 @@ def pre_save_user(sender, instance, **kwargs):
 @receiver(m2m_changed, sender=User.groups.through)
 def post_save_group(sender, instance, action, **kwargs):
     if kwargs.get("reverse"):
-        # Do nothing if it's a Group instance rather than a User.
+        # The group's users were changed, so only clear their cached group names.
+        if action in (POST_ADD, POST_REMOVE):
+            user_pks = list(kwargs["pk_set"])
+            transaction.on_commit(lambda: clear_group_names_cache(user_pks))
+        elif action == PRE_CLEAR:
+            user_pks = list(instance.user_set.values_list("pk", flat=True))
+            transaction.on_commit(lambda: clear_group_names_cache(user_pks))
+
         return
 
     user = instance
+    if action in (POST_ADD, POST_REMOVE, POST_CLEAR):
+        # Clear once committed, so that a concurrent request can't cache the old groups.
+        transaction.on_commit(lambda: clear_group_names_cache([user.pk]))
+
     if action == POST_ADD:
         if not user.is_active:
             return
@@ -2,8 +2,13 @@
 Test authentication
 """
 import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from accounts.models import CaseGroups
+from case.middleware import annotate_group_access
 from core.factories import UserFactory
 
 
@@ -21,3 +26,30 @@ def test_logout(client):
     assert resp.url == reverse("login")
     # Sets session ID to empty string
     resp.cookies["sessionid"].value == ""
+
+
+@pytest.mark.django_db
+def test_group_access_cached(django_capture_on_commit_callbacks):
+    """
+    A user's groups are cached between requests, until their groups change.
+    """
+    user = UserFactory()
+    annotate_group_access(user)
+    assert not user.is_coordinator_or_better
+    with CaptureQueriesContext(connection) as ctx:
+        annotate_group_access(user)
+
+    assert len(ctx.captured_queries) == 0
+
+    coordinators = Group.objects.get(name=CaseGroups.COORDINATOR)
+    with django_capture_on_commit_callbacks(execute=True):
+        coordinators.user_set.add(user)
+
+    annotate_group_access(user)
+    assert user.is_coordinator_or_better
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.groups.clear()
+
+    annotate_group_access(user)
+    assert not user.is_coordinator_or_better
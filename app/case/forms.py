@@ -1,11 +1,14 @@
+import re
+
 from django import forms
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.forms.fields import BooleanField
-from django.db.models import Q
+from django.db.models import F
 from django.core.exceptions import ValidationError
 
 from accounts.models import User
 from core.models import Issue, Tenancy
-from core.models.issue import CaseTopic
+from core.models.issue import CaseStage, CaseTopic, SEARCH_CONFIG
 from case.utils import DynamicTableForm, SingleChoiceField
 
 
@@ -81,7 +84,17 @@ class IssueSearchForm(forms.ModelForm):
         self.fields["stage"]._choices = [("", "-")] + self.fields["stage"]._choices
         self.fields["search"] = forms.CharField(required=False)
 
+    def is_text_search(self):
+        """
+        Returns True if the issues will be ranked by relevance to a text search.
+        """
+        return get_search_query(self.data.get("search") or "") is not None
+
     def search(self, issue_qs):
+        """
+        Returns filtered issues, newest first or ranked by relevance for text searches.
+        """
+        issue_qs = issue_qs.order_by("-created_at")
         for k, v in self.data.items():
             if k == "search" or k not in self.fields:
                 continue
@@ -96,32 +109,54 @@ class IssueSearchForm(forms.ModelForm):
             if is_field_valid:
                 issue_qs = issue_qs.filter(**{k: filter_value})
 
-        search = self.data.get("search")
-        if search:
-            search_parts = search.split(" ")
-            search_query = None
-            for search_part in search_parts:
-                part_query = (
-                    Q(paralegal__first_name__icontains=search_part)
-                    | Q(paralegal__last_name__icontains=search_part)
-                    | Q(paralegal__email__icontains=search_part)
-                    | Q(client__first_name__icontains=search_part)
-                    | Q(client__last_name__icontains=search_part)
-                    | Q(client__email__icontains=search_part)
-                    | Q(fileref__icontains=search_part)
-                )
-                if search_query:
-                    search_query |= part_query
-                else:
-                    search_query = part_query
-
-            issue_qs = issue_qs.filter(search_query)
+        search_query = get_search_query(self.data.get("search") or "")
+        if search_query:
+            issue_qs = (
+                issue_qs.filter(search_vector=search_query)
+                .annotate(search_rank=SearchRank(F("search_vector"), search_query))
+                .order_by("-search_rank", "-created_at")
+            )
 
         return issue_qs
 
 
-class LawyerFilterForm(forms.Form):
+def get_search_query(search: str):
+    """
+    Returns a prefix search query matching any word in the search text,
+    so that "jo smi" finds "John Smith", or None if there is nothing to search for.
+    """
+    terms = []
+    for search_part in search.split():
+        # Strip out tsquery operators and quotes, keep email and fileref characters.
+        term = re.sub(r"[^\w@.+-]", "", search_part).lower()
+        if term:
+            terms.append(f"'{term}':*")
+
+    if terms:
+        return SearchQuery(" | ".join(terms), config=SEARCH_CONFIG, search_type="raw")
+
+
+class ReviewFilterForm(forms.Form):
 
     lawyer = forms.ModelChoiceField(
-        queryset=User.objects.filter(groups__name="Lawyer"), empty_label="All lawyers"
+        queryset=User.objects.filter(groups__name="Lawyer"),
+        empty_label="All lawyers",
+        required=False,
+    )
+    stage = forms.ChoiceField(
+        choices=[("", "All stages"), *CaseStage.CHOICES], required=False
     )
+
+    def filter(self, issues):
+        if not self.is_valid():
+            return issues
+
+        lawyer = self.cleaned_data["lawyer"]
+        if lawyer:
+            issues = issues.filter(lawyer=lawyer)
+
+        stage = self.cleaned_data["stage"]
+        if stage:
+            issues = issues.filter(stage=stage)
+
+        return issues
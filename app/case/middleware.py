@@ -1,6 +1,9 @@
 """
 https://docs.djangoproject.com/en/3.2/topics/http/middleware/
 """
+
+from django.core.cache import cache
+
 from accounts.models import CaseGroups
 
 ADMIN_GROUPS = [CaseGroups.ADMIN]
@@ -8,24 +11,61 @@ COORDINATOR_GROUPS = [CaseGroups.ADMIN, CaseGroups.COORDINATOR]
 PARALEGAL_GROUPS = [CaseGroups.ADMIN, CaseGroups.COORDINATOR, CaseGroups.PARALEGAL]
 
 
+# How long to cache each user's group names, changes to their groups clear the cache.
+GROUP_CACHE_SECONDS = 60 * 10
+
+
 def annotate_group_access(user):
-    _is_superuser = user.is_superuser
-    group_names = [g.name for g in user.groups.all()]
+    group_names = get_group_names(user)
+    for name, value in get_group_access(user.is_superuser, group_names).items():
+        setattr(user, name, value)
+
+
+def get_group_access(is_superuser, group_names):
+    """
+    Returns the permission flags for a user with the given groups.
+    """
+    _is_superuser = is_superuser
     _is_admin_or_better = any([g in ADMIN_GROUPS for g in group_names])
     _is_coordinator_or_better = any([g in COORDINATOR_GROUPS for g in group_names])
     _is_paralegal_or_better = any([g in PARALEGAL_GROUPS for g in group_names])
-    # User has permission or higher permission
-    user.is_admin_or_better = _is_superuser or _is_admin_or_better
-    user.is_coordinator_or_better = _is_superuser or _is_coordinator_or_better
-    user.is_paralegal_or_better = _is_superuser or _is_paralegal_or_better
-    # User's best permission is this permission
-    user.is_admin = CaseGroups.ADMIN in group_names and not _is_superuser
-    user.is_coordinator = CaseGroups.COORDINATOR in group_names and not (
-        _is_admin_or_better or _is_superuser
-    )
-    user.is_paralegal = (CaseGroups.PARALEGAL in group_names) and not (
-        _is_coordinator_or_better or _is_superuser
-    )
+    return {
+        # User has permission or higher permission
+        "is_admin_or_better": _is_superuser or _is_admin_or_better,
+        "is_coordinator_or_better": _is_superuser or _is_coordinator_or_better,
+        "is_paralegal_or_better": _is_superuser or _is_paralegal_or_better,
+        # User's best permission is this permission
+        "is_admin": CaseGroups.ADMIN in group_names and not _is_superuser,
+        "is_coordinator": CaseGroups.COORDINATOR in group_names
+        and not (_is_admin_or_better or _is_superuser),
+        "is_paralegal": (CaseGroups.PARALEGAL in group_names)
+        and not (_is_coordinator_or_better or _is_superuser),
+    }
+
+
+def get_group_names(user):
+    """
+    Returns the names of the user's groups, cached so that every request doesn't query them.
+    Superuser and active flags are read from the user, so they are never stale.
+    """
+    if "groups" in getattr(user, "_prefetched_objects_cache", {}):
+        return [g.name for g in user.groups.all()]
+
+    cache_key = _get_group_cache_key(user.pk)
+    group_names = cache.get(cache_key)
+    if group_names is None:
+        group_names = list(user.groups.values_list("name", flat=True))
+        cache.set(cache_key, group_names, GROUP_CACHE_SECONDS)
+
+    return group_names
+
+
+def clear_group_names_cache(user_pks):
+    cache.delete_many([_get_group_cache_key(pk) for pk in user_pks])
+
+
+def _get_group_cache_key(user_pk):
+    return f"user-groups-{user_pk}"
 
 
 def annotate_group_access_middleware(get_response):
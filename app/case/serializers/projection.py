@@ -0,0 +1,399 @@
+"""
+Fast read-only serialization for list endpoints.
+
+Builds the same data as the DRF serializers from values() rows instead of model instances.
+Dates are formatted by the database and URLs are built from a single reverse() per view.
+"""
+
+from collections import defaultdict
+
+from django.db.models import CharField, DateTimeField, F, Func, QuerySet, Value
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+
+from accounts.models import User
+from case.middleware import get_group_access
+from core.models import Client, Issue, Person
+from core.models.person import SupportContactPreferences
+from emails.models import Email, EmailAttachment
+from emails.sanitize import SANITIZER_VERSION
+
+# Postgres versions of the strftime formats used by the serializers.
+LOCAL_DATE_FORMAT = "DD/MM/YY"  # LocalDateField
+LOCAL_TIME_FORMAT = 'DD/MM/YY "at" FMHH12AM'  # LocalTimeField
+DATE_OF_BIRTH_FORMAT = "DD/MM/YYYY"  # ClientSerializer.date_of_birth
+
+# Arguments used to reverse URL templates, which must match the URL's path converter.
+INT_PLACEHOLDER = 987654321
+UUID_PLACEHOLDER = "00000000-0000-4000-8000-000000000000"
+SLUG_PLACEHOLDER = "slug-placeholder"
+
+ISSUE_FIELDS = (
+    "id",
+    "topic",
+    "stage",
+    "outcome",
+    "outcome_notes",
+    "provided_legal_services",
+    "fileref",
+    "paralegal_id",
+    "lawyer_id",
+    "client_id",
+    "support_worker_id",
+    "is_open",
+    "is_sharepoint_set_up",
+    "actionstep_id",
+)
+USER_FIELDS = (
+    "id",
+    "first_name",
+    "last_name",
+    "is_active",
+    "email",
+    "case_capacity",
+    "is_intern",
+    "is_superuser",
+    "ms_account_created_at",
+)
+CLIENT_FIELDS = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "date_of_birth",
+    "phone_number",
+    "employment_status",
+    "weekly_income",
+    "gender",
+    "centrelink_support",
+    "eligibility_notes",
+    "requires_interpreter",
+    "primary_language_non_english",
+    "primary_language",
+    "is_aboriginal_or_torres_strait_islander",
+    "rental_circumstances",
+    "number_of_dependents",
+    "eligibility_circumstances",
+    "referrer_type",
+    "referrer",
+    "notes",
+)
+PERSON_FIELDS = (
+    "id",
+    "full_name",
+    "email",
+    "address",
+    "phone_number",
+    "support_contact_preferences",
+)
+EMAIL_FIELDS = (
+    "id",
+    "cc_addresses",
+    "created_at",
+    "from_address",
+    "html",
+    "text",
+    "sanitized_html",
+    "sanitizer_version",
+    "sender_id",
+    "state",
+    "subject",
+    "to_address",
+    "thread_slug",
+)
+ATTACHMENT_FIELDS = ("id", "email_id", "file", "sharepoint_state", "content_type")
+
+
+def local_time_format(field, fmt):
+    """
+    Formats a datetime field in the current timezone, using Postgres' to_char.
+    """
+    local_time = Func(
+        F(field),
+        Value(timezone.get_current_timezone_name()),
+        template="(%(expressions)s)",
+        arg_joiner=" AT TIME ZONE ",
+        output_field=DateTimeField(),
+    )
+    return Func(local_time, Value(fmt), function="to_char", output_field=CharField())
+
+
+class UrlTemplate:
+    """
+    Builds the URLs of many objects from a single reverse().
+    """
+
+    def __init__(self, view_name, *args, placeholder=INT_PLACEHOLDER):
+        url = reverse(view_name, args=(*args, placeholder))
+        self.prefix, self.suffix = url.rsplit(str(placeholder), 1)
+
+    def format(self, arg):
+        return f"{self.prefix}{arg}{self.suffix}"
+
+
+def project_issues(issues):
+    """
+    Returns the same data as IssueDetailSerializer(issues, many=True).data.
+    """
+    rows = _get_rows(
+        issues,
+        *ISSUE_FIELDS,
+        created_at_local=local_time_format("created_at", LOCAL_DATE_FORMAT),
+    )
+    users = _get_users_by_id(
+        {r["paralegal_id"] for r in rows} | {r["lawyer_id"] for r in rows}
+    )
+    clients = _get_clients_by_id({r["client_id"] for r in rows})
+    people = _get_people_by_id({r["support_worker_id"] for r in rows})
+    url = UrlTemplate("case-detail-view", placeholder=UUID_PLACEHOLDER)
+    topic_choices = _get_choices(Issue, "topic")
+    stage_choices = _get_choices(Issue, "stage")
+    outcome_choices = _get_choices(Issue, "outcome")
+    return [
+        {
+            "id": str(row["id"]),
+            "topic": row["topic"],
+            "topic_display": _get_display(topic_choices, row["topic"]),
+            "stage_display": _get_display(stage_choices, row["stage"]),
+            "stage": row["stage"],
+            "outcome": row["outcome"],
+            "outcome_display": _get_display(outcome_choices, row["outcome"]),
+            "outcome_notes": row["outcome_notes"],
+            "provided_legal_services": row["provided_legal_services"],
+            "fileref": row["fileref"],
+            "paralegal": users.get(row["paralegal_id"]),
+            "lawyer": users.get(row["lawyer_id"]),
+            "is_open": row["is_open"],
+            "is_sharepoint_set_up": row["is_sharepoint_set_up"],
+            "actionstep_id": row["actionstep_id"],
+            "created_at": row["created_at_local"],
+            "url": url.format(row["id"]),
+            "client": clients[row["client_id"]],
+            "support_worker": people.get(row["support_worker_id"]),
+        }
+        for row in rows
+    ]
+
+
+def project_users(users):
+    """
+    Returns the same data as UserSerializer(users, many=True).data.
+    """
+    rows = _get_rows(
+        users,
+        *USER_FIELDS,
+        created_at_local=local_time_format("date_joined", LOCAL_DATE_FORMAT),
+    )
+    user_groups = defaultdict(list)
+    memberships = User.groups.through.objects.filter(
+        user_id__in=[row["id"] for row in rows]
+    ).values_list("user_id", "group__name")
+    for user_id, group_name in memberships:
+        user_groups[user_id].append(group_name)
+
+    url = UrlTemplate("account-user-detail")
+    fifteen_minutes_ago = timezone.now() - timezone.timedelta(minutes=15)
+    results = []
+    for row in rows:
+        group_names = user_groups[row["id"]]
+        ms_account_created_at = row["ms_account_created_at"]
+        full_name = f"{row['first_name']} {row['last_name']}".strip()
+        results.append(
+            {
+                "id": row["id"],
+                "first_name": row["first_name"],
+                "last_name": row["last_name"],
+                "full_name": full_name.title(),
+                "is_active": row["is_active"],
+                "email": row["email"],
+                "case_capacity": row["case_capacity"],
+                "is_intern": row["is_intern"],
+                "is_superuser": row["is_superuser"],
+                "created_at": row["created_at_local"],
+                "groups": group_names,
+                "url": url.format(row["id"]),
+                **get_group_access(row["is_superuser"], group_names),
+                "is_ms_account_set_up": ms_account_created_at
+                and (ms_account_created_at < fifteen_minutes_ago),
+            }
+        )
+
+    return results
+
+
+def project_people(people):
+    """
+    Returns the same data as PersonSerializer(people, many=True).data.
+    """
+    rows = _get_rows(people, *PERSON_FIELDS)
+    url = UrlTemplate("person-detail")
+    contact_choices = SupportContactPreferences.choices
+    contact_labels = dict(contact_choices)
+    results = []
+    for row in rows:
+        contact_prefs = row["support_contact_preferences"]
+        results.append(
+            {
+                "id": row["id"],
+                "full_name": row["full_name"],
+                "email": row["email"],
+                "address": row["address"],
+                "phone_number": row["phone_number"],
+                "url": url.format(row["id"]),
+                "support_contact_preferences": {
+                    "display": contact_labels[contact_prefs] if contact_prefs else "",
+                    "value": contact_prefs,
+                    "choices": contact_choices,
+                },
+            }
+        )
+
+    return results
+
+
+def project_email_threads(issue, emails):
+    """
+    Returns the same data as EmailThreadSerializer(threads, many=True).data
+    for the threads of the given emails, most recent first.
+    """
+    rows = _get_rows(
+        emails.order_by("created_at"),
+        *EMAIL_FIELDS,
+        created_at_local=local_time_format("created_at", LOCAL_TIME_FORMAT),
+        processed_at_local=local_time_format("processed_at", LOCAL_TIME_FORMAT),
+    )
+    senders = _get_users_by_id({row["sender_id"] for row in rows})
+    attachments = defaultdict(list)
+    attachment_rows = EmailAttachment.objects.filter(
+        email_id__in=[row["id"] for row in rows]
+    ).values(*ATTACHMENT_FIELDS)
+    storage = EmailAttachment._meta.get_field("file").storage
+    for att in attachment_rows.order_by("pk"):
+        attachments[att["email_id"]].append(
+            {
+                "id": att["id"],
+                "url": storage.url(att["file"]),
+                "name": att["file"],
+                "sharepoint_state": att["sharepoint_state"],
+                "content_type": att["content_type"],
+            }
+        )
+
+    edit_url = UrlTemplate("case-email-edit", issue.pk)
+    thread_url = UrlTemplate(
+        "case-email-thread", issue.pk, placeholder=SLUG_PLACEHOLDER
+    )
+    draft_url = reverse("case-email-draft", args=(issue.pk,))
+    threads = {}
+    for row in rows:
+        email = {
+            "id": row["id"],
+            "cc_addresses": row["cc_addresses"],
+            "created_at": row["created_at_local"],
+            "processed_at": row["processed_at_local"],
+            "from_address": row["from_address"],
+            "html": _get_display_html(row),
+            "text": row["text"],
+            "pk": row["id"],
+            "sender": senders.get(row["sender_id"]),
+            "state": row["state"],
+            "subject": row["subject"],
+            "to_address": row["to_address"],
+            "reply_url": draft_url + "?" + urlencode({"parent": row["id"]}),
+            "attachments": attachments[row["id"]],
+            "edit_url": edit_url.format(row["id"]),
+        }
+        slug = row["thread_slug"]
+        if slug not in threads:
+            threads[slug] = {
+                "emails": [],
+                "subject": row["subject"] or "No Subject",
+                "slug": slug,
+                "url": thread_url.format(slug),
+            }
+
+        # Emails are oldest first, so the last email of a thread is the most recent.
+        threads[slug]["emails"].insert(0, email)
+        threads[slug]["most_recent"] = row["created_at_local"]
+        threads[slug]["most_recent_at"] = row["created_at"]
+
+    ordered_threads = sorted(
+        threads.values(), key=lambda t: t["most_recent_at"], reverse=True
+    )
+    for thread in ordered_threads:
+        del thread["most_recent_at"]
+
+    return ordered_threads
+
+
+def _get_rows(items, *fields, **expressions):
+    """
+    Returns values() rows for a queryset, or for a list of model instances in the same order.
+    """
+    if isinstance(items, QuerySet):
+        return list(items.prefetch_related(None).values(*fields, **expressions))
+
+    if not items:
+        return []
+
+    pks = [item.pk for item in items]
+    model = type(items[0])
+    rows = model.objects.filter(pk__in=pks).values(*fields, **expressions)
+    rows_by_pk = {row["id"]: row for row in rows}
+    return [rows_by_pk[pk] for pk in pks]
+
+
+def _get_users_by_id(user_ids):
+    users = project_users(User.objects.filter(pk__in=user_ids - {None}))
+    return {user["id"]: user for user in users}
+
+
+def _get_people_by_id(person_ids):
+    people = project_people(Person.objects.filter(pk__in=person_ids - {None}))
+    return {person["id"]: person for person in people}
+
+
+def _get_clients_by_id(client_ids):
+    rows = Client.objects.filter(pk__in=client_ids).values(
+        *CLIENT_FIELDS,
+        date_of_birth_local=local_time_format("date_of_birth", DATE_OF_BIRTH_FORMAT),
+    )
+    url = UrlTemplate("client-detail", placeholder=UUID_PLACEHOLDER)
+    now = timezone.now()
+    clients = {}
+    for row in rows:
+        date_of_birth = row.pop("date_of_birth")
+        date_of_birth_local = row.pop("date_of_birth_local")
+        clients[row["id"]] = {
+            **row,
+            "id": str(row["id"]),
+            "date_of_birth": date_of_birth_local,
+            "age": int((now - date_of_birth).days / 365.25) if date_of_birth else None,
+            "full_name": f"{row['first_name']} {row['last_name']}".strip(),
+            "url": url.format(row["id"]),
+        }
+
+    return clients
+
+
+def _get_display_html(row):
+    if row["sanitizer_version"] == SANITIZER_VERSION:
+        return row["sanitized_html"]
+
+    # Rebuild and store HTML made by an older sanitizer.
+    email = Email(
+        pk=row["id"],
+        html=row["html"],
+        text=row["text"],
+        sanitizer_version=row["sanitizer_version"],
+    )
+    return email.get_display_html()
+
+
+def _get_choices(model, field_name):
+    return dict(model._meta.get_field(field_name).flatchoices)
+
+
+def _get_display(choices, value):
+    return choices.get(value, value)
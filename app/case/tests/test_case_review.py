@@ -0,0 +1,90 @@
+import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.factories import IssueFactory, UserFactory
+from core.models import IssueNote, IssueSummary
+from core.models.issue_note import NoteType
+
+
+@pytest.fixture
+def coordinator_client(client):
+    user = UserFactory(is_superuser=True)
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.django_db
+def test_case_lists_read_issue_summaries(coordinator_client):
+    """
+    The review, checks and inbox pages list cases from the issue summaries.
+    """
+    paralegal = UserFactory()
+    assigned = IssueFactory(paralegal=paralegal, stage="ADVICE", is_open=True)
+    unassigned = IssueFactory(is_open=True)
+    IssueFactory(is_open=False)
+    IssueNote.objects.create(
+        issue=assigned,
+        note_type=NoteType.REVIEW,
+        event=timezone.now() + timezone.timedelta(days=1),
+    )
+    IssueSummary.objects.rebuild()
+
+    resp = coordinator_client.get(reverse("case-review"))
+    assert resp.status_code == 200
+    issues = list(resp.context["issues"])
+    assert [i.pk for i in issues] == [assigned.pk, unassigned.pk]
+    assert issues[0].color == "orange"
+    assert resp.context["alert_count"] == 1
+
+    resp = coordinator_client.get(reverse("case-checks"))
+    assert resp.status_code == 200
+    assert [i.pk for i in resp.context["alert_issues"]] == [assigned.pk]
+
+    resp = coordinator_client.get(reverse("case-inbox"))
+    assert resp.status_code == 200
+    assert [i.pk for i in resp.context["issues"]] == [unassigned.pk]
+
+
+@pytest.mark.django_db
+def test_case_review_buckets(coordinator_client):
+    """
+    Review colours and bucket counts are calculated in the database,
+    and the review list can be filtered by lawyer and stage.
+    """
+    now = timezone.now()
+    lawyer = UserFactory()
+    days_to_review = [8, 5, 2.5, 1, -1, None]
+    for days in days_to_review:
+        issue = IssueFactory(is_open=True, lawyer=lawyer, stage="ADVICE")
+        if days is not None:
+            IssueNote.objects.create(
+                issue=issue,
+                note_type=NoteType.REVIEW,
+                event=now + timezone.timedelta(days=days),
+            )
+
+    IssueFactory(is_open=True, stage="UNSTARTED")
+    IssueSummary.objects.rebuild()
+
+    url = reverse("case-review-search")
+    with CaptureQueriesContext(connection) as ctx:
+        resp = coordinator_client.get(url)
+
+    assert resp.status_code == 200
+    colors = [i.color for i in resp.context["issues"]]
+    assert colors == ["red", "orange", "yellow", "green", "", "", ""]
+    counts = [b["count"] for b in resp.context["buckets"]]
+    assert counts == [1, 1, 1, 1, 1, 2]
+    review_queries = [q for q in ctx.captured_queries if "issuesummary" in q["sql"]]
+    assert len(review_queries) == 3  # Bucket counts, page count and page.
+
+    resp = coordinator_client.get(url, {"stage": "UNSTARTED"})
+    assert [b["count"] for b in resp.context["buckets"]] == [0, 0, 0, 0, 0, 1]
+
+    lawyer.groups.add(Group.objects.get(name="Lawyer"))
+    resp = coordinator_client.get(url, {"lawyer": lawyer.pk})
+    assert len(resp.context["issues"]) == 6
@@ -1,9 +1,12 @@
+from unittest import mock
+
 import pytest
 import pytz
 from datetime import datetime
 
 from core.factories import IssueFactory, EmailFactory
-from emails.models import EmailState
+from emails.models import Email, EmailState
+from emails.sanitize import SANITIZER_VERSION
 
 from case.views.case.email import _get_email_threads, EmailThread
 
@@ -70,3 +73,75 @@ def test_email_thread_aggregation():
     assert threads[0].subject == "A quick question"
     assert threads[0].slug == "a-quick-question"
     assert threads[0].emails == list(reversed(emails[12:13]))
+    # Fetch a single thread
+    threads = _get_email_threads(issue, slug="legal-advice")
+    assert len(threads) == 1
+    assert threads[0].emails == list(reversed(emails[8:12]))
+
+
+@pytest.mark.django_db
+def test_email_thread_reply_headers():
+    """Replies join the thread of the email they reply to, even if the subject changes."""
+    issue = IssueFactory()
+    sent = EmailFactory(
+        issue=issue,
+        state=EmailState.SENT,
+        subject="Your tenancy",
+        message_id="<abc123@fake.anikalegal.com>",
+        created_at=dt(1),
+    )
+    reply = EmailFactory(
+        issue=issue,
+        state=EmailState.INGESTED,
+        subject="Question about my lease",
+        in_reply_to="<abc123@fake.anikalegal.com>",
+        created_at=dt(2),
+    )
+    assert reply.thread_slug == sent.thread_slug == "your-tenancy"
+    threads = _get_email_threads(issue)
+    assert len(threads) == 1
+    assert threads[0].emails == [reply, sent]
+
+
+@pytest.mark.django_db
+def test_email_html_sanitized_on_save():
+    """Email HTML is sanitized once when saved, and lazily for emails saved before that."""
+    issue = IssueFactory()
+    email = EmailFactory(
+        issue=issue,
+        state=EmailState.INGESTED,
+        html='<p onclick="steal()">Hello</p><script>alert(1)</script>',
+    )
+    assert email.sanitized_html == "<p>Hello</p>"
+    assert email.sanitizer_version == SANITIZER_VERSION
+
+    # Simulate an email stored before sanitized HTML was saved.
+    Email.objects.filter(pk=email.pk).update(sanitized_html="", sanitizer_version=0)
+    threads = _get_email_threads(issue)
+    assert threads[0].emails[0].html == "<p>Hello</p>"
+    email.refresh_from_db()
+    assert email.sanitized_html == "<p>Hello</p>"
+    assert email.sanitizer_version == SANITIZER_VERSION
+
+
+@pytest.mark.django_db
+def test_email_html_sanitized_only_when_content_changes():
+    """Saving an email doesn't sanitize its HTML again unless the content has changed."""
+    email = EmailFactory(issue=IssueFactory(), html="<p>Hello</p>")
+    email = Email.objects.get(pk=email.pk)
+    with mock.patch(
+        "emails.models.get_email_html", return_value="<p>Goodbye</p>"
+    ) as mock_get_email_html:
+        email.state = EmailState.SENT
+        email.save()
+        mock_get_email_html.assert_not_called()
+
+        email.html = "<p>Goodbye</p>"
+        email.save()
+        mock_get_email_html.assert_called_once_with("<p>Goodbye</p>", email.text)
+
+        email.refresh_from_db()
+        email.save(update_fields=["html"])
+        mock_get_email_html.assert_called_once()
+
+    assert email.sanitized_html == "<p>Goodbye</p>"
@@ -0,0 +1,111 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.factories import ClientFactory, IssueFactory, UserFactory
+from core.models import Issue
+from case.forms import IssueSearchForm
+
+
+def search(text, **kwargs):
+    form = IssueSearchForm({"search": text, **kwargs})
+    return list(form.search(Issue.objects.all()))
+
+
+@pytest.mark.django_db
+def test_issue_search__client_and_paralegal_prefixes():
+    paralegal = UserFactory(first_name="Alice", last_name="Lee", email="al@anika.org")
+    client = ClientFactory(first_name="John", last_name="Smith", email="js@x.com")
+    issue = IssueFactory(client=client, paralegal=paralegal)
+    other = IssueFactory(
+        client=ClientFactory(first_name="Mary", last_name="Jones", email="mj@y.com")
+    )
+    assert search("smi") == [issue]
+    assert search("ALICE") == [issue]
+    assert search("js@x.com") == [issue]
+    assert search("al@anika.org") == [issue]
+    assert search("mary") == [other]
+    assert search("nobody") == []
+    assert set(search("john mary")) == {issue, other}
+    assert len(search("   ")) == 2
+
+
+@pytest.mark.django_db
+def test_issue_search__fileref():
+    issue = IssueFactory(topic="REPAIRS")
+    IssueFactory(topic="BONDS")
+    assert search(issue.fileref) == [issue]
+    assert len(search(issue.fileref[1:])) == 2
+
+
+@pytest.mark.django_db
+def test_issue_search__ranks_client_above_paralegal():
+    paralegal = UserFactory(first_name="Casey", last_name="Nguyen")
+    client = ClientFactory(first_name="Casey", last_name="Brown")
+    paralegal_issue = IssueFactory(paralegal=paralegal)
+    client_issue = IssueFactory(client=client)
+    assert search("casey") == [client_issue, paralegal_issue]
+
+
+@pytest.mark.django_db
+def test_issue_search__ignores_query_syntax():
+    issue = IssueFactory(client=ClientFactory(first_name="Robin"))
+    assert search("rob'in") == [issue]
+    assert search("&|!():*") == [issue]
+
+
+@pytest.mark.django_db
+def test_issue_search__updated_on_client_and_paralegal_change():
+    client = ClientFactory(first_name="John")
+    paralegal = UserFactory(first_name="Alice")
+    issue = IssueFactory(client=client, paralegal=paralegal)
+    assert search("zed") == []
+
+    client.first_name = "Zed"
+    client.save()
+    assert search("zed") == [issue]
+
+    paralegal.last_name = "Quinn"
+    paralegal.save()
+    assert search("quinn") == [issue]
+
+    paralegal.last_name = "Other"
+    paralegal.save(update_fields=["last_login"])
+    assert search("quinn") == [issue]
+
+
+@pytest.mark.django_db
+def test_issue_search__only_rebuilt_when_search_fields_change():
+    issue = IssueFactory(client=ClientFactory(first_name="Zebedee"))
+    issue = Issue.objects.get(pk=issue.pk)
+    issue.stage = "ADVICE"
+    with CaptureQueriesContext(connection) as ctx:
+        issue.save()
+
+    assert not any("to_tsvector" in q["sql"] for q in ctx.captured_queries)
+    assert search("zebedee") == [issue]
+
+    issue.client = ClientFactory(first_name="Quillon")
+    issue.save()
+    assert search("quillon") == [issue]
+    assert search("zebedee") == []
+
+    # Saving the same instance again keeps the rebuilt vector.
+    issue.stage = "CLOSED"
+    issue.save()
+    assert search("quillon") == [issue]
+
+
+@pytest.mark.django_db
+def test_case_list_view__text_search_ranked_with_cursor(client):
+    client.force_login(UserFactory(is_superuser=True))
+    paralegal_issue = IssueFactory(paralegal=UserFactory(first_name="Casey"))
+    client_issue = IssueFactory(client=ClientFactory(first_name="Casey"))
+    resp = client.get(
+        reverse("case-list"), {"cursor": "", "search": "casey"}, HTTP_X_REACT="true"
+    )
+    assert resp.status_code == 200
+    ids = [issue["id"] for issue in resp.json()["issues"]]
+    assert ids == [str(client_issue.pk), str(paralegal_issue.pk)]
+    assert resp.json()["total_pages"] == 1
@@ -0,0 +1,74 @@
+import pytest
+from django.test import RequestFactory
+
+from core.factories import IssueFactory, PersonFactory
+from core.models import Issue, Person
+from case.utils import get_cursor_page
+
+
+def get_all_pages(items=None, cursor_key="next_cursor", cursor="", **kwargs):
+    items = Issue.objects.all() if items is None else items
+    kwargs.setdefault("with_count", True)
+    pages = []
+    while cursor is not None:
+        request = RequestFactory().get("/", {"cursor": cursor})
+        page = get_cursor_page(request, items, per_page=2, **kwargs)
+        pages.append(page)
+        cursor = getattr(page, cursor_key)
+
+    return pages
+
+
+@pytest.mark.django_db
+def test_get_cursor_page__walk_forwards_and_backwards():
+    issues = [IssueFactory() for _ in range(5)]
+    # Ensure ties on created_at are broken by id.
+    Issue.objects.filter(pk__in=[i.pk for i in issues[1:3]]).update(
+        created_at=issues[1].created_at
+    )
+    expected = list(Issue.objects.order_by("-created_at", "-id"))
+
+    pages = get_all_pages()
+    assert [p.object_list for p in pages] == [expected[:2], expected[2:4], expected[4:]]
+    assert [p.count for p in pages] == [5, 5, 5]
+    assert pages[0].prev_cursor is None
+    assert pages[-1].next_cursor is None
+
+    back_pages = get_all_pages(cursor_key="prev_cursor", cursor=pages[-1].prev_cursor)
+    assert [p.object_list for p in back_pages] == [expected[2:4], expected[:2]]
+    assert back_pages[0].next_cursor is not None
+
+
+@pytest.mark.django_db
+def test_get_cursor_page__invalid_cursor():
+    issue = IssueFactory()
+    for cursor in ["", "nonsense", "YXxub3R8YQ=="]:
+        request = RequestFactory().get("/", {"cursor": cursor})
+        page = get_cursor_page(request, Issue.objects.all(), per_page=2)
+        assert page.object_list == [issue]
+        assert page.next_cursor is None
+        assert page.prev_cursor is None
+        assert page.count is None
+
+
+@pytest.mark.django_db
+def test_get_cursor_page__ascending_text_field():
+    names = ["Carol | Jones", "Alice Smith", "Bob Brown", "Alice Smith", "Dan Lee"]
+    for name in names:
+        PersonFactory(full_name=name)
+
+    expected = list(Person.objects.order_by("full_name", "pk"))
+    pages, cursor = [], ""
+    while cursor is not None:
+        request = RequestFactory().get("/", {"cursor": cursor})
+        page = get_cursor_page(
+            request,
+            Person.objects.all(),
+            per_page=2,
+            field="full_name",
+            descending=False,
+        )
+        pages.append(page.object_list)
+        cursor = page.next_cursor
+
+    assert pages == [expected[:2], expected[2:4], expected[4:]]
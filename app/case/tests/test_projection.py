@@ -0,0 +1,85 @@
+import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from core.factories import (
+    EmailFactory,
+    IssueFactory,
+    PersonFactory,
+    UserFactory,
+    get_dummy_file,
+)
+from core.models import Issue, Person
+from emails.models import EmailAttachment
+from case.serializers import (
+    EmailThreadSerializer,
+    IssueDetailSerializer,
+    PersonSerializer,
+    UserSerializer,
+)
+from case.serializers.projection import (
+    project_email_threads,
+    project_issues,
+    project_people,
+    project_users,
+)
+from case.views.case.email import DISPLAY_EMAIL_STATES, _get_email_threads
+
+
+@pytest.mark.django_db
+def test_projection_matches_serializers():
+    """
+    Projections build the same data as the DRF serializers they replace.
+    """
+    paralegal = UserFactory(ms_account_created_at=timezone.now())
+    paralegal.groups.add(Group.objects.get(name="Paralegal"))
+    lawyer = UserFactory(is_superuser=True)
+    lawyer.groups.add(Group.objects.get(name="Lawyer"))
+    support_worker = PersonFactory(support_contact_preferences="DIRECT_ONLY")
+    IssueFactory(
+        paralegal=paralegal,
+        lawyer=lawyer,
+        support_worker=support_worker,
+        outcome="SUCCESSFUL",
+    )
+    IssueFactory(client__date_of_birth=None)
+    PersonFactory()
+
+    issues = Issue.objects.order_by("created_at")
+    with CaptureQueriesContext(connection) as ctx:
+        projected_issues = project_issues(issues)
+
+    # Issues, users, user groups, clients and people.
+    assert len(ctx.captured_queries) == 5
+    assert projected_issues == IssueDetailSerializer(issues, many=True).data
+    assert project_issues(list(issues)) == IssueDetailSerializer(issues, many=True).data
+    people = Person.objects.order_by("full_name")
+    assert project_people(people) == PersonSerializer(people, many=True).data
+    users = User.objects.order_by("-date_joined")
+    assert project_users(users) == UserSerializer(users, many=True).data
+
+
+@pytest.mark.django_db
+def test_email_thread_projection_matches_serializer():
+    """
+    Email thread projections build the same data as the EmailThreadSerializer.
+    """
+    issue = IssueFactory()
+    first = EmailFactory(
+        issue=issue, subject="Repairs", state="SENT", processed_at=timezone.now()
+    )
+    EmailFactory(issue=issue, subject="Re: Repairs", state="INGESTED", sender=None)
+    EmailFactory(issue=issue, subject="", state="SENT")
+    EmailFactory(issue=issue, subject="Not sent", state="READY_TO_SEND")
+    EmailAttachment.objects.create(
+        email=first, content_type="image/png", file=get_dummy_file("image.png")
+    )
+
+    emails = issue.email_set.filter(state__in=DISPLAY_EMAIL_STATES)
+    threads = _get_email_threads(issue)
+    expected = EmailThreadSerializer(threads, many=True).data
+    assert len(expected) == 2
+    assert project_email_threads(issue, emails) == expected
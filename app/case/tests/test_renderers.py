@@ -0,0 +1,42 @@
+import json
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from core.factories import IssueFactory
+from case.serializers import IssueDetailSerializer
+from utils.renderers import ORJSONRenderer, dumps_json
+
+
+def test_dumps_json__native_types():
+    uuid = uuid4()
+    now = timezone.datetime(2022, 3, 4, 5, 6, 7, tzinfo=timezone.utc)
+    data = {
+        "id": uuid,
+        "created_at": now,
+        "label": gettext_lazy("Lawyer"),
+        "amount": Decimal("1.5"),
+        1: "int keys",
+    }
+    assert json.loads(dumps_json(data)) == {
+        "id": str(uuid),
+        "created_at": "2022-03-04T05:06:07Z",
+        "label": "Lawyer",
+        "amount": 1.5,
+        "1": "int keys",
+    }
+
+
+@pytest.mark.django_db
+def test_orjson_renderer__matches_drf_renderer():
+    issues = [IssueFactory() for _ in range(3)]
+    data = IssueDetailSerializer(issues, many=True).data
+    data[0]["summary"] = "Line\u2028separator"
+    rendered = ORJSONRenderer().render(data)
+    assert json.loads(rendered) == json.loads(JSONRenderer().render(data))
+    assert b"\\u2028" in rendered
+    assert ORJSONRenderer().render(None) == b""
@@ -2,7 +2,7 @@ from django.utils.datastructures import MultiValueDict
 
 from .fields import MultiChoiceField, SingleChoiceField
 from .dynamic_table_form import DynamicTableForm
-from .pagination import get_page
+from .pagination import get_page, get_cursor_page
 
 
 def merge_form_data(form_data, extra_data):
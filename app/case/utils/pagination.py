@@ -1,5 +1,15 @@
+import base64
+import hashlib
+from datetime import datetime
 from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
 from django.core.paginator import Paginator
+from django.db.models import Q
+
+# How long to cache total counts for cursor pagination.
+COUNT_CACHE_SECONDS = 60
 
 
 def get_page(request, items, per_page, return_qs=True):
@@ -15,3 +25,111 @@ def get_page(request, items, per_page, return_qs=True):
         return page, next_qs, prev_qs
     else:
         return page, next_page_num, prev_page_num
+
+
+class CursorPage:
+    """
+    A page of results from get_cursor_page.
+    Cursors are None when there is no next or previous page.
+    """
+
+    def __init__(self, object_list, next_cursor, prev_cursor, count=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.count = count
+
+
+def get_cursor_page(
+    request, items, per_page, field="created_at", descending=True, with_count=False
+):
+    """
+    Keyset pagination over items keyed on (field, pk), newest first by default.
+    Unlike get_page this does not need a COUNT(*) or an OFFSET scan,
+    so deep pages cost the same as the first one.
+    The page is selected with the "cursor" query param, a missing or invalid cursor
+    returns the first page. If with_count is set then an approximate total is included.
+    """
+    cursor = _decode_cursor(request.GET.get("cursor"), items.model, field)
+    if cursor:
+        is_before, value, pk = cursor
+    else:
+        is_before, value, pk = False, None, None
+
+    # Lookups which select the items after the cursor, in page order.
+    after, order = ("lt", "-") if descending else ("gt", "")
+    if is_before:
+        # Walk backwards from the cursor to get the previous page.
+        after, order = ("gt", "") if descending else ("lt", "-")
+
+    qs = items.order_by(f"{order}{field}", f"{order}pk")
+    if cursor:
+        qs = qs.filter(
+            Q(**{f"{field}__{after}e": value})
+            & (Q(**{f"{field}__{after}": value}) | Q(**{f"pk__{after}": pk}))
+        )
+
+    object_list = list(qs[: per_page + 1])
+    has_more = len(object_list) > per_page
+    object_list = object_list[:per_page]
+    if is_before:
+        object_list.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, bool(cursor)
+
+    next_cursor = None
+    if has_next and object_list:
+        next_cursor = _encode_cursor(False, object_list[-1], field)
+
+    prev_cursor = None
+    if has_prev and object_list:
+        prev_cursor = _encode_cursor(True, object_list[0], field)
+
+    count = get_cached_count(items) if with_count else None
+    return CursorPage(object_list, next_cursor, prev_cursor, count)
+
+
+def get_cached_count(items, timeout=COUNT_CACHE_SECONDS):
+    """
+    Returns the number of items, cached briefly so that paging through
+    a list doesn't count the whole table on every request.
+    """
+    try:
+        sql, params = items.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+
+    query_hash = hashlib.md5(f"{sql}{params}".encode()).hexdigest()
+    cache_key = f"page-count-{query_hash}"
+    count = cache.get(cache_key)
+    if count is None:
+        count = items.count()
+        cache.set(cache_key, count, timeout)
+
+    return count
+
+
+def _encode_cursor(is_before, obj, field):
+    direction = "b" if is_before else "a"
+    value = getattr(obj, field)
+    value = value.isoformat() if isinstance(value, datetime) else str(value)
+    cursor = f"{direction}|{value}|{obj.pk}"
+    return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+
+def _decode_cursor(cursor, model, field):
+    if not cursor:
+        return None
+
+    try:
+        direction, rest = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        )
+        # Values like names can contain "|", but primary keys can't.
+        value, pk = rest.rsplit("|", 1)
+        value = model._meta.get_field(field).to_python(value)
+        pk = model._meta.pk.to_python(pk)
+        return direction == "b", value, pk
+    except (ValueError, ValidationError):
+        return None
@@ -1,8 +1,8 @@
-import json
-
 from django.shortcuts import render
 from django.conf import settings
 
+from utils.renderers import dumps_json
+
 
 def render_react_page(request, title, react_page_name, react_context, public=False):
     react_context.update(
@@ -19,7 +19,7 @@ def render_react_page(request, title, react_page_name, react_context, public=Fal
     )
     context = {
         "SENTRY_JS_DSN": settings.SENTRY_JS_DSN,
-        "react_context": json.dumps(react_context),
+        "react_context": dumps_json(react_context),
         "react_page_name": react_page_name,
         "title": title,
         "public": public,
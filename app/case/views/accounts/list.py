@@ -4,13 +4,16 @@ from rest_framework.decorators import api_view
 from django.urls import reverse
 
 from accounts.models import User
-from case.serializers import UserSerializer
+from case.serializers.projection import project_users
 from case.views.auth import paralegal_or_better_required
 from case.utils.router import Route
 from case.utils.react import render_react_page, is_react_api_call
+from case.utils import get_cursor_page
 
 list_route = Route("list")
 
+PER_PAGE = 20
+
 
 @list_route
 @api_view(["GET"])
@@ -30,8 +33,17 @@ def account_list_view(request):
         if query:
             users = users.filter(query)
 
+    if is_react_api_call(request) and "cursor" in request.GET:
+        page = get_cursor_page(request, users, per_page=PER_PAGE, field="date_joined")
+        data = {
+            "results": project_users(page.object_list),
+            "next_cursor": page.next_cursor,
+            "prev_cursor": page.prev_cursor,
+        }
+        return Response(data=data)
+
     context = {
-        "users": UserSerializer(users, many=True).data,
+        "users": project_users(users),
         "create_url": reverse("account-create"),
     }
     if is_react_api_call(request):
@@ -1,13 +1,9 @@
-import re
 import os
 from typing import List
-from django.utils.text import slugify
 
 from django.http import Http404, HttpResponse
 from django.shortcuts import redirect
 from django.views.decorators.http import require_http_methods
-from django.utils.html import strip_tags
-from html_sanitizer import Sanitizer
 from django.urls import reverse
 from django.template.loader import render_to_string
 from django.utils.safestring import mark_safe
@@ -28,18 +24,19 @@ from emails.models import (
     EmailTemplate,
     EmailAttachment,
     SharepointState,
+    slugify_subject,
 )
 from case.utils.router import Router
 from microsoft.endpoints import MSGraphAPI
-from microsoft.service import save_email_attachment
+from microsoft.service import get_case_files, save_email_attachment
 from case.utils.react import render_react_page
 from case.serializers import (
     IssueDetailSerializer,
     EmailSerializer,
     EmailAttachmentSerializer,
     EmailTemplateSerializer,
-    EmailThreadSerializer,
 )
+from case.serializers.projection import project_email_threads
 from case.views.case.detail import get_detail_urls
 
 
@@ -70,10 +67,10 @@ router.create_route("attach-upload").uuid("pk").pk("email_pk").pk("attach_pk")
 def email_list_view(request, pk):
     issue = _get_issue_for_emails(request, pk)
     case_email_address = build_clerk_address(issue)
-    email_threads = _get_email_threads(issue)
+    emails = issue.email_set.filter(state__in=DISPLAY_EMAIL_STATES)
     context = {
         "issue": IssueDetailSerializer(issue).data,
-        "email_threads": EmailThreadSerializer(email_threads, many=True).data,
+        "email_threads": project_email_threads(issue, emails),
         "case_email_address": case_email_address,
         "urls": get_detail_urls(issue),
         "draft_url": reverse("case-email-draft", args=(issue.pk,)),
@@ -87,9 +84,8 @@ def email_list_view(request, pk):
 def email_thread_view(request, pk, slug):
     issue = _get_issue_for_emails(request, pk)
     case_email_address = build_clerk_address(issue)
-    email_threads = [t for t in _get_email_threads(issue) if t.slug == slug]
+    email_threads = _get_email_threads(issue, slug=slug)
     if email_threads:
-        # Assume thread slugs are unique.
         email_thread = email_threads[0]
     else:
         raise Http404()
@@ -108,27 +104,17 @@ class EmailThread:
         self.emails = [email]
         self.issue = email.issue
         self.subject = email.subject or "No Subject"
-        self.slug = self.slugify_subject(self.subject)
+        self.slug = email.thread_slug
         self.most_recent = email.created_at
 
     @staticmethod
     def slugify_subject(subject):
-        sub = subject or ""
-        sub_cleaned = re.sub(r"re\s*:\s*", "", sub, flags=re.IGNORECASE)
-        sub_cleaned = sub_cleaned or "No Subject"
-        return slugify(sub_cleaned)
+        return slugify_subject(subject)
 
-    def is_email_in_thread(self, email: Email) -> bool:
-        return self.slug == self.slugify_subject(email.subject)
-
-    def add_email_if_in_thread(self, email: Email) -> bool:
-        is_in_thread = self.is_email_in_thread(email)
-        if is_in_thread:
-            self.emails.append(email)
-            if email.created_at > self.most_recent:
-                self.most_recent = email.created_at
-
-        return is_in_thread
+    def add_email(self, email: Email):
+        self.emails.append(email)
+        if email.created_at > self.most_recent:
+            self.most_recent = email.created_at
 
     def __repr__(self):
         return f"EmailThread<{self.subject}>"
@@ -143,37 +129,37 @@ DISPLAY_EMAIL_STATES = [
 ]
 
 
-def _get_email_threads(issue) -> List[EmailThread]:
+def _get_email_threads(issue, slug=None) -> List[EmailThread]:
+    """
+    Returns the issue's email threads, or just the thread with the given slug.
+    """
     email_qs = (
         issue.email_set.filter(state__in=DISPLAY_EMAIL_STATES)
         .prefetch_related("emailattachment_set")
         .order_by("created_at")
     )
-    threads = []
+    if slug is not None:
+        email_qs = email_qs.filter(thread_slug=slug)
+
+    threads = {}
     for email in email_qs:
         _process_email_for_display(email)
+        if email.thread_slug in threads:
+            threads[email.thread_slug].add_email(email)
+        else:
+            threads[email.thread_slug] = EmailThread(email)
 
-        # Assign each email to a thread
-        is_in_a_thread = False
-        for thread in threads:
-            is_in_a_thread = thread.add_email_if_in_thread(email)
-            if is_in_a_thread:
-                break
-
-        if not is_in_a_thread:
-            threads.append(EmailThread(email))
-
-    for thread in threads:
+    for thread in threads.values():
         thread.emails = sorted(thread.emails, key=lambda t: t.created_at, reverse=True)
 
-    return sorted(threads, key=lambda t: t.most_recent, reverse=True)
+    return sorted(threads.values(), key=lambda t: t.most_recent, reverse=True)
 
 
 IMAGE_SUFFIXES = [".jpg", ".jpeg", ".png", ".gif"]
 
 
 def _process_email_for_display(email: Email):
-    email.html = get_email_html(email)
+    email.html = email.get_display_html()
     for attachment in email.emailattachment_set.all():
         attachment.file.display_name = os.path.basename(attachment.file.name)
 
@@ -237,8 +223,7 @@ def email_draft_edit_view(request, pk, email_pk):
         return Response({})
     else:
         # GET request.
-        api = MSGraphAPI()
-        sharepoint_docs = api.folder.get_all_files(f"cases/{issue.id}")
+        sharepoint_docs = get_case_files(issue)
         context = {
             "email_preview_url": reverse(
                 "case-email-preview", args=(issue.pk, email.pk)
@@ -404,51 +389,3 @@ def get_case_emails(issue: Issue):
         )
 
     return emails
-
-
-sanitizer = Sanitizer(
-    {
-        "tags": {
-            "a",
-            "b",
-            "blockquote",
-            "br",
-            "div",
-            "em",
-            "h1",
-            "h2",
-            "h3",
-            "hr",
-            "i",
-            "li",
-            "ol",
-            "p",
-            "span",
-            "strong",
-            "sub",
-            "sup",
-            "ul",
-            "img",
-        },
-        "attributes": {
-            "a": ("href", "name", "target", "title", "id", "rel", "src", "style")
-        },
-        "empty": {"hr", "a", "br", "div"},
-        "separate": {"a", "p", "li", "div"},
-        "whitespace": {"br"},
-        "keep_typographic_whitespace": False,
-        "add_nofollow": False,
-        "autolink": False,
-    }
-)
-
-
-def get_email_html(email) -> str:
-    if email.html:
-        return sanitizer.sanitize(email.html)
-    else:
-        text = email.text.replace("\r", "")
-        text = re.sub("\n(?!\n)", "<br/>", text)
-        return "".join(
-            [f"<p>{line}</p>" for line in strip_tags(text).split("\n") if line]
-        )
@@ -1,21 +1,20 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
 from django.views.decorators.http import require_http_methods
-from django.db.models import Q, Max, Exists, OuterRef
+from django.db.models import Q, Case, CharField, Count, Value, When
 from django.utils import timezone
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
-from core.models import Issue
-from core.models.issue_note import NoteType, IssueNote
+from core.models import Issue, IssueSummary
 from core.models.issue import CaseStage, CaseOutcome, CaseTopic
-from case.forms import IssueSearchForm, LawyerFilterForm
-from case.utils import get_page
+from case.forms import IssueSearchForm, ReviewFilterForm
+from case.utils import get_page, get_cursor_page
 from case.utils.react import render_react_page, is_react_api_call
 from case.views.auth import coordinator_or_better_required
 from case.utils.router import Route
 
-from case.serializers import IssueDetailSerializer
+from case.serializers.projection import project_issues
 
 COORDINATORS_EMAIL = "coordinators@anikalegal.com"
 
@@ -25,6 +24,18 @@ review_search_route = Route("review-search").path("review").path("search")
 review_route = Route("review").path("review")
 checks_route = Route("checks").path("checks")
 
+REVIEW_PAGE_SIZE = 50
+# Review urgency buckets, from the least to most urgent:
+# name, colour, label, minimum days until the next review.
+REVIEW_BUCKETS = [
+    ("later", "", "Due in a week or more", 7),
+    ("upcoming", "green", "Due in 3 to 7 days", 3),
+    ("soon", "yellow", "Due in 2 to 3 days", 2),
+    ("due", "orange", "Due in the next 2 days", 0),
+    ("overdue", "red", "Overdue", None),
+    ("unscheduled", "", "No review set", None),
+]
+
 
 @list_route
 @login_required
@@ -32,19 +43,13 @@ checks_route = Route("checks").path("checks")
 def case_list_view(request):
     """
     List of all cases for paralegals and coordinators to view.
+    Pass a "cursor" query param to use keyset pagination instead of page numbers.
+    Text searches are ranked by relevance, so they always use page numbers.
     """
     issue_qs = _get_issue_qs_for_user(request.user)
     form = IssueSearchForm(request.GET)
-    issue_qs = form.search(issue_qs).order_by("-created_at").all()
-    page, next_page, prev_page = get_page(
-        request, issue_qs, per_page=14, return_qs=False
-    )
+    issue_qs = form.search(issue_qs)
     context = {
-        "issues": IssueDetailSerializer(page.object_list, many=True).data,
-        "next_page": next_page,
-        "total_pages": page.paginator.num_pages,
-        "total_count": page.paginator.count,
-        "prev_page": prev_page,
         "choices": {
             "stage": CaseStage.CHOICES,
             "topic": CaseTopic.CHOICES,
@@ -55,6 +60,31 @@ def case_list_view(request):
             ],
         },
     }
+    if "cursor" in request.GET and not form.is_text_search():
+        # Keyset pagination, newest first, with an approximate total.
+        page = get_cursor_page(request, issue_qs, per_page=14, with_count=True)
+        context.update(
+            {
+                "issues": project_issues(page.object_list),
+                "next_cursor": page.next_cursor,
+                "prev_cursor": page.prev_cursor,
+                "total_count": page.count,
+            }
+        )
+    else:
+        page, next_page, prev_page = get_page(
+            request, issue_qs, per_page=14, return_qs=False
+        )
+        context.update(
+            {
+                "issues": project_issues(page.object_list),
+                "next_page": next_page,
+                "total_pages": page.paginator.num_pages,
+                "total_count": page.paginator.count,
+                "prev_page": prev_page,
+            }
+        )
+
     if is_react_api_call(request):
         return Response(context)
     else:
@@ -80,16 +110,15 @@ def _get_issue_qs_for_user(user):
 @require_http_methods(["GET"])
 def case_review_view(request):
     """Page where coordinators can see existing cases for them to review"""
-    issues = _get_review_issue_qs()
-    _annotate_issue_review_color(issues)
-    alert_issues = [
-        i
-        for i in issues
-        if i.stage != CaseStage.UNSTARTED
-        and not (i.is_conflict_check and i.is_eligibility_check)
-    ]
-    form = LawyerFilterForm()
-    context = {"issues": issues, "alert_issues": alert_issues, "form": form}
+    alert_count = _filter_missing_checks(
+        IssueSummary.objects.filter(is_open=True)
+    ).count()
+    form = ReviewFilterForm()
+    context = {
+        **_get_review_context(request, form),
+        "alert_count": alert_count,
+        "form": form,
+    }
     return render(request, "case/case/review.html", context)
 
 
@@ -98,53 +127,72 @@ def case_review_view(request):
 @require_http_methods(["GET"])
 def case_review_search_view(request):
     """Page where coordinators can see existing cases for them to review"""
-    issues = _get_review_issue_qs()
-    _annotate_issue_review_color(issues)
-    form = LawyerFilterForm(request.GET)
-    if form.is_valid():
-        lawyer = form.cleaned_data["lawyer"]
-        if lawyer:
-            issues = issues.filter(lawyer=lawyer)
+    form = ReviewFilterForm(request.GET)
+    context = _get_review_context(request, form)
+    return render(request, "case/case/_review_table.html", context)
 
-    context = {
-        "issues": issues,
-        "table_id": "review-table",
-        "is_review": True,
-        "is_open": True,
-    }
-    return render(request, "case/case/_list_table.html", context)
 
-
-def _get_review_issue_qs():
-    issues = (
-        Issue.objects.select_related("client", "paralegal", "lawyer")
-        .prefetch_related("issuenote_set")
-        .filter(is_open=True)
-        .annotate(next_review=Max("issuenote__event"))
-        .order_by("next_review")
+def _get_review_context(request, form):
+    """
+    Returns a page of open cases to review, filtered by the form, with their review colours
+    and the number of cases in each review bucket.
+    """
+    now = timezone.now()
+    bucket_filters = _get_review_bucket_filters(now)
+    issues = form.filter(IssueSummary.objects.filter(is_open=True))
+    bucket_counts = issues.aggregate(
+        **{name: Count("pk", filter=q) for name, q in bucket_filters.items()}
     )
-    return _annotate_with_checks(issues)
+    issues = issues.annotate(
+        color=Case(
+            *[
+                When(bucket_filters[name], then=Value(color))
+                for name, color, _, _ in REVIEW_BUCKETS
+            ],
+            default=Value(""),
+            output_field=CharField(),
+        )
+    ).order_by("next_review", "pk")
+    page, next_qs, prev_qs = get_page(request, issues, per_page=REVIEW_PAGE_SIZE)
+    buckets = [
+        {"color": color, "label": label, "count": bucket_counts[name]}
+        for name, color, label, _ in REVIEW_BUCKETS
+    ]
+    return {
+        "issues": page.object_list,
+        "page": page,
+        "next_qs": next_qs,
+        "prev_qs": prev_qs,
+        "buckets": buckets,
+    }
 
 
-def _annotate_issue_review_color(issues):
-    # Annotate issues with days from now
-    now = timezone.now()
-    for issue in issues:
-        if not issue.next_review:
-            issue.color = ""
+def _get_review_bucket_filters(now):
+    """
+    Returns a filter on the next review time for each review bucket.
+    """
+    filters, upper = {}, None
+    for name, _, _, min_days in REVIEW_BUCKETS:
+        if name == "unscheduled":
+            filters[name] = Q(next_review__isnull=True)
             continue
 
-        days = (issue.next_review - now).days
-        if days >= 7:
-            issue.color = ""
-        elif days >= 3:
-            issue.color = "green"
-        elif days >= 2:
-            issue.color = "yellow"
-        elif days >= 0:
-            issue.color = "orange"
-        else:
-            issue.color = "red"
+        q = Q(next_review__lt=upper) if upper else Q(next_review__isnull=False)
+        if min_days is not None:
+            upper = now + timezone.timedelta(days=min_days)
+            q &= Q(next_review__gte=upper)
+
+        filters[name] = q
+
+    return filters
+
+
+def _filter_missing_checks(issues):
+    """
+    Returns the started issues which are missing a conflict or eligibility check.
+    """
+    is_missing_check = Q(is_conflict_check=False) | Q(is_eligibility_check=False)
+    return issues.exclude(stage=CaseStage.UNSTARTED).filter(is_missing_check)
 
 
 @checks_route
@@ -152,21 +200,9 @@ def _annotate_issue_review_color(issues):
 @require_http_methods(["GET"])
 def case_checks_view(request):
     """Page where coordinators can see new cases which are missing manual checks"""
-    issues = (
-        Issue.objects.select_related("client", "paralegal")
-        .prefetch_related("issuenote_set")
-        .filter(is_open=True)
-        .exclude(paralegal__isnull=True)
-        .annotate(next_review=Max("issuenote__event"))
-        .order_by("next_review")
-    )
-    issues = _annotate_with_checks(issues)
-    alert_issues = [
-        i
-        for i in issues
-        if i.stage != CaseStage.UNSTARTED
-        and not (i.is_conflict_check and i.is_eligibility_check)
-    ]
+    alert_issues = _filter_missing_checks(
+        IssueSummary.objects.filter(is_open=True, paralegal__isnull=False)
+    ).order_by("next_review")
     context = {"alert_issues": alert_issues}
     return render(request, "case/case/checks_missing.html", context)
 
@@ -176,32 +212,8 @@ def case_checks_view(request):
 @require_http_methods(["GET"])
 def case_inbox_view(request):
     """Inbox page where coordinators can see new cases for them to assign"""
-    is_unassigned = Q(paralegal__isnull=True)
-    is_open = Q(is_open=True)
-    is_inbox = is_unassigned & is_open
-    issues = (
-        Issue.objects.select_related("client", "paralegal")
-        .filter(is_inbox)
-        .order_by("created_at")
+    issues = IssueSummary.objects.filter(is_open=True, paralegal__isnull=True).order_by(
+        "created_at"
     )
-    issues = _annotate_with_checks(issues)
     context = {"issues": issues}
     return render(request, "case/case/inbox.html", context)
-
-
-def _annotate_with_checks(issue_qs):
-    is_conflict_check = Q(note_type=NoteType.CONFLICT_CHECK_FAILURE) | Q(
-        note_type=NoteType.CONFLICT_CHECK_SUCCESS
-    )
-    conflict_check_subquery = IssueNote.objects.filter(is_conflict_check).filter(
-        issue=OuterRef("pk")
-    )
-    is_eligibility_check = Q(note_type=NoteType.ELIGIBILITY_CHECK_FAILURE) | Q(
-        note_type=NoteType.ELIGIBILITY_CHECK_SUCCESS
-    )
-    eligibility_check_subquery = IssueNote.objects.filter(is_eligibility_check).filter(
-        issue=OuterRef("pk")
-    )
-    return issue_qs.annotate(
-        is_conflict_check=Exists(conflict_check_subquery)
-    ).annotate(is_eligibility_check=Exists(eligibility_check_subquery))
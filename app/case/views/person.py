@@ -8,16 +8,19 @@ from rest_framework import status
 from core.models import Person, Issue
 from case.utils.router import Router
 from case.utils.react import render_react_page, is_react_api_call
+from case.utils import get_cursor_page
 from case.serializers import PersonSerializer, IssueDetailSerializer
+from case.serializers.projection import project_people
 from .auth import paralegal_or_better_required
 
-
 router = Router("person")
 router.create_route("detail").pk("pk")
 router.create_route("create").path("create")
 router.create_route("search").path("search")
 router.create_route("list")
 
+PER_PAGE = 20
+
 
 @router.use_route("create")
 @paralegal_or_better_required
@@ -55,7 +58,19 @@ def person_search_view(request):
 @api_view(["GET"])
 def person_list_view(request):
     people_qs = Person.objects.order_by("full_name").all()
-    people = PersonSerializer(people_qs, many=True).data
+    if is_react_api_call(request) and "cursor" in request.GET:
+        # Keyset pagination, in the same name order as the full list.
+        page = get_cursor_page(
+            request, people_qs, per_page=PER_PAGE, field="full_name", descending=False
+        )
+        data = {
+            "results": project_people(page.object_list),
+            "next_cursor": page.next_cursor,
+            "prev_cursor": page.prev_cursor,
+        }
+        return Response(data=data)
+
+    people = project_people(people_qs)
     if is_react_api_call(request):
         return Response(data=people)
     else:
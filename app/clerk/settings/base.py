@@ -216,6 +216,20 @@ WEBPACK_LOADER = {
 }
 
 
+# Caching
+# Public pages are cached for anonymous visitors, see web/cache.py.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "pages": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "pages",
+        "TIMEOUT": 60 * 60,
+    },
+}
+
+
 # Wagtail
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 WAGTAIL_SITE_NAME = "Anika Legal"
@@ -236,7 +250,11 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.BasicAuthentication",
         "clerk.auth.CsrfExemptSessionAuthentication",
-    )
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "utils.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 }
 
 ONE_HUNDRED_YEARS = 100 * 365 * 24 * 60 * 60  # seconds
@@ -308,6 +326,9 @@ EMAIL_HOST_PASSWORD = SENDGRID_API_KEY
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_DOMAIN = "em7221.test-mail.anikalegal.com"
+# Connection pool size and (connect, read) timeouts in seconds for SendGrid requests
+SENDGRID_POOL_SIZE = 10
+SENDGRID_TIMEOUT = (10, 60)
 
 
 # Marketing emails via MailChimp
@@ -328,6 +349,9 @@ MS_AUTHORITY_URL = (
 MS_GRAPH_GROUP_ID = None
 MS_GRAPH_DRIVE_ID = None
 MS_REMOVE_OFFICE_LICENCES = False
+# Connection pool size and (connect, read) timeouts in seconds for MS Graph requests
+MS_GRAPH_POOL_SIZE = 10
+MS_GRAPH_TIMEOUT = (10, 60)
 
 
 SENTRY_JS_DSN = os.environ.get("SENTRY_JS_DSN")
@@ -31,6 +31,18 @@ CORS_ORIGIN_REGEX_WHITELIST = (
 # Get DRF to use HTTPS in links.
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
+# Share caches between gunicorn workers, so that clearing a cache entry clears it for all of them,
+# eg. when a page is published or a user's groups change.
+CACHES["default"] = {
+    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    "LOCATION": "/tmp/clerk-cache",
+}
+CACHES["pages"] = {
+    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+    "LOCATION": "/tmp/clerk-page-cache",
+    "TIMEOUT": 60 * 60,
+}
+
 AWS_STORAGE_BUCKET_NAME = "anika-clerk-test"
 
 
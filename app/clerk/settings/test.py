@@ -13,6 +13,9 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "test_media")
 # Use default, otherwise Whitenoise gets angry and fails to load static files.
 STATICFILES_STORAGE = "django.contrib.staticfiles.storage.StaticFilesStorage"
 
+# Don't serve cached pages between tests.
+CACHES["pages"] = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+
 # Django-q cluster should run synchronously
 Q_CLUSTER = {
     "name": "clerk",
@@ -20,13 +20,14 @@ from wagtail.admin import urls as wagtailadmin_urls
 from wagtail.core import urls as wagtail_urls
 from wagtail.documents import urls as wagtaildocs_urls
 from web.sitemaps import SITEMAPS
+from web.cache import cache_public_page
 
 from web import views
 from intake.views import intake_view
 
 
 def template(name):
-    return TemplateView.as_view(template_name=name)
+    return cache_public_page(TemplateView.as_view(template_name=name))
 
 
 router = routers.SimpleRouter()
@@ -119,7 +120,7 @@ urlpatterns = [
     # Sitemap
     path(
         "sitemap.xml",
-        sitemap,
+        cache_public_page(sitemap),
         {"sitemaps": SITEMAPS},
         name="django.contrib.sitemaps.views.sitemap",
     ),
@@ -102,7 +102,13 @@ class IssueAdmin(admin.ModelAdmin):
         "is_sharepoint_set_up",
         "created_at",
     )
-    list_filter = ("topic", "is_alert_sent", "is_case_sent")
+    list_filter = (
+        "topic",
+        "is_alert_sent",
+        "is_case_sent",
+        "is_paralegal_access_set_up",
+        "is_assignment_slack_sent",
+    )
 
     list_select_related = ("client",)
 
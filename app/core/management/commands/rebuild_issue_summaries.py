@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.models import IssueSummary
+
+
+class Command(BaseCommand):
+    """
+    ./manage.py rebuild_issue_summaries
+    """
+
+    help = "Recalculate the issue summaries shown in the coordinator case lists."
+
+    def handle(self, *args, **kwargs):
+        IssueSummary.objects.rebuild()
+        self.stdout.write(f"Rebuilt {IssueSummary.objects.count()} issue summaries")
@@ -0,0 +1,51 @@
+# Generated by Django 4.0.10 on 2026-10-18 17:52
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+
+def get_terms(person):
+    email = person.email or ""
+    return [person.first_name, person.last_name, email, email.split("@")[0]]
+
+
+def build_search_vectors(apps, schema_editor):
+    Issue = apps.get_model("core", "Issue")
+    issues = Issue.objects.select_related("client", "paralegal").exclude(
+        search_vector__isnull=False
+    )
+    for issue in issues.iterator():
+        client_terms = [issue.fileref, issue.fileref[1:], *get_terms(issue.client)]
+        paralegal_terms = get_terms(issue.paralegal) if issue.paralegal else []
+        search_vector = SearchVector(
+            models.Value(" ".join(client_terms), output_field=models.TextField()),
+            config="simple",
+            weight="A",
+        ) + SearchVector(
+            models.Value(" ".join(paralegal_terms), output_field=models.TextField()),
+            config="simple",
+            weight="B",
+        )
+        Issue.objects.filter(pk=issue.pk).update(search_vector=search_vector)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0054_remove_issueevent_event_types_alter_issue_topic_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(build_search_vectors, reverse_code=migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='issue',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='core_issue_search__e6ac5b_gin'),
+        ),
+    ]
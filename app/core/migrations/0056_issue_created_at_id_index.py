@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-18 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0055_issue_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['created_at', 'id'], name='core_issue_created_9707e2_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.0.10 on 2026-10-18 17:56
+
+from django.db import migrations, models
+
+
+def set_up_counters(apps, schema_editor):
+    Issue = apps.get_model("core", "Issue")
+    FilerefCounter = apps.get_model("core", "FilerefCounter")
+    counts = {}
+    filerefs = Issue.objects.exclude(fileref="").values_list("topic", "fileref")
+    for topic, fileref in filerefs.iterator():
+        try:
+            count = int(fileref[1:])
+        except ValueError:
+            continue
+
+        counts[topic] = max(counts.get(topic, 0), count)
+
+    for topic, count in counts.items():
+        FilerefCounter.objects.create(topic=topic, count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0056_issue_created_at_id_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FilerefCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(choices=[('REPAIRS', 'Repairs'), ('BONDS', 'Bonds'), ('EVICTION', 'Eviction'), ('HEALTH_CHECK', 'Housing Health Check'), ('RENT_REDUCTION', 'Rent reduction'), ('OTHER', 'Other')], max_length=32, unique=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(set_up_counters, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.10 on 2026-10-18 17:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0057_filerefcounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='is_assignment_slack_sent',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='is_paralegal_access_set_up',
+            field=models.BooleanField(default=True),
+        ),
+    ]
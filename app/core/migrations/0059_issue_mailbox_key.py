@@ -0,0 +1,42 @@
+# Generated by Django 4.0.10 on 2026-10-18 18:08
+
+from django.db import migrations, models
+
+
+def set_mailbox_keys(apps, schema_editor):
+    """
+    Inbound email for a prefix shared by several issues already failed to route,
+    so only the oldest issue with each prefix gets the key.
+    """
+    Issue = apps.get_model("core", "Issue")
+    seen_keys = set()
+    batch = []
+    for issue in Issue.objects.order_by("created_at").only("id").iterator():
+        mailbox_key = str(issue.id).split("-")[0]
+        if mailbox_key in seen_keys:
+            continue
+
+        seen_keys.add(mailbox_key)
+        issue.mailbox_key = mailbox_key
+        batch.append(issue)
+        if len(batch) >= 500:
+            Issue.objects.bulk_update(batch, ["mailbox_key"])
+            batch = []
+
+    Issue.objects.bulk_update(batch, ["mailbox_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0058_issue_assignment_task_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='mailbox_key',
+            field=models.CharField(blank=True, editable=False, max_length=8, null=True, unique=True),
+        ),
+        migrations.RunPython(set_mailbox_keys, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.0.10 on 2026-10-18 18:14
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def build_issue_daily_metrics(apps, schema_editor):
+    """
+    Fill the daily issue metrics so that public pages and reports have counts
+    before the scheduled task first runs.
+    """
+    Issue = apps.get_model("core", "Issue")
+    IssueDailyMetric = apps.get_model("core", "IssueDailyMetric")
+    rows = (
+        Issue.objects.annotate(date=TruncDate("created_at"))
+        .values("date", "topic", "stage", "outcome", "provided_legal_services", "is_open")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    IssueDailyMetric.objects.bulk_create(
+        [IssueDailyMetric(**row) for row in rows], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0059_issue_mailbox_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueDailyMetric',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True)),
+                ('topic', models.CharField(choices=[('REPAIRS', 'Repairs'), ('BONDS', 'Bonds'), ('EVICTION', 'Eviction'), ('HEALTH_CHECK', 'Housing Health Check'), ('RENT_REDUCTION', 'Rent reduction'), ('OTHER', 'Other')], max_length=32)),
+                ('stage', models.CharField(choices=[('UNSTARTED', 'Not started'), ('CLIENT_AGREEMENT', 'Client agreement'), ('ADVICE', 'Drafting advice'), ('FORMAL_LETTER', 'Formal letter sent'), ('NEGOTIATIONS', 'Negotiations'), ('VCAT_CAV', 'VCAT/CAV'), ('POST_CASE_INTERVIEW', 'Post-case interview'), ('CLOSED', 'Closed')], max_length=32)),
+                ('outcome', models.CharField(blank=True, choices=[('OUT_OF_SCOPE', 'Out of scope'), ('CHANGE_OF_SCOPE', 'Change of scope'), ('RESOLVED_EARLY', 'Resolved early'), ('CHURNED', 'Churned'), ('UNKNOWN', 'Unknown'), ('SUCCESSFUL', 'Successful'), ('UNSUCCESSFUL', 'Unsuccessful')], max_length=32, null=True)),
+                ('provided_legal_services', models.BooleanField()),
+                ('is_open', models.BooleanField()),
+                ('count', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.RunPython(build_issue_daily_metrics, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 4.0.10 on 2026-10-18 18:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def get_full_name(person):
+    return f"{person.first_name} {person.last_name}".strip() if person else ""
+
+
+def build_issue_summaries(apps, schema_editor):
+    Issue = apps.get_model("core", "Issue")
+    IssueNote = apps.get_model("core", "IssueNote")
+    IssueSummary = apps.get_model("core", "IssueSummary")
+    conflict_notes = IssueNote.objects.filter(
+        issue=models.OuterRef("pk"),
+        note_type__in=["CONFLICT_CHECK_SUCCESS", "CONFLICT_CHECK_FAILURE"],
+    )
+    eligibility_notes = IssueNote.objects.filter(
+        issue=models.OuterRef("pk"),
+        note_type__in=["ELIGIBILITY_CHECK_SUCCESS", "ELIGIBILITY_CHECK_FAILURE"],
+    )
+    issues = Issue.objects.select_related("client", "paralegal", "lawyer").annotate(
+        next_review=models.Max("issuenote__event"),
+        last_activity_at=models.Max("issuenote__created_at"),
+        is_conflict_check=models.Exists(conflict_notes),
+        is_eligibility_check=models.Exists(eligibility_notes),
+    )
+    summaries = [
+        IssueSummary(
+            issue_id=issue.pk,
+            fileref=issue.fileref,
+            topic=issue.topic,
+            stage=issue.stage,
+            outcome=issue.outcome,
+            provided_legal_services=issue.provided_legal_services,
+            is_open=issue.is_open,
+            created_at=issue.created_at,
+            client_id=issue.client_id,
+            client_name=get_full_name(issue.client),
+            paralegal_id=issue.paralegal_id,
+            paralegal_name=get_full_name(issue.paralegal),
+            lawyer_id=issue.lawyer_id,
+            lawyer_name=get_full_name(issue.lawyer),
+            next_review=issue.next_review,
+            last_activity_at=issue.last_activity_at,
+            is_conflict_check=issue.is_conflict_check,
+            is_eligibility_check=issue.is_eligibility_check,
+        )
+        for issue in issues.iterator()
+    ]
+    IssueSummary.objects.bulk_create(summaries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0060_issue_daily_metric'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueSummary',
+            fields=[
+                ('issue', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='core.issue')),
+                ('fileref', models.CharField(blank=True, default='', max_length=8)),
+                ('topic', models.CharField(choices=[('REPAIRS', 'Repairs'), ('BONDS', 'Bonds'), ('EVICTION', 'Eviction'), ('HEALTH_CHECK', 'Housing Health Check'), ('RENT_REDUCTION', 'Rent reduction'), ('OTHER', 'Other')], max_length=32)),
+                ('stage', models.CharField(choices=[('UNSTARTED', 'Not started'), ('CLIENT_AGREEMENT', 'Client agreement'), ('ADVICE', 'Drafting advice'), ('FORMAL_LETTER', 'Formal letter sent'), ('NEGOTIATIONS', 'Negotiations'), ('VCAT_CAV', 'VCAT/CAV'), ('POST_CASE_INTERVIEW', 'Post-case interview'), ('CLOSED', 'Closed')], max_length=32)),
+                ('outcome', models.CharField(blank=True, choices=[('OUT_OF_SCOPE', 'Out of scope'), ('CHANGE_OF_SCOPE', 'Change of scope'), ('RESOLVED_EARLY', 'Resolved early'), ('CHURNED', 'Churned'), ('UNKNOWN', 'Unknown'), ('SUCCESSFUL', 'Successful'), ('UNSUCCESSFUL', 'Unsuccessful')], max_length=32, null=True)),
+                ('provided_legal_services', models.BooleanField(default=False)),
+                ('is_open', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField()),
+                ('client_name', models.CharField(blank=True, default='', max_length=301)),
+                ('paralegal_name', models.CharField(blank=True, default='', max_length=301)),
+                ('lawyer_name', models.CharField(blank=True, default='', max_length=301)),
+                ('next_review', models.DateTimeField(blank=True, null=True)),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True)),
+                ('is_conflict_check', models.BooleanField(default=False)),
+                ('is_eligibility_check', models.BooleanField(default=False)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.client')),
+                ('lawyer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('paralegal', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='issuesummary',
+            index=models.Index(fields=['is_open', 'next_review'], name='core_issues_is_open_82aca9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issuesummary',
+            index=models.Index(fields=['is_open', 'created_at'], name='core_issues_is_open_99f0be_idx'),
+        ),
+        migrations.RunPython(build_issue_summaries, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.0.10 on 2026-10-18 18:35
+
+from django.db import migrations, models
+
+
+def set_missing_mailbox_keys(apps, schema_editor):
+    """
+    Issues whose id prefix clashed with an older issue were left without a mailbox key,
+    give them the first 8 hex characters of their id extended until the key is unique.
+    """
+    Issue = apps.get_model("core", "Issue")
+    taken_keys = set(
+        Issue.objects.exclude(mailbox_key=None).values_list("mailbox_key", flat=True)
+    )
+    batch = []
+    for issue in Issue.objects.filter(mailbox_key=None).order_by("created_at").only("id"):
+        id_hex = issue.id.hex
+        length = 8
+        while id_hex[:length] in taken_keys:
+            length += 1
+
+        issue.mailbox_key = id_hex[:length]
+        taken_keys.add(issue.mailbox_key)
+        batch.append(issue)
+
+    Issue.objects.bulk_update(batch, ["mailbox_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0061_issue_summary'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='issue',
+            name='mailbox_key',
+            field=models.CharField(blank=True, editable=False, max_length=32, null=True, unique=True),
+        ),
+        migrations.RunPython(set_missing_mailbox_keys, reverse_code=migrations.RunPython.noop),
+    ]
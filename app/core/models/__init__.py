@@ -1,6 +1,8 @@
 from .client import Client
-from .issue import CaseTopic, Issue
+from .issue import CaseTopic, FilerefCounter, Issue
 from .issue_note import IssueNote
+from .issue_summary import IssueSummary
+from .metrics import IssueDailyMetric
 from .person import Person
 from .submission import Submission
 from .tenancy import Tenancy
@@ -1,7 +1,9 @@
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 from django.conf import settings
 
@@ -95,6 +97,62 @@ class CaseOutcome:
     }
 
 
+# Names and emails shouldn't be stemmed, so don't use a language config.
+SEARCH_CONFIG = "simple"
+# Issue fields which are included in the search index.
+SEARCH_FIELDS = {"fileref", "client", "paralegal"}
+SEARCH_ATTNAMES = ("fileref", "client_id", "paralegal_id")
+# Marks a previous issue snapshot which hasn't been fetched yet.
+NOT_LOADED = object()
+
+
+def get_person_search_terms(person):
+    """
+    Returns searchable terms for a client or user.
+    The email's mailbox name is included so that partial emails can be found.
+    """
+    email = person.email or ""
+    return [person.first_name, person.last_name, email, email.split("@")[0]]
+
+
+class FilerefCounter(models.Model):
+    """
+    The last file reference number handed out for each case topic.
+    """
+
+    topic = models.CharField(max_length=32, choices=CaseTopic.CHOICES, unique=True)
+    count = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    @transaction.atomic
+    def allocate(cls, topic: str) -> int:
+        """
+        Returns the next file reference number for the topic.
+        The counter row stays locked until the calling transaction ends,
+        so concurrent submissions can't be given the same number.
+        """
+        counter, _ = cls.objects.select_for_update().get_or_create(topic=topic)
+        counter.count += 1
+        counter.save(update_fields=["count"])
+        return counter.count
+
+    @classmethod
+    def reserve(cls, fileref: str, topic: str):
+        """
+        Ensures the counter never allocates an existing file reference.
+        """
+        try:
+            count = int(fileref[1:])
+        except ValueError:
+            return
+
+        cls.objects.get_or_create(topic=topic)
+        cls.objects.filter(topic=topic, count__lt=count).update(count=count)
+
+    def __str__(self):
+        return f"{self.topic} {self.count}"
+
+
 class IssueManager(models.Manager):
     def check_permissions(self, request):
         if request.user.is_paralegal:
@@ -105,6 +163,14 @@ class IssueManager(models.Manager):
         else:
             return self.none()
 
+    def update_search_vectors(self, issue_qs):
+        """
+        Rebuild the search index for the given issues,
+        eg. after their client or paralegal has been renamed.
+        """
+        for issue in issue_qs.select_related("client", "paralegal"):
+            issue.update_search_vector()
+
 
 class Issue(TimestampedModel):
     """
@@ -114,6 +180,11 @@ class Issue(TimestampedModel):
     objects = IssueManager()
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # The first 8 hex characters of the id, or more if they clash with an older issue.
+    # Used in the case's email address.
+    mailbox_key = models.CharField(
+        max_length=32, unique=True, null=True, blank=True, editable=False
+    )
     # What kind of case it is.
     topic = models.CharField(max_length=32, choices=CaseTopic.CHOICES)
     # Where the case is at now.
@@ -160,35 +231,148 @@ class Issue(TimestampedModel):
     is_welcome_email_sent = models.BooleanField(default=False)
     # Tracks whether a matching folder has been set up in Sharepoint.
     is_sharepoint_set_up = models.BooleanField(default=False)
+    # Tracks whether Sharepoint access has been updated for the latest paralegal change.
+    is_paralegal_access_set_up = models.BooleanField(default=True)
+    # Tracks whether the assigned paralegal has been notified on Slack.
+    is_assignment_slack_sent = models.BooleanField(default=True)
 
     # Actionstep ID
     actionstep_id = models.IntegerField(blank=True, null=True)
 
+    # Full text search index over fileref, client and paralegal details.
+    # Maintained by Issue.save() and the Client/User post_save signals.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+            # Supports keyset pagination of the case list.
+            models.Index(fields=["created_at", "id"]),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        issue = super().from_db(db, field_names, values)
+        issue._set_loaded_search_values()
+        return issue
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None or SEARCH_FIELDS.intersection(fields):
+            self._set_loaded_search_values()
+
+    def _set_loaded_search_values(self):
+        # Remember the stored search fields so that saves only rebuild the index if they changed.
+        self._loaded_search_values = self._get_search_values()
+
+    def _get_search_values(self):
+        return tuple(self.__dict__.get(attname) for attname in SEARCH_ATTNAMES)
+
     def save(self, *args, **kwargs):
+        if self._state.adding and not self.mailbox_key:
+            self.mailbox_key = self.get_mailbox_key()
+
         if not self.fileref:
             self.fileref = self.get_next_fileref()
-        super().save(*args, **kwargs)
+        elif self._state.adding:
+            # Don't hand out file references which have been set manually.
+            FilerefCounter.reserve(self.fileref, self.topic)
 
-    def get_next_fileref(self):
+        # Share a single snapshot of the saved issue between all pre_save receivers.
+        self._prev_issue = NOT_LOADED
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            del self._prev_issue
+
+        update_fields = kwargs.get("update_fields")
+        is_search_saved = update_fields is None or SEARCH_FIELDS.intersection(
+            update_fields
+        )
+        is_search_changed = (
+            getattr(self, "_loaded_search_values", None) != self._get_search_values()
+        )
+        if is_search_saved and is_search_changed:
+            self.update_search_vector()
+            self._set_loaded_search_values()
+
+    def get_mailbox_key(self):
         """
-        Returns next file reference code (eg. "R0023") for this issue topic.
+        Returns a unique mailbox key for a new issue: the first 8 hex characters of its id,
+        extended one character at a time while the key is used by another issue.
         """
-        last_fileref = (
-            Issue.objects.exclude(fileref="")
-            .filter(topic=self.topic)
-            .order_by("fileref")
-            .values_list("fileref", flat=True)
-            .last()
+        id_hex = uuid.UUID(str(self.id)).hex
+        taken_keys = set(
+            Issue.objects.filter(mailbox_key__startswith=id_hex[:8]).values_list(
+                "mailbox_key", flat=True
+            )
         )
-        if last_fileref:
-            # A prior fileref exists for this topic.
-            next_filref_count = int(last_fileref[1:]) + 1
-            rjust = max(4, len(str(next_filref_count)))
-        else:
-            # This is the first one.
-            rjust = 4
-            next_filref_count = 1
+        for length in range(8, len(id_hex) + 1):
+            mailbox_key = id_hex[:length]
+            if mailbox_key not in taken_keys:
+                return mailbox_key
+
+        raise ValueError(f"Issue id {self.id} is already in use.")
+
+    def get_prev_issue(self):
+        """
+        Returns this issue as it is stored in the database, with its paralegal and lawyer,
+        or None if it hasn't been saved yet. Used to detect changes when saving:
+        the snapshot is loaded at most once per save() no matter how many receivers ask.
+        """
+        prev_issue = getattr(self, "_prev_issue", NOT_LOADED)
+        if prev_issue is NOT_LOADED:
+            prev_issue = None
+            if not self._state.adding:
+                prev_issue = (
+                    Issue.objects.select_related("paralegal", "lawyer")
+                    .filter(pk=self.pk)
+                    .first()
+                )
+
+            if hasattr(self, "_prev_issue"):
+                self._prev_issue = prev_issue
 
+        return prev_issue
+
+    def update_search_vector(self):
+        """
+        Write this issue's search index to the database.
+        """
+        Issue.objects.filter(pk=self.pk).update(search_vector=self.get_search_vector())
+        # This instance's copy of the vector is now out of date. Defer it so that
+        # later saves of this instance don't write the old vector back.
+        self.__dict__.pop("search_vector", None)
+
+    def get_search_vector(self):
+        """
+        Returns a search vector expression for the case list search.
+        Filerefs and client details are weighted above paralegal details.
+        """
+        client_terms = [self.fileref, self.fileref[1:]]
+        if self.client_id:
+            client_terms += get_person_search_terms(self.client)
+
+        paralegal_terms = []
+        if self.paralegal_id:
+            paralegal_terms += get_person_search_terms(self.paralegal)
+
+        return SearchVector(
+            models.Value(" ".join(client_terms), output_field=models.TextField()),
+            config=SEARCH_CONFIG,
+            weight="A",
+        ) + SearchVector(
+            models.Value(" ".join(paralegal_terms), output_field=models.TextField()),
+            config=SEARCH_CONFIG,
+            weight="B",
+        )
+
+    def get_next_fileref(self):
+        """
+        Returns next file reference code (eg. "R0023") for this issue topic.
+        """
+        next_filref_count = FilerefCounter.allocate(self.topic)
+        rjust = max(4, len(str(next_filref_count)))
         prefix = self.topic[0].upper()
         return prefix + str(next_filref_count).rjust(rjust, "0")
 
@@ -63,20 +63,20 @@ class IssueEvent(TimestampedModel):
         assert issue.pk == prev_issue.pk
         create_kwargs_list = []
         event_types = []
-        if issue.lawyer != prev_issue.lawyer:
+        if issue.lawyer_id != prev_issue.lawyer_id:
             # Lawyer changed
             create_kwargs = {
-                "prev_user": prev_issue.lawyer,
-                "next_user": issue.lawyer,
+                "prev_user_id": prev_issue.lawyer_id,
+                "next_user_id": issue.lawyer_id,
             }
             create_kwargs_list.append(create_kwargs)
             event_types.append(EventType.LAWYER)
 
-        if issue.paralegal != prev_issue.paralegal:
+        if issue.paralegal_id != prev_issue.paralegal_id:
             # Paralegal changed
             create_kwargs = {
-                "prev_user": prev_issue.paralegal,
-                "next_user": issue.paralegal,
+                "prev_user_id": prev_issue.paralegal_id,
+                "next_user_id": issue.paralegal_id,
             }
             create_kwargs_list.append(create_kwargs)
             event_types.append(EventType.PARALEGAL)
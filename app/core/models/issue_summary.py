@@ -0,0 +1,131 @@
+from django.db import models, transaction
+from django.db.models import Exists, Max, OuterRef
+
+from accounts.models import User
+
+from .client import Client
+from .issue import Issue, CaseTopic, CaseStage, CaseOutcome
+from .issue_note import IssueNote, NoteType
+
+CONFLICT_CHECK_TYPES = [
+    NoteType.CONFLICT_CHECK_SUCCESS,
+    NoteType.CONFLICT_CHECK_FAILURE,
+]
+ELIGIBILITY_CHECK_TYPES = [
+    NoteType.ELIGIBILITY_CHECK_SUCCESS,
+    NoteType.ELIGIBILITY_CHECK_FAILURE,
+]
+
+
+class IssueSummaryManager(models.Manager):
+    def update_for_issues(self, issue_ids):
+        """
+        Recalculate the summaries of the given issues with a single aggregate query.
+        """
+        issue_ids = list(issue_ids)
+        issues = (
+            Issue.objects.filter(pk__in=issue_ids)
+            .select_related("client", "paralegal", "lawyer")
+            .annotate(
+                next_review=Max("issuenote__event"),
+                last_activity_at=Max("issuenote__created_at"),
+                is_conflict_check=Exists(
+                    IssueNote.objects.filter(
+                        issue=OuterRef("pk"), note_type__in=CONFLICT_CHECK_TYPES
+                    )
+                ),
+                is_eligibility_check=Exists(
+                    IssueNote.objects.filter(
+                        issue=OuterRef("pk"), note_type__in=ELIGIBILITY_CHECK_TYPES
+                    )
+                ),
+            )
+        )
+        summaries = [IssueSummary.from_issue(issue) for issue in issues]
+        with transaction.atomic():
+            self.filter(issue_id__in=issue_ids).delete()
+            self.bulk_create(summaries, batch_size=500)
+
+    def rebuild(self, batch_size=500):
+        """
+        Recalculate the summaries of every issue.
+        """
+        issue_ids = list(Issue.objects.values_list("pk", flat=True))
+        for i in range(0, len(issue_ids), batch_size):
+            self.update_for_issues(issue_ids[i : i + batch_size])
+
+        self.exclude(issue_id__in=Issue.objects.values("pk")).delete()
+
+
+class IssueSummary(models.Model):
+    """
+    A denormalised copy of an issue and its notes, as shown in the coordinator case lists,
+    so that those lists can be read from a single table.
+    Kept up to date by signals on issues, notes, clients and users, see core/signals/summary.py,
+    and can be rebuilt with the rebuild_issue_summaries command.
+    """
+
+    objects = IssueSummaryManager()
+
+    issue = models.OneToOneField(
+        Issue, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+    fileref = models.CharField(max_length=8, default="", blank=True)
+    topic = models.CharField(max_length=32, choices=CaseTopic.CHOICES)
+    stage = models.CharField(max_length=32, choices=CaseStage.CHOICES)
+    outcome = models.CharField(
+        max_length=32, null=True, blank=True, choices=CaseOutcome.CHOICES
+    )
+    provided_legal_services = models.BooleanField(default=False)
+    is_open = models.BooleanField(default=True)
+    # When the issue was created.
+    created_at = models.DateTimeField()
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="+")
+    client_name = models.CharField(max_length=301, default="", blank=True)
+    paralegal = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    paralegal_name = models.CharField(max_length=301, default="", blank=True)
+    lawyer = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    lawyer_name = models.CharField(max_length=301, default="", blank=True)
+    # The latest event time of the issue's notes, eg. when the case is next due for review.
+    next_review = models.DateTimeField(null=True, blank=True)
+    # When the latest note was added to the issue.
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+    # Whether the issue has had conflict and eligibility checks.
+    is_conflict_check = models.BooleanField(default=False)
+    is_eligibility_check = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_open", "next_review"]),
+            models.Index(fields=["is_open", "created_at"]),
+        ]
+
+    @staticmethod
+    def from_issue(issue):
+        """
+        Build a summary from an issue annotated by IssueSummary.objects.update_for_issues.
+        """
+        return IssueSummary(
+            issue_id=issue.pk,
+            fileref=issue.fileref,
+            topic=issue.topic,
+            stage=issue.stage,
+            outcome=issue.outcome,
+            provided_legal_services=issue.provided_legal_services,
+            is_open=issue.is_open,
+            created_at=issue.created_at,
+            client_id=issue.client_id,
+            client_name=issue.client.get_full_name(),
+            paralegal_id=issue.paralegal_id,
+            paralegal_name=issue.paralegal.get_full_name() if issue.paralegal else "",
+            lawyer_id=issue.lawyer_id,
+            lawyer_name=issue.lawyer.get_full_name() if issue.lawyer else "",
+            next_review=issue.next_review,
+            last_activity_at=issue.last_activity_at,
+            is_conflict_check=issue.is_conflict_check,
+            is_eligibility_check=issue.is_eligibility_check,
+        )
@@ -0,0 +1,23 @@
+from django.db import models
+
+from .issue import CaseTopic, CaseStage, CaseOutcome
+
+
+class IssueDailyMetric(models.Model):
+    """
+    The number of issues created on a given day, grouped by their current topic, stage and outcome.
+    Rebuilt by a scheduled task so that public pages and reports don't count the issues table.
+    """
+
+    date = models.DateField(db_index=True)
+    topic = models.CharField(max_length=32, choices=CaseTopic.CHOICES)
+    stage = models.CharField(max_length=32, choices=CaseStage.CHOICES)
+    outcome = models.CharField(
+        max_length=32, null=True, blank=True, choices=CaseOutcome.CHOICES
+    )
+    provided_legal_services = models.BooleanField()
+    is_open = models.BooleanField()
+    count = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.date} {self.topic} {self.stage}: {self.count}"
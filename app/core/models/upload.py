@@ -1,9 +1,10 @@
-import hashlib
 import os
 import uuid
 
 from django.db import models
 
+from utils.uploads import get_file_hash
+
 from .issue import Issue
 from .timestamped import TimestampedModel
 
@@ -15,9 +16,7 @@ def get_s3_key(file_upload, filename):
     """
     file = file_upload.file
     if file._file:
-        img_bytes = file._file.file.read()
-        file._file.file.seek(0)
-        filename_base = hashlib.md5(img_bytes).hexdigest()
+        filename_base = get_file_hash(file._file)
         _, filename_ext = os.path.splitext(filename)
         filename = filename_base + filename_ext.lower()
 
@@ -0,0 +1,89 @@
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from utils.sentry import sentry_task
+from core.models import Issue, IssueDailyMetric, Submission
+from core.models.issue import CaseOutcome
+
+
+@sentry_task
+def update_issue_daily_metrics_task():
+    """
+    Rebuild the daily issue metrics used by public pages and reports.
+    Run as a scheduled task.
+    """
+    update_issue_daily_metrics()
+
+
+@transaction.atomic
+def update_issue_daily_metrics():
+    """
+    Rebuild the daily issue metrics from the issues table.
+    Issues change stage and outcome long after they are created, so every day is recounted,
+    which is a single aggregate query. Readers see the old metrics until this commits.
+    """
+    rows = (
+        Issue.objects.annotate(date=TruncDate("created_at"))
+        .values(
+            "date", "topic", "stage", "outcome", "provided_legal_services", "is_open"
+        )
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    IssueDailyMetric.objects.all().delete()
+    IssueDailyMetric.objects.bulk_create(
+        [IssueDailyMetric(**row) for row in rows], batch_size=1000
+    )
+
+
+def get_report_stats(num_days: int) -> dict:
+    """
+    Returns counts of the submissions and issues created in the last num_days days.
+    Uses one query per model, no matter how many stats are counted.
+    Issue counts are read from the daily issue metrics.
+    """
+    start_time = timezone.now() - timezone.timedelta(days=num_days)
+    sub_stats = Submission.objects.filter(created_at__gte=start_time).aggregate(
+        submissions_total=Count("pk"),
+        submissions_completed=Count("pk", filter=Q(is_complete=True)),
+    )
+    closed = Q(is_open=False)
+    outcome_counts = {
+        f"outcome_{key}": _sum_count(closed & Q(outcome=key))
+        for key, _ in CaseOutcome.CHOICES
+    }
+    start_date = timezone.localdate(start_time)
+    issue_stats = IssueDailyMetric.objects.filter(date__gte=start_date).aggregate(
+        issues_total=_sum_count(),
+        issues_serviced=_sum_count(Q(provided_legal_services=True)),
+        issues_closed=_sum_count(closed),
+        **outcome_counts,
+    )
+    outcomes = {
+        key: issue_stats.pop(f"outcome_{key}") for key, _ in CaseOutcome.CHOICES
+    }
+    return {**sub_stats, **issue_stats, "outcomes": outcomes}
+
+
+def get_serviced_issue_counts(num_days: int = None) -> dict:
+    """
+    Returns the number of issues which we provided legal services for, by topic.
+    Only counts issues created in the last num_days days, if provided.
+    """
+    metrics = IssueDailyMetric.objects.filter(provided_legal_services=True)
+    if num_days:
+        start_time = timezone.now() - timezone.timedelta(days=num_days)
+        metrics = metrics.filter(date__gte=timezone.localdate(start_time))
+
+    rows = metrics.values("topic").annotate(total=Sum("count")).order_by()
+    return {row["topic"]: row["total"] for row in rows}
+
+
+def get_percent(count: int, total: int) -> int:
+    return int(100 * count / total) if total else 0
+
+
+def _sum_count(filter=None):
+    return Coalesce(Sum("count", filter=filter), 0)
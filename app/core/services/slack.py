@@ -5,8 +5,13 @@ from django.utils import timezone
 from django.urls import reverse
 
 from utils.sentry import sentry_task
-from core.models import Issue, Submission
+from core.models import Issue
 from core.models.issue import CaseOutcome
+from core.services.reporting import (
+    get_report_stats,
+    get_percent,
+    update_issue_daily_metrics,
+)
 from slack.services import (
     send_slack_message,
     send_slack_direct_message,
@@ -54,6 +59,39 @@ def send_case_assignment_slack(issue: str):
         logger.error(f"Slack user not found for User<{issue.paralegal.pk}>")
 
 
+@sentry_task
+def send_case_assignment_slack_task(issue_pk: str):
+    """
+    Notify assigned paralegal of new case assignment, at most once per assignment.
+    """
+    issue = Issue.objects.select_related("client", "paralegal", "lawyer").get(
+        pk=issue_pk
+    )
+    if issue.is_assignment_slack_sent or not issue.paralegal:
+        return
+
+    send_case_assignment_slack(issue)
+    Issue.objects.filter(pk=issue.pk, paralegal=issue.paralegal).update(
+        is_assignment_slack_sent=True
+    )
+
+
+def retry_case_assignment_slacks():
+    """
+    Re-send case assignment Slack messages which failed.
+    Run as a scheduled task.
+    """
+    fifteen_minutes_ago = timezone.now() - timezone.timedelta(minutes=15)
+    issues = Issue.objects.filter(
+        is_assignment_slack_sent=False,
+        paralegal__isnull=False,
+        modified_at__lt=fifteen_minutes_ago,
+    )
+    for issue_pk in issues.values_list("pk", flat=True):
+        logger.info("Retrying assignment Slack message for Issue<%s>", issue_pk)
+        send_case_assignment_slack_task(str(issue_pk))
+
+
 @sentry_task
 def send_issue_slack(issue_pk: str):
     """
@@ -146,6 +184,7 @@ def send_weekly_report_slack():
     """
     Tell #general about our metrics.
     """
+    update_issue_daily_metrics()
     quarterly_text = get_report_text(90)
     annual_text = get_report_text(365)
     text = (
@@ -161,38 +200,30 @@ def send_weekly_report_slack():
 def get_report_text(num_days: int, show_outcomes=True):
     """"""
     stats = []
-    start_time = timezone.now() - timezone.timedelta(days=num_days)
+    report = get_report_stats(num_days)
 
     # Count submissions
-    total_subs = Submission.objects.filter(created_at__gte=start_time).count()
-    completed_subs = Submission.objects.filter(
-        created_at__gte=start_time, is_complete=True
-    ).count()
+    total_subs = report["submissions_total"]
+    completed_subs = report["submissions_completed"]
     incomplete_subs = total_subs - completed_subs
-    incomplete_subs_percent = int(100 * incomplete_subs / total_subs)
+    incomplete_subs_percent = get_percent(incomplete_subs, total_subs)
     text = f"Intake form submissions: {completed_subs} completed, {incomplete_subs_percent}% abandoned"
     stats.append(text)
 
     # Legal services
-    issues_serviced = Issue.objects.filter(
-        created_at__gte=start_time, provided_legal_services=True
-    ).count()
-    issues_total = Issue.objects.filter(created_at__gte=start_time).count()
-    serviced_percent = int(100 * issues_serviced / issues_total)
+    issues_serviced = report["issues_serviced"]
+    issues_total = report["issues_total"]
+    serviced_percent = get_percent(issues_serviced, issues_total)
     text = f"Legal services provided for {issues_serviced} issues started in this time period ({serviced_percent}% of submitted)"
     stats.append(text)
 
     if show_outcomes:
         # Outcomes
-        issues_closed_total = Issue.objects.filter(
-            created_at__gte=start_time, is_open=False
-        ).count()
+        issues_closed_total = report["issues_closed"]
         text = f"Of the {issues_closed_total} closed issues started in this time period, we found these <{OUTCOME_DEFINITIONS_URL}|outcomes>:"
         for key, display in CaseOutcome.CHOICES:
-            issues_outcome = Issue.objects.filter(
-                created_at__gte=start_time, is_open=False, outcome=key
-            ).count()
-            issues_outcome_percent = int(100 * issues_outcome / issues_closed_total)
+            issues_outcome = report["outcomes"][key]
+            issues_outcome_percent = get_percent(issues_outcome, issues_closed_total)
             text += f"\n\t\t\t• {display}: {issues_outcome} ({issues_outcome_percent}%)"
 
         stats.append(text)
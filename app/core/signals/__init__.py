@@ -1 +1 @@
-from . import issue, submission
\ No newline at end of file
+from . import issue, search, submission, summary
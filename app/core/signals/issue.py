@@ -1,14 +1,14 @@
 import logging
 
+from django.db import transaction
 from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 from django_q.tasks import async_task
 
 from core.models import Issue, IssueEvent
-from core.services.slack import send_issue_slack, send_case_assignment_slack
+from core.services.slack import send_issue_slack, send_case_assignment_slack_task
 from emails.service.welcome import send_welcome_email
-from microsoft.tasks import set_up_new_case_task
-from microsoft.service import add_user_to_case, remove_user_from_case
+from microsoft.tasks import set_up_new_case_task, update_case_paralegal_access_task
 
 logger = logging.getLogger(__name__)
 
@@ -20,36 +20,31 @@ def pre_save_issue(sender, instance, **kwargs):
     This arguably belongs in the Issue.save() method coz then we could do atomic transactions.
     """
     issue = instance
-    if not issue.pk:
-        return
-
-    try:
-        prev_issue = Issue.objects.get(pk=issue.pk)
-    except Issue.DoesNotExist:
+    prev_issue = issue.get_prev_issue()
+    if not prev_issue:
         return
 
     IssueEvent.maybe_generate_event(issue, prev_issue)
 
     # If the paralegal for the current Issue object is different from that in the database.
     # We need to update the matching folder on Sharepoint by removing the old paralegal and adding the new one.
-    if issue.paralegal != prev_issue.paralegal:
-        if prev_issue.paralegal:
-            logger.info(
-                "Removing User<%s> from the Sharepoint folder matching Issue<%s>",
-                prev_issue.paralegal.id,
-                prev_issue.id,
+    # This is slow, so it happens in a task once the new paralegal has been saved.
+    if issue.paralegal_id != prev_issue.paralegal_id:
+        issue.is_paralegal_access_set_up = False
+        issue.is_assignment_slack_sent = not issue.paralegal_id
+        issue_pk, prev_paralegal_pk = str(issue.pk), prev_issue.paralegal_id
+        logger.info("Dispatching Sharepoint access task for Issue<%s>", issue_pk)
+        transaction.on_commit(
+            lambda: async_task(
+                update_case_paralegal_access_task, issue_pk, prev_paralegal_pk
             )
-            remove_user_from_case(prev_issue.paralegal, prev_issue)
-
-        if issue.paralegal:
-            logger.info(
-                "Adding User<%s> to the Sharepoint folder matching Issue<%s>",
-                issue.paralegal.id,
-                issue.id,
-            )
-            add_user_to_case(issue.paralegal, issue)
+        )
+        if issue.paralegal_id:
             # Send Slack message to paralegal
-            send_case_assignment_slack(issue)
+            logger.info("Dispatching assignment Slack task for Issue<%s>", issue_pk)
+            transaction.on_commit(
+                lambda: async_task(send_case_assignment_slack_task, issue_pk)
+            )
 
 
 @receiver(post_save, sender=Issue)
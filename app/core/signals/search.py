@@ -0,0 +1,35 @@
+import logging
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from core.models import Client, Issue
+
+logger = logging.getLogger(__name__)
+
+# Client and User fields which are included in the Issue search index.
+SEARCH_FIELDS = {"first_name", "last_name", "email"}
+
+
+@receiver(post_save, sender=Client)
+def post_save_client(sender, instance, created, update_fields=None, **kwargs):
+    if created or not _is_search_update(update_fields):
+        return
+
+    logger.info("Updating search index for Client<%s> issues", instance.pk)
+    Issue.objects.update_search_vectors(Issue.objects.filter(client=instance))
+
+
+@receiver(post_save, sender=User)
+def post_save_user(sender, instance, created, update_fields=None, **kwargs):
+    if created or not _is_search_update(update_fields):
+        return
+
+    logger.info("Updating search index for User<%s> issues", instance.pk)
+    Issue.objects.update_search_vectors(Issue.objects.filter(paralegal=instance))
+
+
+def _is_search_update(update_fields):
+    # Saves like "last_login" updates on every login don't change the index.
+    return update_fields is None or bool(SEARCH_FIELDS.intersection(update_fields))
@@ -0,0 +1,57 @@
+import logging
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import User
+from core.models import Client, Issue, IssueNote, IssueSummary
+
+logger = logging.getLogger(__name__)
+
+# Client and User fields which are included in issue summaries.
+NAME_FIELDS = {"first_name", "last_name"}
+
+
+@receiver(post_save, sender=Issue)
+def post_save_issue_summary(sender, instance, **kwargs):
+    _update_summaries_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=IssueNote)
+@receiver(post_delete, sender=IssueNote)
+def post_save_issue_note_summary(sender, instance, **kwargs):
+    _update_summaries_on_commit([instance.issue_id])
+
+
+@receiver(post_save, sender=Client)
+def post_save_client_summary(sender, instance, created, update_fields=None, **kwargs):
+    if created or not _is_name_update(update_fields):
+        return
+
+    logger.info("Updating issue summaries for Client<%s>", instance.pk)
+    issue_ids = Issue.objects.filter(client=instance).values_list("pk", flat=True)
+    _update_summaries_on_commit(list(issue_ids))
+
+
+@receiver(post_save, sender=User)
+def post_save_user_summary(sender, instance, created, update_fields=None, **kwargs):
+    if created or not _is_name_update(update_fields):
+        return
+
+    logger.info("Updating issue summaries for User<%s>", instance.pk)
+    issue_ids = IssueSummary.objects.filter(
+        Q(paralegal=instance) | Q(lawyer=instance)
+    ).values_list("pk", flat=True)
+    _update_summaries_on_commit(list(issue_ids))
+
+
+def _update_summaries_on_commit(issue_ids):
+    # Wait for the transaction to finish so that an issue deleted along with its notes
+    # doesn't get its summary recreated.
+    transaction.on_commit(lambda: IssueSummary.objects.update_for_issues(issue_ids))
+
+
+def _is_name_update(update_fields):
+    return update_fields is None or bool(NAME_FIELDS.intersection(update_fields))
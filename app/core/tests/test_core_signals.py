@@ -1,9 +1,11 @@
 from unittest import mock
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from core.factories import IssueFactory
-from core.models import Submission
+from core.factories import IssueFactory, UserFactory
+from core.models import Issue, IssueEvent, Submission
 from core.services.slack import send_issue_slack
 from core.services.submission import process_submission
 
@@ -71,3 +73,29 @@ def test_slack_not_dispatched_when_already_sent(mock_async):
     issue.save()
     # Ensure only email task was dispatched
     mock_async.assert_has_calls([mock.call(send_issue_slack, str(issue.pk))])
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+@mock.patch("core.signals.issue.async_task", autospec=True)
+@mock.patch("notify.signals.async_task", autospec=True)
+def test_prev_issue_fetched_once_per_save(mock_notify_async, mock_core_async):
+    """
+    Ensure pre_save receivers share one snapshot of the saved issue.
+    """
+    lawyer = UserFactory()
+    issue = IssueFactory(stage="UNSTARTED", is_alert_sent=True)
+    issue = Issue.objects.get(pk=issue.pk)
+    issue.stage = "ADVICE"
+    issue.lawyer = lawyer
+    with CaptureQueriesContext(connection) as ctx:
+        issue.save()
+
+    issue_selects = [
+        q["sql"]
+        for q in ctx.captured_queries
+        if q["sql"].startswith("SELECT") and 'FROM "core_issue"' in q["sql"]
+    ]
+    assert len(issue_selects) == 1
+    assert IssueEvent.objects.filter(issue=issue).count() == 2
+    mock_notify_async.assert_called_once()
@@ -2,10 +2,15 @@ from unittest import mock
 
 import pytest
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from core.factories import IssueFactory
-from core.models import Issue
+from core.models import Issue, Submission
+from core.models.issue import CaseOutcome
 from core.services import slack
-from core.services.slack import send_issue_slack
+from core.services.reporting import get_report_stats, update_issue_daily_metrics
+from core.services.slack import send_issue_slack, get_report_text
 
 
 @pytest.mark.django_db
@@ -22,3 +27,32 @@ def test_slack_issue_message(monkeypatch):
     assert mock_send_msg.call_count == 1
     issue = Issue.objects.get(pk=issue.id)
     assert issue.is_alert_sent
+
+
+@pytest.mark.django_db
+def test_report_stats():
+    """
+    Report stats are counted with one query per model, using the daily issue metrics.
+    """
+    Submission.objects.create(answers={}, is_complete=True)
+    Submission.objects.create(answers={}, is_complete=False)
+    IssueFactory(provided_legal_services=True)
+    IssueFactory(is_open=False, outcome=CaseOutcome.SUCCESSFUL)
+    IssueFactory(is_open=False, outcome=CaseOutcome.SUCCESSFUL)
+    IssueFactory(is_open=False, outcome=CaseOutcome.CHURNED)
+    update_issue_daily_metrics()
+    with CaptureQueriesContext(connection) as ctx:
+        stats = get_report_stats(90)
+
+    assert len(ctx.captured_queries) == 2
+    assert stats["submissions_total"] == 2
+    assert stats["submissions_completed"] == 1
+    assert stats["issues_total"] == 4
+    assert stats["issues_serviced"] == 1
+    assert stats["issues_closed"] == 3
+    assert stats["outcomes"][CaseOutcome.SUCCESSFUL] == 2
+    assert stats["outcomes"][CaseOutcome.CHURNED] == 1
+    assert stats["outcomes"][CaseOutcome.OUT_OF_SCOPE] == 0
+    text = get_report_text(90)
+    assert "1 completed, 50% abandoned" in text
+    assert "Legal services provided for 1 issues" in text
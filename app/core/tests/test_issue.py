@@ -1,7 +1,7 @@
 from re import I
 import pytest
 
-from core.models.issue import CaseTopic
+from core.models.issue import CaseTopic, FilerefCounter
 from core.factories import IssueFactory
 
 
@@ -29,3 +29,31 @@ def test_get_next_fileref__with_prior_filerefs__over_9999():
     IssueFactory(topic=CaseTopic.BONDS, fileref="B0056")
     issue = IssueFactory(topic=CaseTopic.REPAIRS)
     assert issue.fileref == "R10000"
+
+
+@pytest.mark.django_db
+def test_get_next_fileref__after_10000():
+    IssueFactory(topic=CaseTopic.REPAIRS, fileref="R9999")
+    IssueFactory(topic=CaseTopic.REPAIRS, fileref="R10000")
+    issue = IssueFactory(topic=CaseTopic.REPAIRS)
+    assert issue.fileref == "R10001"
+
+
+@pytest.mark.django_db
+def test_get_next_fileref__counts_per_topic():
+    assert IssueFactory(topic=CaseTopic.REPAIRS).fileref == "R0001"
+    assert IssueFactory(topic=CaseTopic.BONDS).fileref == "B0001"
+    assert IssueFactory(topic=CaseTopic.REPAIRS).fileref == "R0002"
+    assert FilerefCounter.objects.get(topic=CaseTopic.REPAIRS).count == 2
+
+
+@pytest.mark.django_db
+def test_mailbox_key():
+    issue = IssueFactory(id="0e62ccc2-b9ee-4a07-979a-da8a9d450404")
+    assert issue.mailbox_key == "0e62ccc2"
+    # A new issue with a clashing id prefix keeps its id and gets a longer key.
+    other_issue = IssueFactory(id="0e62ccc2-b900-4a07-979a-da8a9d450404")
+    assert str(other_issue.id) == "0e62ccc2-b900-4a07-979a-da8a9d450404"
+    assert other_issue.mailbox_key == "0e62ccc2b"
+    third_issue = IssueFactory(id="0e62ccc2-0000-4a07-979a-da8a9d450404")
+    assert third_issue.mailbox_key == "0e62ccc20"
@@ -0,0 +1,78 @@
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.factories import IssueFactory, UserFactory
+from core.models import IssueNote, IssueSummary
+from core.models.issue_note import NoteType
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+@mock.patch("core.signals.issue.async_task", autospec=True)
+@mock.patch("notify.signals.async_task", autospec=True)
+def test_issue_summary_updated_on_save(
+    mock_notify_async, mock_core_async, django_capture_on_commit_callbacks
+):
+    """
+    Issue summaries are updated when issues, notes, clients and users change.
+    """
+    lawyer = UserFactory(first_name="Lara", last_name="Lawyer")
+    issue = IssueFactory(lawyer=lawyer, is_alert_sent=True)
+    with django_capture_on_commit_callbacks(execute=True):
+        issue.save()  # The factory mutes post_save.
+
+    summary = IssueSummary.objects.get(issue=issue)
+    assert summary.fileref == issue.fileref
+    assert summary.client_name == issue.client.get_full_name()
+    assert summary.lawyer_name == "Lara Lawyer"
+    assert summary.next_review is None
+    assert not summary.is_conflict_check
+
+    review_at = timezone.now() + timezone.timedelta(days=3)
+    with django_capture_on_commit_callbacks(execute=True):
+        IssueNote.objects.create(
+            issue=issue, note_type=NoteType.REVIEW, event=review_at
+        )
+        note = IssueNote.objects.create(
+            issue=issue, note_type=NoteType.CONFLICT_CHECK_SUCCESS
+        )
+
+    summary.refresh_from_db()
+    assert summary.next_review == review_at
+    assert summary.last_activity_at == note.created_at
+    assert summary.is_conflict_check
+    assert not summary.is_eligibility_check
+
+    with django_capture_on_commit_callbacks(execute=True):
+        issue.client.first_name = "Renamed"
+        issue.client.save()
+        lawyer.last_name = "Renamed"
+        lawyer.save()
+
+    summary.refresh_from_db()
+    assert summary.client_name.startswith("Renamed ")
+    assert summary.lawyer_name == "Lara Renamed"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        issue.delete()
+
+    assert not IssueSummary.objects.exists()
+
+
+@pytest.mark.django_db
+def test_rebuild_issue_summaries():
+    """
+    The rebuild command recalculates every issue summary.
+    """
+    issue = IssueFactory()
+    IssueNote.objects.create(issue=issue, note_type=NoteType.ELIGIBILITY_CHECK_FAILURE)
+    IssueFactory()
+    assert not IssueSummary.objects.exists()
+    call_command("rebuild_issue_summaries", stdout=mock.Mock())
+    assert IssueSummary.objects.count() == 2
+    summary = IssueSummary.objects.get(issue=issue)
+    assert summary.is_eligibility_check
+    assert summary.topic == issue.topic
@@ -0,0 +1,16 @@
+import hashlib
+import os
+
+from django.core.files.base import ContentFile
+
+from utils.uploads import HASH_CHUNK_SIZE, get_file_hash
+
+
+def test_get_file_hash__large_file():
+    """Files bigger than one chunk hash the same as their whole contents."""
+    content = os.urandom(HASH_CHUNK_SIZE * 2 + 123)
+    file = ContentFile(content, name="big.pdf")
+    assert len(list(file.chunks(HASH_CHUNK_SIZE))) == 3
+    assert get_file_hash(file) == hashlib.md5(content).hexdigest()
+    # The file is left at the start, ready to be saved to storage.
+    assert file.read() == content
@@ -1,11 +1,13 @@
 import time
 import base64
+from datetime import timedelta
+from urllib.parse import quote, urlencode
 from typing import List, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import (
     Mail,
     To,
@@ -18,6 +20,7 @@ from sendgrid.helpers.mail import (
     FileName,
     FileType,
     Disposition,
+    Header,
 )
 
 
@@ -26,6 +29,29 @@ HEADERS = {"Authorization": f"Bearer {settings.SENDGRID_API_KEY}"}
 DEV_EMAIL_DOMAIN = "em9463.dev-mail.anikalegal.com"
 EMAIL_DOMAIN = settings.EMAIL_DOMAIN
 
+# Read attachments in chunks of this many bytes when encoding them, must be a multiple of 3.
+ATTACHMENT_CHUNK_SIZE = 3 * 256 * 1024
+
+# Shared by every SendGrid request in this process, see get_session.
+_session = None
+
+
+def get_session():
+    """
+    Returns the process-wide requests session for SendGrid,
+    so that connections are reused rather than set up for every request.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.SENDGRID_POOL_SIZE,
+            pool_maxsize=settings.SENDGRID_POOL_SIZE,
+        )
+        _session.mount("https://", adapter)
+
+    return _session
+
 
 def send_email(
     from_addr: str,
@@ -35,8 +61,12 @@ def send_email(
     body: str,
     attachments: List[Tuple[str, bytes, str]] = None,
     html: str = None,
+    message_id: str = None,
 ):
-    sendgrid_client = SendGridAPIClient(settings.SENDGRID_API_KEY)
+    """
+    Send an email, returns its SendGrid message ID.
+    Attachment contents can be bytes or a file.
+    """
     message = Mail()
     message.to = [To(email=to_addr)]
     message.cc = [Cc(email=email) for email in cc_addrs]
@@ -47,19 +77,52 @@ def send_email(
         content.append(Content(mime_type="text/html", content=html))
 
     message.content = content
+    if message_id:
+        # So that replies can be threaded with this email.
+        message.header = Header("Message-ID", message_id)
+
     if attachments:
         message.attachment = [
             Attachment(
-                file_content=FileContent(base64.b64encode(file_bytes).decode()),
+                file_content=FileContent(_encode_attachment(file_content)),
                 file_name=FileName(file_name),
                 file_type=FileType(content_type),
                 disposition=Disposition("attachment"),
             )
-            for file_name, file_bytes, content_type in attachments
+            for file_name, file_content, content_type in attachments
         ]
-    response = sendgrid_client.send(message)
-    message_id = response.headers["X-Message-Id"]
-    return message_id
+    return _send(message)
+
+
+def _encode_attachment(file_content):
+    """
+    Base64 encode the attachment, reading files in chunks
+    so that we don't hold both the raw and the encoded file in memory.
+    """
+    if isinstance(file_content, bytes):
+        return base64.b64encode(file_content).decode()
+
+    file_content.seek(0)
+    encoded_chunks = []
+    while chunk := file_content.read(ATTACHMENT_CHUNK_SIZE):
+        encoded_chunks.append(base64.b64encode(chunk).decode())
+
+    return "".join(encoded_chunks)
+
+
+def _send(message: Mail):
+    """
+    Send a message via the SendGrid v3 Mail Send API, returns its SendGrid message ID.
+    https://docs.sendgrid.com/api-reference/mail-send/mail-send
+    """
+    resp = get_session().post(
+        BASE_URL + "/v3/mail/send",
+        json=message.get(),
+        headers=HEADERS,
+        timeout=settings.SENDGRID_TIMEOUT,
+    )
+    resp.raise_for_status()
+    return resp.headers["X-Message-Id"]
 
 
 def set_inbound_parse_url(base_url):
@@ -76,58 +139,84 @@ def set_inbound_parse_url(base_url):
         "send_raw": False,
     }
     path = f"/v3/user/webhooks/parse/settings/{DEV_EMAIL_DOMAIN}"
-    resp = requests.patch(BASE_URL + path, json=data, headers=HEADERS)
+    resp = get_session().patch(BASE_URL + path, json=data, headers=HEADERS)
     resp.raise_for_status()
     print("Update success: ", resp.json())
 
 
-def fetch_blocks():
+# Max page sizes for the SendGrid APIs.
+SUPPRESSION_PAGE_SIZE = 500
+MESSAGES_PAGE_SIZE = 1000
+
+
+def fetch_blocks(start_time: int, end_time: int):
     """
-    Fetch all blocked emails from Sendgrid.
-    Only fetches last 500 blocks, see API reference for details.
+    Fetch all blocked emails from Sendgrid between two unix timestamps.
     https://docs.sendgrid.com/api-reference/blocks-api/retrieve-all-blocks
     """
-    path = "/v3/suppression/blocks"
-    resp = requests.get(BASE_URL + path, headers=HEADERS, timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+    return _fetch_suppressions("/v3/suppression/blocks", start_time, end_time)
 
 
-def fetch_bounces():
+def fetch_bounces(start_time: int, end_time: int):
     """
-    Fetch all bounced emails from Sendgrid.
-    Only fetches last 500 bounded, see API reference for details.
+    Fetch all bounced emails from Sendgrid between two unix timestamps.
     https://docs.sendgrid.com/api-reference/bounces-api/retrieve-all-bounces
     """
-    path = "/v3/suppression/bounces"
-    resp = requests.get(BASE_URL + path, headers=HEADERS, timeout=10)
-    resp.raise_for_status()
-    return resp.json()
-
-
-def fetch_messages():
-    """
-    Fetch all emails from Sendgrid.
-    Only fetches last 1000 messages, see API reference for details.
-    https://docs.sendgrid.com/api-reference/e-mail-activity/filter-all-messages"""
-    path = f"/v3/messages?limit=1000&query=from_email%20LIKE%20%22%25@{EMAIL_DOMAIN}%22"
-    resp = requests.get(BASE_URL + path, headers=HEADERS, timeout=30)
-    _wait_for_rate_limit(resp)
-    resp.raise_for_status()
-    data = resp.json()
-    return data["messages"]
-
-
-def fetch_message(msg_id):
+    return _fetch_suppressions("/v3/suppression/bounces", start_time, end_time)
+
+
+def _fetch_suppressions(path, start_time, end_time):
+    results = []
+    offset = 0
+    while True:
+        params = {
+            "start_time": start_time,
+            "end_time": end_time,
+            "limit": SUPPRESSION_PAGE_SIZE,
+            "offset": offset,
+        }
+        resp = get_session().get(
+            BASE_URL + path, params=params, headers=HEADERS, timeout=10
+        )
+        resp.raise_for_status()
+        page = resp.json()
+        results += page
+        if len(page) < SUPPRESSION_PAGE_SIZE:
+            return results
+
+        offset += SUPPRESSION_PAGE_SIZE
+
+
+def fetch_messages(start_at, end_at):
     """
-    Fetch an email from Sendgrid.
-    https://docs.sendgrid.com/api-reference/e-mail-activity/filter-messages-by-message-id
+    Fetch all emails sent from our domain from Sendgrid with activity between two datetimes.
+    https://docs.sendgrid.com/api-reference/e-mail-activity/filter-all-messages
+    The API returns at most 1000 messages and has no paging,
+    so time ranges with more messages than that are split in half and fetched separately.
     """
-    path = f"/v3/messages/{msg_id}"
-    resp = requests.get(BASE_URL + path, headers=HEADERS, timeout=30)
+    time_format = "%Y-%m-%dT%H:%M:%SZ"
+    query = (
+        f'from_email LIKE "%@{EMAIL_DOMAIN}" AND last_event_time BETWEEN '
+        f'TIMESTAMP "{start_at.strftime(time_format)}" AND TIMESTAMP "{end_at.strftime(time_format)}"'
+    )
+    # SendGrid expects spaces in the query to be encoded as %20, not +.
+    params = urlencode({"limit": MESSAGES_PAGE_SIZE, "query": query}, quote_via=quote)
+    resp = get_session().get(
+        BASE_URL + "/v3/messages?" + params, headers=HEADERS, timeout=30
+    )
     _wait_for_rate_limit(resp)
     resp.raise_for_status()
-    return resp.json()
+    messages = resp.json()["messages"]
+    is_range_splittable = (end_at - start_at).total_seconds() > 1
+    if len(messages) >= MESSAGES_PAGE_SIZE and is_range_splittable:
+        mid_at = start_at + (end_at - start_at) / 2
+        # Split on whole seconds so that the halves don't overlap.
+        mid_at = mid_at.replace(microsecond=0)
+        return fetch_messages(start_at, mid_at) + fetch_messages(
+            mid_at + timedelta(seconds=1), end_at
+        )
+
+    return messages
 
 
 def _wait_for_rate_limit(resp):
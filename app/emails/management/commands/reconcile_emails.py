@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from emails.service.events import reconcile_email_states
+
+
+class Command(BaseCommand):
+    """
+    ./manage.py reconcile_emails --days 7
+    """
+
+    help = "Update sent emails with their delivery state from SendGrid."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=1,
+            help="How many days of SendGrid activity to reconcile",
+        )
+
+    def handle(self, *args, **kwargs):
+        end_at = timezone.now()
+        start_at = end_at - timezone.timedelta(days=kwargs["days"])
+        counts = reconcile_email_states(start_at, end_at)
+        self.stdout.write(
+            "Found {found}, missing {missing}, multiple {multiple}, updated {updated}".format(
+                **counts
+            )
+        )
@@ -0,0 +1,86 @@
+# Generated by Django 4.0.10 on 2026-10-18 18:05
+
+import re
+from email.parser import HeaderParser
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def slugify_subject(subject):
+    sub = subject or ""
+    sub_cleaned = re.sub(r"re\s*:\s*", "", sub, flags=re.IGNORECASE)
+    sub_cleaned = sub_cleaned or "No Subject"
+    return slugify(sub_cleaned)
+
+
+def parse_thread_headers(headers_str):
+    headers = HeaderParser().parsestr(headers_str or "")
+    message_ids = re.findall(r"<[^>]+>", headers.get("Message-ID", ""))
+    in_reply_to_ids = re.findall(r"<[^>]+>", headers.get("In-Reply-To", ""))
+    references_ids = re.findall(r"<[^>]+>", headers.get("References", ""))
+    in_reply_to = in_reply_to_ids[:1] or references_ids[-1:]
+    return {
+        "message_id": message_ids[0] if message_ids else "",
+        "in_reply_to": in_reply_to[0] if in_reply_to else "",
+    }
+
+
+def set_thread_slugs(apps, schema_editor):
+    Email = apps.get_model("emails", "Email")
+    thread_slugs = {}
+    batch = []
+    for email in Email.objects.order_by("created_at").iterator():
+        headers = (email.received_data or {}).get("headers", "")
+        if headers and isinstance(headers, str):
+            thread_headers = parse_thread_headers(headers)
+            email.message_id = thread_headers["message_id"]
+            email.in_reply_to = thread_headers["in_reply_to"]
+
+        parent_key = (email.issue_id, email.in_reply_to)
+        if email.in_reply_to and parent_key in thread_slugs:
+            email.thread_slug = thread_slugs[parent_key]
+        else:
+            email.thread_slug = slugify_subject(email.subject)
+
+        if email.message_id:
+            thread_slugs[(email.issue_id, email.message_id)] = email.thread_slug
+
+        batch.append(email)
+        if len(batch) >= 500:
+            Email.objects.bulk_update(
+                batch, ["message_id", "in_reply_to", "thread_slug"]
+            )
+            batch = []
+
+    Email.objects.bulk_update(batch, ["message_id", "in_reply_to", "thread_slug"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emails', '0017_alter_emailtemplate_topic'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='email',
+            name='in_reply_to',
+            field=models.CharField(blank=True, default='', max_length=512),
+        ),
+        migrations.AddField(
+            model_name='email',
+            name='message_id',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=512),
+        ),
+        migrations.AddField(
+            model_name='email',
+            name='thread_slug',
+            field=models.SlugField(blank=True, db_index=False, default='', max_length=1024),
+        ),
+        migrations.AddIndex(
+            model_name='email',
+            index=models.Index(fields=['issue', 'thread_slug', 'created_at'], name='emails_emai_issue_i_6ed228_idx'),
+        ),
+        migrations.RunPython(set_thread_slugs, reverse_code=migrations.RunPython.noop),
+    ]
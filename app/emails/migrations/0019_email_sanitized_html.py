@@ -0,0 +1,23 @@
+# Generated by Django 4.0.10 on 2026-10-18 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emails', '0018_email_thread_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='email',
+            name='sanitized_html',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='email',
+            name='sanitizer_version',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
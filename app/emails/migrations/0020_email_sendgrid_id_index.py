@@ -0,0 +1,18 @@
+# Generated by Django 4.0.10 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emails', '0019_email_sanitized_html'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='email',
+            name='sendgrid_id',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=128),
+        ),
+    ]
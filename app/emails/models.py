@@ -1,11 +1,15 @@
+import re
+
 from django.db import models
 from django.utils import timezone
+from django.utils.text import slugify
 from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.postgres.fields import ArrayField
 
 from accounts.models import User
 from core.models import Issue, TimestampedModel, CaseTopic
 from utils.uploads import get_s3_key
+from .sanitize import SANITIZER_VERSION, get_email_html
 
 
 class EmailState:
@@ -31,7 +35,25 @@ STATE_CHOICES = (
 )
 
 
+def slugify_subject(subject):
+    """
+    Normalise an email subject so that replies share a thread with the original email.
+    """
+    sub = subject or ""
+    sub_cleaned = re.sub(r"re\s*:\s*", "", sub, flags=re.IGNORECASE)
+    sub_cleaned = sub_cleaned or "No Subject"
+    return slugify(sub_cleaned)
+
+
+# Fields which affect which thread an email belongs to.
+THREAD_FIELDS = {"issue", "subject", "in_reply_to"}
+# Fields which affect the sanitized HTML.
+CONTENT_FIELDS = {"html", "text"}
+
+
 class Email(models.Model):
+    class Meta:
+        indexes = [models.Index(fields=["issue", "thread_slug", "created_at"])]
 
     from_address = models.EmailField(default="")
     to_address = models.EmailField(default="", blank=True)
@@ -49,7 +71,9 @@ class Email(models.Model):
     received_data = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
 
     # Sendgrid Email ID
-    sendgrid_id = models.CharField(max_length=128, blank=True, default="")
+    sendgrid_id = models.CharField(
+        max_length=128, blank=True, default="", db_index=True
+    )
 
     # Tracks whether an alert has been successfully sent.
     is_alert_sent = models.BooleanField(default=False)
@@ -57,9 +81,104 @@ class Email(models.Model):
     # Actionstep ID
     actionstep_id = models.IntegerField(blank=True, null=True)
 
+    # Email threading: the RFC 5322 Message-ID of this email and the email it replies to.
+    message_id = models.CharField(max_length=512, blank=True, default="", db_index=True)
+    in_reply_to = models.CharField(max_length=512, blank=True, default="")
+    # The thread this email belongs to, see get_thread_slug.
+    # Not indexed on its own, it is covered by the (issue, thread_slug, created_at) index.
+    thread_slug = models.SlugField(
+        max_length=1024, blank=True, default="", db_index=False
+    )
+
+    # HTML which is safe to display, built from html or text when the email is saved.
+    sanitized_html = models.TextField(default="", blank=True)
+    # The SANITIZER_VERSION used to build sanitized_html, 0 if it has not been built.
+    sanitizer_version = models.PositiveSmallIntegerField(default=0)
+
     def __str__(self):
         return f"{self.pk}: {self.subject}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        email = super().from_db(db, field_names, values)
+        email._set_loaded_content()
+        return email
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None or CONTENT_FIELDS.intersection(fields):
+            self._set_loaded_content()
+
+    def _set_loaded_content(self):
+        # Remember the stored content so that saves only sanitize it again if it changed.
+        self._loaded_content = (self.__dict__.get("html"), self.__dict__.get("text"))
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or THREAD_FIELDS.intersection(update_fields):
+            self.thread_slug = self.get_thread_slug()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "thread_slug"}
+
+        is_content_saved = update_fields is None or CONTENT_FIELDS.intersection(
+            update_fields
+        )
+        if is_content_saved and self.is_sanitized_html_stale():
+            self.sanitized_html = get_email_html(self.html, self.text)
+            self.sanitizer_version = SANITIZER_VERSION
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *kwargs["update_fields"],
+                    "sanitized_html",
+                    "sanitizer_version",
+                }
+
+        super().save(*args, **kwargs)
+        self._set_loaded_content()
+
+    def is_sanitized_html_stale(self):
+        """
+        Returns True if the sanitized HTML needs to be built again, because the email is new,
+        its content has changed since it was loaded, or it was built by an older sanitizer.
+        """
+        is_changed = getattr(self, "_loaded_content", None) != (self.html, self.text)
+        return is_changed or self.sanitizer_version != SANITIZER_VERSION
+
+    def get_display_html(self):
+        """
+        Returns HTML which is safe to display,
+        sanitizing and storing it if it was built by an older sanitizer.
+        """
+        if self.sanitizer_version != SANITIZER_VERSION:
+            self.sanitized_html = get_email_html(self.html, self.text)
+            self.sanitizer_version = SANITIZER_VERSION
+            if self.pk:
+                Email.objects.filter(pk=self.pk).update(
+                    sanitized_html=self.sanitized_html,
+                    sanitizer_version=self.sanitizer_version,
+                )
+
+        return self.sanitized_html
+
+    def get_thread_slug(self):
+        """
+        Replies join the thread of the email they reply to,
+        otherwise emails are threaded by their subject.
+        """
+        if self.in_reply_to and self.issue_id:
+            parent_slug = (
+                Email.objects.filter(
+                    issue_id=self.issue_id, message_id=self.in_reply_to
+                )
+                .exclude(pk=self.pk)
+                .values_list("thread_slug", flat=True)
+                .first()
+            )
+            if parent_slug:
+                return parent_slug
+
+        return slugify_subject(self.subject)
+
     def get_received_note_text(self):
         return "Email received"
 
@@ -0,0 +1,57 @@
+import re
+
+from django.utils.html import strip_tags
+from html_sanitizer import Sanitizer
+
+# Bump this when the sanitizer config changes so that stored HTML is rebuilt.
+SANITIZER_VERSION = 1
+
+sanitizer = Sanitizer(
+    {
+        "tags": {
+            "a",
+            "b",
+            "blockquote",
+            "br",
+            "div",
+            "em",
+            "h1",
+            "h2",
+            "h3",
+            "hr",
+            "i",
+            "li",
+            "ol",
+            "p",
+            "span",
+            "strong",
+            "sub",
+            "sup",
+            "ul",
+            "img",
+        },
+        "attributes": {
+            "a": ("href", "name", "target", "title", "id", "rel", "src", "style")
+        },
+        "empty": {"hr", "a", "br", "div"},
+        "separate": {"a", "p", "li", "div"},
+        "whitespace": {"br"},
+        "keep_typographic_whitespace": False,
+        "add_nofollow": False,
+        "autolink": False,
+    }
+)
+
+
+def get_email_html(html: str, text: str) -> str:
+    """
+    Returns safe HTML for displaying an email.
+    """
+    if html:
+        return sanitizer.sanitize(html)
+    else:
+        text = text.replace("\r", "")
+        text = re.sub("\n(?!\n)", "<br/>", text)
+        return "".join(
+            [f"<p>{line}</p>" for line in strip_tags(text).split("\n") if line]
+        )
@@ -1,112 +1,178 @@
+import logging
+from collections import defaultdict
+
 from django.utils import timezone
 from django.conf import settings
 
-from emails.models import Email
+from utils.sentry import sentry_task
+from emails.models import Email, EmailState
 from emails import api
 
+logger = logging.getLogger(__name__)
 
 EMAIL_DOMAIN = settings.EMAIL_DOMAIN
 
+# How close in time a SendGrid event must be to when we sent an email for them to match.
+FAILURE_MATCH_WINDOW = timezone.timedelta(minutes=2)
+MESSAGE_MATCH_WINDOW = timezone.timedelta(minutes=5)
+
+MESSAGE_STATES = {
+    "delivered": EmailState.DELIVERED,
+    "not_delivered": EmailState.DELIVERY_FAILURE,
+}
+
+
+@sentry_task
+def reconcile_email_states_task():
+    """
+    Update sent emails with their state on SendGrid over the last day.
+    Run as a scheduled task.
+    """
+    end_at = timezone.now()
+    start_at = end_at - timezone.timedelta(days=1)
+    reconcile_email_states(start_at, end_at)
+
+
+def reconcile_email_states(start_at, end_at) -> dict:
+    """
+    Match the messages, bounces and blocks recorded by SendGrid between two datetimes
+    to the emails that we sent, and update their SendGrid IDs and delivery states.
+    Returns counts of matched and unmatched messages.
+    """
+    logger.info("Fetching SendGrid messages from %s to %s", start_at, end_at)
+    msgs = api.fetch_messages(start_at, end_at)
+    start_time, end_time = int(start_at.timestamp()), int(end_at.timestamp())
+    failures = api.fetch_bounces(start_time, end_time) + api.fetch_blocks(
+        start_time, end_time
+    )
 
-def match_attempt():
-    print("Fetching messages...")
-    msgs = api.fetch_messages()
-    bounces = api.fetch_bounces()
-    blocks = api.fetch_blocks()
-
-    print("Matching failures...")
-    for failure_list in [bounces, blocks]:
-        for failure in failure_list:
-            event_at = timezone.datetime.fromtimestamp(
-                failure["created"], tz=timezone.utc
-            )
-            before = event_at - timezone.timedelta(minutes=2)
-            after = event_at + timezone.timedelta(minutes=2)
-            email = None
-            try:
-                email = Email.objects.get(
-                    to_address=failure["email"],
-                    processed_at__gte=before,
-                    processed_at__lte=after,
-                )
-            except (Email.DoesNotExist, Email.MultipleObjectsReturned):
-                pass
-
-            if email:
-                Email.objects.filter(id=email.id).update(state="DELIVERY_FAILURE")
-
-    print("Matching all messages...")
-    found, missing, multiple = 0, 0, 0
-    count = len(msgs)
-    for idx, msg in enumerate(msgs):
-        print(f"Email {idx} / {count}... ", end="")
+    # Messages are listed by their last event, which can be a while after they were sent.
+    emails = Email.objects.filter(
+        state__in=[EmailState.SENT, EmailState.DELIVERED, EmailState.DELIVERY_FAILURE],
+        processed_at__gte=start_at - timezone.timedelta(days=3),
+        processed_at__lte=end_at,
+    ).only(
+        "id",
+        "to_address",
+        "from_address",
+        "subject",
+        "processed_at",
+        "sendgrid_id",
+        "state",
+    )
+    index = EmailIndex(emails)
+    updated_emails = {}
+    counts = {"found": 0, "missing": 0, "multiple": 0}
+    for msg in msgs:
         if not msg["from_email"].endswith(EMAIL_DOMAIN):
-            print("skipping.")
             continue
 
-        email = None
-        try:
-            email = Email.objects.get(sendgrid_id=msg["msg_id"])
-            found += 1
-        except Email.DoesNotExist:
-            pass
-
+        email, result = index.match_message(msg)
+        counts[result] += 1
         if not email:
-            try:
-                kwargs = {
-                    "from_address": msg["from_email"],
-                    "subject": msg["subject"],
-                }
-                if "to_email" in msg:
-                    kwargs["to_address"] = msg["to_email"]
-
-                email = Email.objects.get(**kwargs)
-                found += 1
-            except Email.DoesNotExist:
-                missing += 1
-            except Email.MultipleObjectsReturned:
-                multiple += 1
-                msg_detail = api.fetch_message(msg["msg_id"])
-                processed_time = None
-                for event in msg_detail["events"]:
-                    if event["event_name"] == "processed":
-                        processed_time = event["processed"]
-                        if not processed_time:
-                            continue
-
-                        event_at_naive = timezone.datetime.strptime(
-                            processed_time, "%Y-%m-%dT%H:%M:%SZ"
-                        )
-                        event_at = timezone.make_aware(event_at_naive, timezone.utc)
-                        before = event_at - timezone.timedelta(seconds=30)
-                        after = event_at + timezone.timedelta(seconds=30)
-                        try:
-                            email = Email.objects.get(
-                                to_address=msg["to_email"],
-                                from_address=msg["from_email"],
-                                subject=msg["subject"],
-                                processed_at__gte=before,
-                                processed_at__lte=after,
-                            )
-                            found += 1
-                            multiple -= 1
-                        except Email.DoesNotExist:
-                            missing += 1
-                            multiple -= 1
-                        except Email.MultipleObjectsReturned:
-                            pass
+            continue
+
+        state = MESSAGE_STATES.get(msg["status"], email.state)
+        if email.sendgrid_id != msg["msg_id"] or email.state != state:
+            email.sendgrid_id = msg["msg_id"]
+            email.state = state
+            updated_emails[email.pk] = email
+
+    # Failures are applied last so that they take precedence over message statuses.
+    for failure in failures:
+        event_at = timezone.datetime.fromtimestamp(failure["created"], tz=timezone.utc)
+        email = index.match_failure(failure["email"], event_at)
+        if email and email.state != EmailState.DELIVERY_FAILURE:
+            email.state = EmailState.DELIVERY_FAILURE
+            updated_emails[email.pk] = email
+
+    Email.objects.bulk_update(
+        updated_emails.values(), ["sendgrid_id", "state"], batch_size=500
+    )
+    logger.info(
+        "Reconciled SendGrid messages: found %s, missing %s, multiple %s, updated %s",
+        counts["found"],
+        counts["missing"],
+        counts["multiple"],
+        len(updated_emails),
+    )
+    return {**counts, "updated": len(updated_emails)}
+
 
+class EmailIndex:
+    """
+    In-memory indexes for matching SendGrid messages and failures to sent emails.
+    Emails are bucketed by send time so that time-based matches only compare nearby emails.
+    """
+
+    def __init__(self, emails):
+        self.by_sendgrid_id = {}
+        self.by_message = defaultdict(list)
+        self.by_recipient = defaultdict(list)
+        for email in emails:
+            if email.sendgrid_id:
+                self.by_sendgrid_id[email.sendgrid_id] = email
+
+            message_key = (email.to_address, email.from_address, email.subject)
+            self.by_message[message_key].append(email)
+            bucket = self._get_bucket(email.processed_at, FAILURE_MATCH_WINDOW)
+            self.by_recipient[(email.to_address, bucket)].append(email)
+
+    def match_message(self, msg):
+        """
+        Returns the email for a SendGrid message, and whether it was "found", "missing" or "multiple".
+        """
+        email = self.by_sendgrid_id.get(msg["msg_id"])
         if email:
-            if msg["status"] == "delivered":
-                state = "DELIVERED"
-            elif msg["status"] == "not_delivered":
-                state = "DELIVERY_FAILURE"
-
-            print("updating email... ", end="")
-            Email.objects.filter(id=email.id).update(
-                sendgrid_id=msg["msg_id"], state=state
-            )
-        else:
-            print("not found... ", end="")
-
-        print(f"found {found} missing {missing} multiple {multiple}")
+            return email, "found"
+
+        message_key = (msg.get("to_email", ""), msg["from_email"], msg["subject"])
+        candidates = self.by_message.get(message_key, [])
+        if len(candidates) > 1:
+            # Several emails were sent with the same subject, so pick the one sent
+            # shortly before SendGrid's last event for the message.
+            last_event_at = _parse_time(msg.get("last_event_time"))
+            candidates = [
+                e
+                for e in candidates
+                if last_event_at
+                and e.processed_at
+                and timezone.timedelta(0)
+                <= last_event_at - e.processed_at
+                <= MESSAGE_MATCH_WINDOW
+            ]
+            if len(candidates) != 1:
+                return None, "multiple"
+
+        if not candidates:
+            return None, "missing"
+
+        return candidates[0], "found"
+
+    def match_failure(self, to_address, event_at):
+        """
+        Returns the only email sent to the address close to the time of the failure, or None.
+        """
+        bucket = self._get_bucket(event_at, FAILURE_MATCH_WINDOW)
+        candidates = [
+            email
+            for b in [bucket - 1, bucket, bucket + 1]
+            for email in self.by_recipient.get((to_address, b), [])
+            if abs(email.processed_at - event_at) <= FAILURE_MATCH_WINDOW
+        ]
+        return candidates[0] if len(candidates) == 1 else None
+
+    @staticmethod
+    def _get_bucket(dt, window):
+        if not dt:
+            return None
+
+        return int(dt.timestamp() // window.total_seconds())
+
+
+def _parse_time(time_str):
+    if not time_str:
+        return None
+
+    event_at = timezone.datetime.strptime(time_str, "%Y-%m-%dT%H:%M:%SZ")
+    return timezone.make_aware(event_at, timezone.utc)
@@ -1,5 +1,7 @@
 import logging
 import json
+import re
+from email.parser import HeaderParser
 
 from django.conf import settings
 from django.utils.datastructures import MultiValueDict
@@ -49,6 +51,8 @@ def receive_email_task(email_pk: int):
         email.subject = parsed_data["subject"]
         email.text = parsed_data["text"]
         email.html = parsed_data["html"]
+        email.message_id = parsed_data["message_id"]
+        email.in_reply_to = parsed_data["in_reply_to"]
         email.processed_at = timezone.now()
         email.save()
         IssueNote.objects.create(
@@ -90,6 +94,8 @@ def parse_received_data(email_data: dict) -> dict:
         from_address: str
         to_address: str
         cc_addresses: List[str],
+        message_id: str
+        in_reply_to: str
         issue: Issue
     }
     """
@@ -116,6 +122,7 @@ def parse_received_data(email_data: dict) -> dict:
     parsed_data["text"] = email_data.get("text", "")
     parsed_data["subject"] = email_data["subject"]
     parsed_data["html"] = email_data.get("html", "")
+    parsed_data.update(parse_thread_headers(email_data.get("headers", "")))
 
     # Try find the issue from to_addr.
     user, domain = to_addr.split("@")
@@ -126,7 +133,7 @@ def parse_received_data(email_data: dict) -> dict:
     try:
         user_parts = user.split(".")
         issue_prefix = user_parts[-1]
-        parsed_data["issue"] = Issue.objects.get(id__startswith=issue_prefix)
+        parsed_data["issue"] = Issue.objects.get(mailbox_key=issue_prefix)
     except:
         logger.exception(f"Could not parse email address {to_addr}")
         return None
@@ -134,6 +141,22 @@ def parse_received_data(email_data: dict) -> dict:
     return parsed_data
 
 
+def parse_thread_headers(headers_str: str) -> dict:
+    """
+    Returns the Message-ID of the email and the Message-ID of the email it replies to, if any.
+    """
+    headers = HeaderParser().parsestr(headers_str or "")
+    message_ids = re.findall(r"<[^>]+>", headers.get("Message-ID", ""))
+    # Prefer In-Reply-To, but fall back to the last email in the References chain.
+    in_reply_to_ids = re.findall(r"<[^>]+>", headers.get("In-Reply-To", ""))
+    references_ids = re.findall(r"<[^>]+>", headers.get("References", ""))
+    in_reply_to = in_reply_to_ids[:1] or references_ids[-1:]
+    return {
+        "message_id": message_ids[0] if message_ids else "",
+        "in_reply_to": in_reply_to[0] if in_reply_to else "",
+    }
+
+
 def clean_email_addr(email_addr):
     email_addr = email_addr.strip()
     if "<" in email_addr:
@@ -1,5 +1,6 @@
 import os
 import logging
+from email.utils import make_msgid
 from django.conf import settings
 from django.utils import timezone
 
@@ -38,11 +39,11 @@ def send_email_task(email_pk: int):
         from_addr = build_clerk_address(email.issue, email_only=True)
         for att in email.emailattachment_set.all():
             file_name = os.path.basename(att.file.name)
-            file_bytes = att.file.read()
-            attachments.append((file_name, file_bytes, att.content_type))
+            attachments.append((file_name, att.file, att.content_type))
 
     logger.info("Sending email to %s from %s", email.to_address, from_addr)
-    message_id = send_email(
+    message_id = make_msgid(domain=settings.EMAIL_DOMAIN)
+    sendgrid_id = send_email(
         from_addr,
         email.to_address,
         email.cc_addresses,
@@ -50,11 +51,13 @@ def send_email_task(email_pk: int):
         email.text,
         attachments,
         html=email.html,
+        message_id=message_id,
     )
     Email.objects.filter(pk=email_pk).update(
         state=EmailState.SENT,
         processed_at=timezone.now(),
-        sendgrid_id=message_id,
+        sendgrid_id=sendgrid_id,
+        message_id=message_id,
     )
     if email.issue:
         IssueNote.objects.create(
@@ -69,6 +72,5 @@ def build_clerk_address(issue, email_only=False):
     """
     FIXME: TEST ME.
     """
-    issue_prefix = str(issue.id).split("-")[0]
-    email = f"case.{issue_prefix}@{settings.EMAIL_DOMAIN}"
+    email = f"case.{issue.mailbox_key}@{settings.EMAIL_DOMAIN}"
     return email if email_only else f"Anika Legal <{email}>"
@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.factories import EmailFactory
+from emails.models import EmailState
+
+
+def _event(event_type, sendgrid_id, timestamp):
+    return {
+        "event": event_type,
+        "sg_message_id": f"{sendgrid_id}.filterdrecv-p3mdw1-756b745b58-kmzbl-18-5F5FC76C-9.0",
+        "timestamp": timestamp,
+    }
+
+
+@pytest.mark.django_db
+def test_email_events():
+    """Events are applied in bulk, and delivery failures take precedence over deliveries."""
+    delivered = EmailFactory(state=EmailState.SENT, sendgrid_id="aaa")
+    bounced = EmailFactory(state=EmailState.SENT, sendgrid_id="bbb")
+    failed = EmailFactory(state=EmailState.DELIVERY_FAILURE, sendgrid_id="ccc")
+    processed = EmailFactory(state=EmailState.SENT, sendgrid_id="ddd")
+    events = [
+        _event("processed", "aaa", 1),
+        _event("delivered", "aaa", 2),
+        _event("bounce", "bbb", 4),
+        _event("delivered", "bbb", 3),
+        _event("delivered", "ccc", 5),
+        _event("processed", "ddd", 6),
+        _event("open", "aaa", 7),
+        _event("delivered", "zzz", 8),
+    ]
+    client = APIClient()
+    with CaptureQueriesContext(connection) as ctx:
+        resp = client.post("/email/events/", events, format="json")
+
+    assert resp.status_code == 200
+    email_queries = [q for q in ctx.captured_queries if "emails_email" in q["sql"]]
+    assert len(email_queries) == 2
+    for email in [delivered, bounced, failed, processed]:
+        email.refresh_from_db()
+
+    assert delivered.state == EmailState.DELIVERED
+    assert bounced.state == EmailState.DELIVERY_FAILURE
+    assert failed.state == EmailState.DELIVERY_FAILURE
+    assert processed.state == EmailState.SENT
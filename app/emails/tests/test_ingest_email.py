@@ -86,3 +86,34 @@ def test_ingest_email__with_success(settings, test_data):
     assert email.cc_addresses == expected_parsed["cc_addresses"]
     assert email.subject == expected_parsed["subject"]
     assert email.text == expected_parsed["text"]
+
+
+@pytest.mark.django_db
+def test_ingest_email__with_thread_headers(settings):
+    settings.EMAIL_DOMAIN = "fake.anikalegal.com"
+    issue_pk = "0e62ccc2-b9ee-4a07-979a-da8a9d450404"
+    issue = IssueFactory(id=issue_pk)
+    EmailFactory(
+        issue=issue,
+        state=EmailState.SENT,
+        subject="Hello World",
+        message_id="<sent123@fake.anikalegal.com>",
+    )
+    received_data = {
+        **SUCCESS_TEST_CASES[0]["received_data"],
+        "subject": "Re: Something else",
+        "headers": (
+            "Message-ID: <reply456@mail.gmail.com>\n"
+            "In-Reply-To: <sent123@fake.anikalegal.com>\n"
+            "References: <first789@fake.anikalegal.com> <sent123@fake.anikalegal.com>\n"
+        ),
+    }
+    email = EmailFactory(
+        state=EmailState.RECEIVED, received_data=received_data, issue=None
+    )
+    receive_email_task(email.pk)
+    email.refresh_from_db()
+    assert email.state == EmailState.INGESTED
+    assert email.message_id == "<reply456@mail.gmail.com>"
+    assert email.in_reply_to == "<sent123@fake.anikalegal.com>"
+    assert email.thread_slug == "hello-world"
@@ -0,0 +1,140 @@
+import json
+from datetime import datetime
+from unittest import mock
+from urllib.parse import unquote
+
+import pytest
+import pytz
+import responses
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.factories import EmailFactory
+from emails import api
+from emails.models import EmailState
+from emails.service.events import reconcile_email_states
+
+FROM_ADDR = "case.0e62ccc2@fake.anikalegal.com"
+
+
+def dt(hour, minute=0):
+    return datetime(2022, 1, 1, hour, minute, tzinfo=pytz.UTC)
+
+
+@pytest.fixture
+def mock_api():
+    with mock.patch("emails.service.events.api") as mock_api:
+        mock_api.fetch_messages.return_value = []
+        mock_api.fetch_bounces.return_value = []
+        mock_api.fetch_blocks.return_value = []
+        yield mock_api
+
+
+def _sent_email(to_address, subject, processed_at, sendgrid_id=""):
+    return EmailFactory(
+        state=EmailState.SENT,
+        from_address=FROM_ADDR,
+        to_address=to_address,
+        subject=subject,
+        processed_at=processed_at,
+        sendgrid_id=sendgrid_id,
+    )
+
+
+def _msg(msg_id, to_email, subject, status, last_event_time):
+    return {
+        "msg_id": msg_id,
+        "from_email": FROM_ADDR,
+        "to_email": to_email,
+        "subject": subject,
+        "status": status,
+        "last_event_time": last_event_time,
+    }
+
+
+@pytest.mark.django_db
+def test_reconcile_email_states(mock_api):
+    by_id = _sent_email("a@example.com", "Hello", dt(1), sendgrid_id="msg-a")
+    by_subject = _sent_email("b@example.com", "Your case", dt(2))
+    # Two emails with the same recipient and subject, matched by time.
+    repeat_1 = _sent_email("c@example.com", "Reminder", dt(3))
+    repeat_2 = _sent_email("c@example.com", "Reminder", dt(5))
+    bounced = _sent_email("d@example.com", "Documents", dt(6))
+    missing = _sent_email("e@example.com", "Nobody", dt(7))
+    mock_api.fetch_messages.return_value = [
+        _msg("msg-a", "a@example.com", "Hello", "delivered", "2022-01-01T01:00:10Z"),
+        _msg(
+            "msg-b", "b@example.com", "Your case", "delivered", "2022-01-01T02:00:10Z"
+        ),
+        _msg(
+            "msg-c2",
+            "c@example.com",
+            "Reminder",
+            "not_delivered",
+            "2022-01-01T05:01:00Z",
+        ),
+        _msg(
+            "msg-d", "d@example.com", "Documents", "delivered", "2022-01-01T06:00:10Z"
+        ),
+        _msg("msg-x", "x@example.com", "Unknown", "delivered", "2022-01-01T07:00:10Z"),
+    ]
+    mock_api.fetch_bounces.return_value = [
+        {"email": "d@example.com", "created": int(dt(6, 1).timestamp())}
+    ]
+
+    with CaptureQueriesContext(connection) as ctx:
+        counts = reconcile_email_states(dt(0), dt(12))
+
+    assert counts == {"found": 4, "missing": 1, "multiple": 0, "updated": 4}
+    assert len(ctx.captured_queries) == 2
+    expected = [
+        (by_id, "msg-a", EmailState.DELIVERED),
+        (by_subject, "msg-b", EmailState.DELIVERED),
+        (repeat_1, "", EmailState.SENT),
+        (repeat_2, "msg-c2", EmailState.DELIVERY_FAILURE),
+        (bounced, "msg-d", EmailState.DELIVERY_FAILURE),
+        (missing, "", EmailState.SENT),
+    ]
+    for email, sendgrid_id, state in expected:
+        email.refresh_from_db()
+        assert email.sendgrid_id == sendgrid_id
+        assert email.state == state
+
+
+@responses.activate
+def test_fetch_messages__splits_full_pages(settings):
+    """Time ranges with more than a page of messages are split in half and fetched separately."""
+    calls = []
+
+    def messages_callback(request):
+        calls.append(request)
+        # Only the first request, for the whole range, returns a full page.
+        count = api.MESSAGES_PAGE_SIZE if len(calls) == 1 else 3
+        headers = {"x-ratelimit-remaining": "10"}
+        return 200, headers, json.dumps({"messages": [{"msg_id": "x"}] * count})
+
+    responses.add_callback(
+        responses.GET, api.BASE_URL + "/v3/messages", callback=messages_callback
+    )
+
+    msgs = api.fetch_messages(dt(0), dt(12))
+
+    assert len(calls) == 3
+    assert len(msgs) == 6
+    assert 'TIMESTAMP "2022-01-01T06:00:00Z"' in unquote(calls[1].url)
+    assert 'TIMESTAMP "2022-01-01T06:00:01Z"' in unquote(calls[2].url)
+
+
+@responses.activate
+def test_fetch_bounces__paginates():
+    """All pages of bounces are fetched."""
+    page = [{"email": "a@example.com", "created": 1}] * api.SUPPRESSION_PAGE_SIZE
+    responses.add(responses.GET, api.BASE_URL + "/v3/suppression/bounces", json=page)
+    responses.add(
+        responses.GET, api.BASE_URL + "/v3/suppression/bounces", json=page[:2]
+    )
+
+    bounces = api.fetch_bounces(0, 100)
+
+    assert len(bounces) == api.SUPPRESSION_PAGE_SIZE + 2
+    assert "offset=500" in responses.calls[1].request.url
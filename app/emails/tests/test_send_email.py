@@ -1,4 +1,11 @@
+import base64
+import json
+from io import BytesIO
+
 import pytest
+import responses
+
+from emails import api
 
 from emails.service.send import build_clerk_address
 
@@ -13,3 +20,33 @@ def test_build_email_address(settings):
     issue_addr = build_clerk_address(issue)
     expected = "Anika Legal <case.0e62ccc2@fake.anikalegal.com>"
     assert issue_addr == expected
+
+
+@responses.activate
+def test_send_email():
+    """Emails are sent via the shared session, with attachments read from files."""
+    responses.add(
+        responses.POST,
+        api.BASE_URL + "/v3/mail/send",
+        status=202,
+        headers={"X-Message-Id": "abc123"},
+    )
+    attachment = BytesIO(b"This is the file contents")
+
+    sendgrid_id = api.send_email(
+        "case.0e62ccc2@fake.anikalegal.com",
+        "client@example.com",
+        [],
+        "Hello",
+        "Hi there",
+        attachments=[("foo.txt", attachment, "text/plain")],
+        message_id="<xyz@fake.anikalegal.com>",
+    )
+
+    assert sendgrid_id == "abc123"
+    data = json.loads(responses.calls[0].request.body)
+    assert data["personalizations"][0]["to"] == [{"email": "client@example.com"}]
+    assert data["headers"] == {"Message-ID": "<xyz@fake.anikalegal.com>"}
+    attachment_content = data["attachments"][0]["content"]
+    assert base64.b64decode(attachment_content) == b"This is the file contents"
+    assert api.get_session() is api.get_session()
@@ -26,6 +26,18 @@ def receive_email_view(request):
 
 
 EMAIL_EVENTS = ["delivered", "processed", "bounce", "dropped", "spamreport"]
+EVENT_STATES = {
+    "delivered": EmailState.DELIVERED,
+    "bounce": EmailState.DELIVERY_FAILURE,
+    "dropped": EmailState.DELIVERY_FAILURE,
+    "spamreport": EmailState.DELIVERY_FAILURE,
+}
+# When an email has several events, the state with the highest precedence wins.
+# A delivery failure is never overwritten by a delivery.
+STATE_PRECEDENCE = {
+    EmailState.DELIVERED: 1,
+    EmailState.DELIVERY_FAILURE: 2,
+}
 
 
 @csrf_exempt
@@ -36,8 +48,8 @@ def events_email_view(request):
 
     See docs/emails.md for more details.
     """
-    events = request.data
-    for event in events:
+    events = []
+    for event in request.data:
         timestamp = event["timestamp"]
         event_type = event["event"]
         sg_message_id = event.get("sg_message_id")
@@ -53,14 +65,19 @@ def events_email_view(request):
             )
             continue
 
-        # Try find the email based on the sendgrid message ID.
-        email = None
-        if sendgrid_id:
-            try:
-                email = Email.objects.get(sendgrid_id=sendgrid_id)
-            except Email.DoesNotExist:
-                pass
-
+        events.append((timestamp, event_type, sendgrid_id))
+
+    # Find all the emails based on their sendgrid message IDs.
+    sendgrid_ids = {sendgrid_id for _, _, sendgrid_id in events if sendgrid_id}
+    emails = {
+        email.sendgrid_id: email
+        for email in Email.objects.filter(sendgrid_id__in=sendgrid_ids).only(
+            "id", "sendgrid_id", "state"
+        )
+    }
+    updated_emails = {}
+    for timestamp, event_type, sendgrid_id in sorted(events, key=lambda e: e[0]):
+        email = emails.get(sendgrid_id) if sendgrid_id else None
         if not email:
             logger.info(
                 "Could not find email email for event %s at %s with sendgrid ID %s",
@@ -68,21 +85,22 @@ def events_email_view(request):
                 timestamp,
                 sendgrid_id,
             )
-        else:
-            logger.info(
-                "Marking Email<%s> as %s with sendgrid ID %s",
-                email.id,
-                event_type,
-                sendgrid_id,
-            )
-            is_id_match = not email.sendgrid_id or email.sendgrid_id == sendgrid_id
-            assert is_id_match, "Sendgrid ID mismatch."
-            if event_type == "delivered":
-                email.state = EmailState.DELIVERED
-            elif event_type in ["bounce", "dropped", "spamreport"]:
-                email.state = EmailState.DELIVERY_FAILURE
+            continue
+
+        logger.info(
+            "Marking Email<%s> as %s with sendgrid ID %s",
+            email.id,
+            event_type,
+            sendgrid_id,
+        )
+        next_state = EVENT_STATES.get(event_type)
+        if not next_state:
+            continue
 
-            email.sendgrid_id = sendgrid_id
-            email.save()
+        precedence = STATE_PRECEDENCE.get(email.state, 0)
+        if STATE_PRECEDENCE[next_state] >= precedence and email.state != next_state:
+            email.state = next_state
+            updated_emails[email.pk] = email
 
+    Email.objects.bulk_update(updated_emails.values(), ["state"])
     return HttpResponse(200)
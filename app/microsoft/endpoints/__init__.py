@@ -1,10 +1,8 @@
-from .helpers import create_client, get_token
+from .helpers import get_client, get_token
 from .group import GroupEndpoint
 from .user import UserEndpoint
 from .folder import FolderEndpoint
 
-from django.conf import settings
-
 """
 from microsoft.endpoints import MSGraphAPI
 api = MSGraphAPI()
@@ -18,15 +16,10 @@ class MSGraphAPI:
 
     def __init__(self):
         """
-        Constructor authenticates app and obtains access token.
+        Constructor obtains an access token, which is cached until it expires.
         Then instantiates endpoint objects and sets them as attributes.
         """
-        client = create_client(
-            settings.AZURE_AD_CLIENT_ID,
-            settings.MS_AUTHORITY_URL,
-            settings.AZURE_AD_CLIENT_SECRET,
-        )
-        access_token = get_token(client)
+        access_token = get_token(get_client())
 
         self.group = GroupEndpoint(access_token)
         self.user = UserEndpoint(access_token)
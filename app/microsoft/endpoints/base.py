@@ -1,32 +1,43 @@
 import logging
 import requests
+from django.conf import settings
 
-from microsoft.endpoints.helpers import BASE_URL, HTTP_HEADERS
+from microsoft.endpoints.helpers import BASE_URL, HTTP_HEADERS, get_session
 
 logger = logging.getLogger(__name__)
 
+# Max number of requests in a single JSON batch.
+BATCH_SIZE = 20
+
 
 class BaseEndpoint:
     """Base class for MS Graph endpoints."""
 
     def __init__(self, access_token):
-        HTTP_HEADERS["Authorization"] = "Bearer " + access_token
-        self.headers = HTTP_HEADERS
+        self.headers = {**HTTP_HEADERS, "Authorization": "Bearer " + access_token}
+        self.session = get_session()
+        self.timeout = settings.MS_GRAPH_TIMEOUT
 
     def get(self, path):
-        resp = requests.get(BASE_URL + path, headers=self.headers, stream=False)
+        resp = self.session.get(
+            BASE_URL + path, headers=self.headers, timeout=self.timeout
+        )
         return self.handle(resp)
 
     def get_list(self, path) -> list:
         """Get request but follows pagination and always returns a list"""
-        resp = requests.get(BASE_URL + path, headers=self.headers, stream=False)
+        resp = self.session.get(
+            BASE_URL + path, headers=self.headers, timeout=self.timeout
+        )
         json = self.handle(resp)
         resp_list = []
         if json:
             resp_list += json["value"]
             next_url = json.get("@odata.nextLink", "")
             while next_url:
-                resp = requests.get(next_url, headers=self.headers, stream=False)
+                resp = self.session.get(
+                    next_url, headers=self.headers, timeout=self.timeout
+                )
                 next_json = self.handle(resp)
                 resp_list += next_json["value"]
                 next_url = next_json.get("@odata.nextLink", "")
@@ -34,21 +45,93 @@ class BaseEndpoint:
         return resp_list
 
     def post(self, path, data):
-        resp = requests.post(
-            BASE_URL + path, headers=self.headers, json=data, stream=False
+        resp = self.session.post(
+            BASE_URL + path, headers=self.headers, json=data, timeout=self.timeout
         )
         return self.handle(resp)
 
     def patch(self, path, data):
-        resp = requests.patch(
-            BASE_URL + path, headers=self.headers, json=data, stream=False
+        resp = self.session.patch(
+            BASE_URL + path, headers=self.headers, json=data, timeout=self.timeout
         )
         return self.handle(resp)
 
     def delete(self, path):
-        resp = requests.delete(BASE_URL + path, headers=self.headers, stream=False)
+        resp = self.session.delete(
+            BASE_URL + path, headers=self.headers, timeout=self.timeout
+        )
         return self.handle(resp)
 
+    def batch(self, batch_requests: list) -> list:
+        """
+        Send many requests using JSON batching, up to 20 per round trip.
+        https://learn.microsoft.com/en-us/graph/json-batching
+        Each request is a dict with a "method", a "url" relative to BASE_URL, and optionally a "body".
+        Returns the response bodies in request order, with None for 404s.
+        """
+        results = []
+        for start in range(0, len(batch_requests), BATCH_SIZE):
+            chunk = batch_requests[start : start + BATCH_SIZE]
+            data = {"requests": []}
+            for idx, batch_request in enumerate(chunk):
+                item = {
+                    "id": str(idx),
+                    "method": batch_request["method"],
+                    "url": "/" + batch_request["url"].lstrip("/"),
+                }
+                if "body" in batch_request:
+                    item["body"] = batch_request["body"]
+                    item["headers"] = {"Content-Type": "application/json"}
+
+                data["requests"].append(item)
+
+            json = self.post("$batch", data)
+            responses = {r["id"]: r for r in json["responses"]}
+            for idx, batch_request in enumerate(chunk):
+                results.append(self.handle_batch(batch_request, responses[str(idx)]))
+
+        return results
+
+    def batch_get_list(self, paths: list) -> list:
+        """
+        Batched version of get_list, returns a list for each path.
+        """
+        json_list = self.batch([{"method": "GET", "url": path} for path in paths])
+        results = []
+        for json in json_list:
+            resp_list = []
+            if json:
+                resp_list += json["value"]
+                next_url = json.get("@odata.nextLink", "")
+                while next_url:
+                    resp = self.session.get(
+                        next_url, headers=self.headers, timeout=self.timeout
+                    )
+                    next_json = self.handle(resp)
+                    resp_list += next_json["value"]
+                    next_url = next_json.get("@odata.nextLink", "")
+
+            results.append(resp_list)
+
+        return results
+
+    def handle_batch(self, batch_request, batch_response):
+        """
+        Same as handle, but for a single response from a JSON batch.
+        """
+        status = batch_response["status"]
+        json = batch_response.get("body")
+        if status == 404:
+            return None
+        elif status >= 400:
+            method, url = batch_request["method"], batch_request["url"]
+            logger.error(f"Batched {method} {url} failed with response body: {json}")
+            raise requests.exceptions.HTTPError(
+                f"{status} error for batched {method} {url}"
+            )
+
+        return json
+
     def handle(self, resp):
         # Collect response body as JSON.
         json = resp.json() if resp.content else None
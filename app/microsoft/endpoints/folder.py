@@ -1,7 +1,9 @@
 import os
+import time
 import logging
 
 import requests
+from urllib.parse import quote
 from django.conf import settings
 from django.utils.text import slugify
 
@@ -13,6 +15,9 @@ logger = logging.getLogger(__name__)
 
 
 FILE_UPLOAD_SIZE_LIMIT = 4194304  # bytes
+UPLOAD_CHUNK_SIZE = 10485760  # bytes, must be a multiple of 320 KiB
+UPLOAD_MAX_RETRIES = 3
+UPLOAD_RETRY_DELAY = 2  # seconds
 
 
 class FolderEndpoint(BaseEndpoint):
@@ -23,6 +28,12 @@ class FolderEndpoint(BaseEndpoint):
 
     MIDDLE_URL = f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/root:/"
 
+    def __init__(self, access_token):
+        super().__init__(access_token)
+        # Folders found by get_child_if_exists, keyed by (parent_id, name).
+        # Lives as long as this endpoint, which is usually a single task.
+        self.folder_cache = {}
+
     def get(self, path):
         """
         Get the Folder inside the Group Drive (filesystem).
@@ -39,6 +50,22 @@ class FolderEndpoint(BaseEndpoint):
         url = os.path.join(self.MIDDLE_URL, f"{path}:/children")
         return super().get_list(url)
 
+    def get_delta(self, delta_link=None):
+        """
+        Iterate over pages of changes to the Group Drive since delta_link was issued,
+        or over every item in the Drive if there is no delta_link.
+        https://docs.microsoft.com/en-us/graph/api/driveitem-delta
+        Yields (items, new_delta_link) where new_delta_link is None until the last page.
+        """
+        url = delta_link or os.path.join(
+            BASE_URL, f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/root/delta"
+        )
+        while url:
+            resp = self.session.get(url, headers=self.headers, timeout=self.timeout)
+            json = self.handle(resp)
+            url = json.get("@odata.nextLink")
+            yield json["value"], json.get("@odata.deltaLink")
+
     def get_all_files(self, path):
         """
         Recursively get all files inside current folder.
@@ -64,7 +91,7 @@ class FolderEndpoint(BaseEndpoint):
         Create a folder in the parent
         """
         url = f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/items/{parent_id}/children"
-        return super().post(
+        folder = super().post(
             url,
             data={
                 "name": folder_name,
@@ -72,6 +99,10 @@ class FolderEndpoint(BaseEndpoint):
                 "@microsoft.graph.conflictBehavior": "rename",
             },
         )
+        if folder and folder.get("name") == folder_name:
+            self.folder_cache[(parent_id, folder_name)] = folder
+
+        return folder
 
     def upload_file(self, file, parent_id, name=None):
         """
@@ -100,14 +131,26 @@ class FolderEndpoint(BaseEndpoint):
             self.delete_file(file["id"])
 
     def get_child_if_exists(self, filename, parent_id):
-        # Check for existing file.
-        url = f"/groups/{settings.MS_GRAPH_GROUP_ID}/drive/items/{parent_id}/children"
-        children = super().get_list(url)
-        for f in children:
-            if filename == f["name"]:
-                return f
+        """
+        Get a file or folder by name from inside the parent folder.
+        Returns driveItem object or None.
+        """
+        cache_key = (parent_id, filename)
+        if cache_key in self.folder_cache:
+            return self.folder_cache[cache_key]
+
+        url = f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/items/{parent_id}:/{quote(filename)}"
+        item = super().get(url)
+        if item and "folder" in item:
+            # Only cache folders, files are replaced on upload.
+            self.folder_cache[cache_key] = item
+
+        return item
 
     def delete_file(self, file_id):
+        self.folder_cache = {
+            k: v for k, v in self.folder_cache.items() if v["id"] != file_id
+        }
         url = f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/items/{file_id}"
         return super().delete(url)
 
@@ -125,7 +168,7 @@ class FolderEndpoint(BaseEndpoint):
             BASE_URL,
             f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/items/{file_id}/content",
         )
-        resp = requests.get(url, headers=self.headers, stream=False)
+        resp = self.session.get(url, headers=self.headers, timeout=self.timeout)
         resp.raise_for_status()
 
         return file_name, mimetype, resp.content
@@ -151,9 +194,18 @@ class FolderEndpoint(BaseEndpoint):
         Returns list of permissions or None if Folder doesn't exist.
         """
         url = os.path.join(self.MIDDLE_URL, f"{path}:/permissions")
-
         perms = super().get_list(url)
+        return self._parse_permissions(perms)
+
+    def list_permissions_batch(self, paths):
+        """
+        List the permissions for many Folders, using batched requests.
+        Returns a list of permissions (or None) for each path.
+        """
+        urls = [os.path.join(self.MIDDLE_URL, f"{path}:/permissions") for path in paths]
+        return [self._parse_permissions(perms) for perms in super().batch_get_list(urls)]
 
+    def _parse_permissions(self, perms):
         if perms:
             list_permissions = []
             for item in perms:
@@ -181,18 +233,36 @@ class FolderEndpoint(BaseEndpoint):
         Create permissions (read or write) for a Folder.
         Returns permissions created or None if Folder doesn't exist.
         """
-        assert role in ["read", "write"]
+        data = self._get_permissions_data(role, emails)
+        url = os.path.join(self.MIDDLE_URL, f"{path}:/invite")
 
-        data = {
+        return super().post(url, data)
+
+    def create_permissions_batch(self, paths, role, emails):
+        """
+        Create the same permissions for many Folders, using batched requests.
+        Returns permissions created (or None) for each path.
+        """
+        data = self._get_permissions_data(role, emails)
+        batch_requests = [
+            {
+                "method": "POST",
+                "url": os.path.join(self.MIDDLE_URL, f"{path}:/invite"),
+                "body": data,
+            }
+            for path in paths
+        ]
+        return super().batch(batch_requests)
+
+    def _get_permissions_data(self, role, emails):
+        assert role in ["read", "write"]
+        return {
             # Do not remove fields or POST request might fail.
             "requireSignIn": True,
             "sendInvitation": False,
             "roles": [role],
             "recipients": [{"email": email} for email in emails],
         }
-        url = os.path.join(self.MIDDLE_URL, f"{path}:/invite")
-
-        return super().post(url, data)
 
     def _upload_small_file(self, file, parent_id, upload_filename):
         url = os.path.join(
@@ -203,7 +273,7 @@ class FolderEndpoint(BaseEndpoint):
         content_type = getattr(file, "content_type", "")
         if content_type:
             headers["Content-Type"] = content_type
-        resp = requests.put(url, data=file, headers=headers, stream=True)
+        resp = self.session.put(url, data=file, headers=headers, timeout=self.timeout)
         return self.handle(resp)
 
     def _upload_large_file(self, file, parent_id, upload_filename):
@@ -213,29 +283,87 @@ class FolderEndpoint(BaseEndpoint):
             f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/items/{parent_id}:/{upload_filename}:/createUploadSession",
         )
         data = {"name": upload_filename}
-        resp = requests.post(url, json=data, headers=self.headers, stream=False)
+        resp = self.session.post(
+            url, json=data, headers=self.headers, timeout=self.timeout
+        )
 
         session_data = self.handle(resp)
-        upload_url = session_data["uploadUrl"]
+        upload_session = UploadSession(
+            self.session, session_data["uploadUrl"], self.headers, self.timeout
+        )
+        return upload_session.upload(file)
+
+
+class UploadSession:
+    """
+    Uploads a file to a resumable upload session, one chunk at a time.
+    https://docs.microsoft.com/en-us/graph/api/driveitem-createuploadsession
+    Chunks are read from the file as they are sent, so only one chunk is held in memory.
+    If a chunk fails then we ask the session which ranges it still expects and resume from there,
+    rather than failing the whole upload.
+    """
 
-        CHUNK_SIZE = 10485760
-        chunks = int(file.size / CHUNK_SIZE) + 1 if file.size % CHUNK_SIZE > 0 else 0
+    def __init__(self, session, upload_url, headers, timeout):
+        self.session = session
+        self.upload_url = upload_url
+        self.headers = headers
+        self.timeout = timeout
+
+    def upload(self, file):
+        """
+        Upload the file, returns the driveItem for the uploaded file.
+        """
         start = 0
-        file.seek(0)
-        for _ in range(chunks):
-            chunk = file.read(CHUNK_SIZE)
-            bytes_read = len(chunk)
-            upload_range = f"bytes {start}-{start + bytes_read - 1}/{file.size}"
-            resp = requests.put(
-                upload_url,
-                headers={
-                    "Content-Length": str(bytes_read),
-                    "Content-Range": upload_range,
-                    **self.headers,
-                },
-                data=chunk,
-            )
-            resp.raise_for_status()
-            start += bytes_read
-
-        return self.get_child_if_exists(upload_filename, parent_id)
+        retries = 0
+        while True:
+            try:
+                resp = self._put_chunk(file, start)
+            except requests.RequestException:
+                retries += 1
+                if retries > UPLOAD_MAX_RETRIES:
+                    raise
+
+                logger.exception(
+                    "Upload chunk at byte %s failed, retry %s", start, retries
+                )
+                time.sleep(UPLOAD_RETRY_DELAY * retries)
+                start = self._get_next_start()
+                continue
+
+            if resp.status_code in [200, 201]:
+                # The final chunk returns the newly created driveItem.
+                return resp.json()
+
+            retries = 0
+            start = self._parse_next_start(resp.json())
+
+    def _put_chunk(self, file, start):
+        file.seek(start)
+        chunk = file.read(UPLOAD_CHUNK_SIZE)
+        bytes_read = len(chunk)
+        upload_range = f"bytes {start}-{start + bytes_read - 1}/{file.size}"
+        resp = self.session.put(
+            self.upload_url,
+            headers={
+                **self.headers,
+                "Content-Length": str(bytes_read),
+                "Content-Range": upload_range,
+            },
+            data=chunk,
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
+        return resp
+
+    def _get_next_start(self):
+        """
+        Ask the upload session which byte it expects next.
+        """
+        resp = self.session.get(self.upload_url, timeout=self.timeout)
+        resp.raise_for_status()
+        return self._parse_next_start(resp.json())
+
+    def _parse_next_start(self, session_data):
+        # Ranges look like ["12345-"] or ["12345-55232", "77829-99375"]
+        next_range = session_data["nextExpectedRanges"][0]
+        return int(next_range.split("-")[0])
@@ -3,6 +3,10 @@ import logging
 import string
 import secrets
 
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +19,44 @@ HTTP_HEADERS = {
 }
 
 
+# Shared by every MSGraphAPI in this process, see get_client and get_session.
+_client = None
+_session = None
+
+
+def get_client():
+    """
+    Returns the process-wide MSAL client.
+    Reusing it means its token cache is reused, so tokens are only requested when they expire.
+    """
+    global _client
+    if _client is None:
+        _client = create_client(
+            settings.AZURE_AD_CLIENT_ID,
+            settings.MS_AUTHORITY_URL,
+            settings.AZURE_AD_CLIENT_SECRET,
+        )
+
+    return _client
+
+
+def get_session():
+    """
+    Returns the process-wide HTTP session for Graph API requests.
+    Connections are kept alive and pooled so each request doesn't pay for TLS setup.
+    """
+    global _session
+    if _session is None:
+        adapter = HTTPAdapter(
+            pool_connections=settings.MS_GRAPH_POOL_SIZE,
+            pool_maxsize=settings.MS_GRAPH_POOL_SIZE,
+        )
+        _session = requests.Session()
+        _session.mount("https://", adapter)
+
+    return _session
+
+
 def create_client(client_id, authority_url, client_secret):
     """Authenticate our app with Azure Active Directory."""
     client = msal.ConfidentialClientApplication(
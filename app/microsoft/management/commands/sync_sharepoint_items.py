@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from microsoft.models import SharepointItem, SharepointSync
+from microsoft.service import sync_sharepoint_items
+
+
+class Command(BaseCommand):
+    """
+    ./manage.py sync_sharepoint_items
+    ./manage.py sync_sharepoint_items --full
+    """
+
+    help = (
+        "Update the local copy of case folders from Sharepoint. "
+        "The first run copies every case folder, later runs only fetch changes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ignore the last sync and copy every case folder again",
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs["full"]:
+            SharepointSync.objects.all().delete()
+
+        if not SharepointSync.objects.exists():
+            self.stdout.write("Copying all case folders from Sharepoint")
+
+        sync_sharepoint_items()
+        self.stdout.write(f"Synced {SharepointItem.objects.count()} Sharepoint items")
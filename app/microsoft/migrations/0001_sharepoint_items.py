@@ -0,0 +1,47 @@
+# Generated by Django 4.0.10 on 2026-10-18 18:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0058_issue_assignment_task_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SharepointSync',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('modified_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('delta_link', models.TextField()),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SharepointItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('modified_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('item_id', models.CharField(max_length=128, unique=True)),
+                ('name', models.CharField(max_length=256)),
+                ('web_url', models.URLField(max_length=1024)),
+                ('is_folder', models.BooleanField()),
+                ('size', models.BigIntegerField(default=0)),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.issue')),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='children', to='microsoft.sharepointitem')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
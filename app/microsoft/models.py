@@ -0,0 +1,32 @@
+from django.db import models
+
+from core.models import Issue, TimestampedModel
+
+
+class SharepointItem(TimestampedModel):
+    """
+    A local copy of a case folder, or a file/folder inside a case folder, on Sharepoint.
+    Kept up to date with Graph delta queries so that document lists don't need to crawl Sharepoint.
+    """
+
+    item_id = models.CharField(max_length=128, unique=True)
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE)
+    # Null for the case folder itself.
+    parent = models.ForeignKey(
+        "self", on_delete=models.CASCADE, null=True, blank=True, related_name="children"
+    )
+    name = models.CharField(max_length=256)
+    web_url = models.URLField(max_length=1024)
+    is_folder = models.BooleanField()
+    size = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.pk} {self.name}"
+
+
+class SharepointSync(TimestampedModel):
+    """
+    Where the last sync of SharepointItems got up to.
+    """
+
+    delta_link = models.TextField()
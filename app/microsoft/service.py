@@ -1,12 +1,16 @@
 import logging
+import uuid
 
+import requests
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
 from accounts.models import User
 from core.models import CaseTopic, Issue, FileUpload
 from emails.models import Email, EmailAttachment
 from microsoft.endpoints import MSGraphAPI
+from microsoft.models import SharepointItem, SharepointSync
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +36,10 @@ def get_user_permissions(user):
     if ms_account:
         members = api.group.members()
         has_coordinator_perms = user.email in members
-        for issue in Issue.objects.filter(paralegal=user).all():
-            case_path = f"cases/{issue.id}"
-            permissions = api.folder.list_permissions(case_path)
+        issues = list(Issue.objects.filter(paralegal=user).all())
+        case_paths = [f"cases/{issue.id}" for issue in issues]
+        permissions_list = api.folder.list_permissions_batch(case_paths)
+        for issue, permissions in zip(issues, permissions_list):
             has_access = False
             for perm in permissions or []:
                 _, perm_data = perm
@@ -119,7 +124,10 @@ def set_up_new_case(issue: Issue):
             logger.info(
                 "Uploading case file %s to Sharepoint for Issue<%s>", name, issue.pk
             )
-            api.folder.upload_file(file_upload.file, uploads_folder["id"], name=name)
+            item = api.folder.upload_file(
+                file_upload.file, uploads_folder["id"], name=name
+            )
+            _save_uploaded_item(issue, uploads_folder, item)
 
 
 def save_email_attachment(email: Email, att: EmailAttachment):
@@ -140,7 +148,28 @@ def save_email_attachment(email: Email, att: EmailAttachment):
     logger.info(
         "Uploading email attachment %s to Sharepoint for Issue<%s>", name, issue.pk
     )
-    api.folder.upload_file(att.file, uploads_folder["id"], name=name)
+    item = api.folder.upload_file(att.file, uploads_folder["id"], name=name)
+    _save_uploaded_item(issue, uploads_folder, item)
+
+
+def _save_uploaded_item(issue, folder, item):
+    """
+    Add a file that we uploaded, and the folder it was uploaded into, to the local copy
+    of the case folder so that it is listed straight away rather than after the next sync.
+    """
+    case_folder = SharepointItem.objects.filter(issue=issue, parent=None).first()
+    if not case_folder or not item:
+        # Case folders which haven't been synced yet are read from Sharepoint.
+        return
+
+    parent, _ = SharepointItem.objects.update_or_create(
+        item_id=folder["id"], defaults=_get_item_fields(issue.pk, case_folder, folder)
+    )
+    # Uploads replace any existing file with the same name.
+    parent.children.filter(name=item["name"]).exclude(item_id=item["id"]).delete()
+    SharepointItem.objects.update_or_create(
+        item_id=item["id"], defaults=_get_item_fields(issue.pk, parent, item)
+    )
 
 
 def _create_folder_if_not_exists(api, issue, name, parent_id):
@@ -163,6 +192,16 @@ def add_user_to_case(user, issue):
     api.folder.create_permissions(case_path, "write", [user.email])
 
 
+def add_user_to_cases(user, issues):
+    """
+    Give User write permissions for many cases (folders), using batched requests.
+    """
+    api = MSGraphAPI()
+    case_paths = [f"cases/{issue.id}" for issue in issues]
+    if case_paths:
+        api.folder.create_permissions_batch(case_paths, "write", [user.email])
+
+
 def remove_user_from_case(user, issue):
     """
     Delete the permissions that a User has for a specific case (folder).
@@ -184,7 +223,14 @@ def remove_user_from_case(user, issue):
 def get_case_folder_info(issue):
     """
     Return a tuple containing the case folder's list of files and URL.
+    Reads from the local copy of Sharepoint if the case folder has been synced.
     """
+    case_folder = SharepointItem.objects.filter(issue=issue, parent=None).first()
+    if case_folder:
+        children = case_folder.children.order_by("name")
+        list_files = [(item.name, item.web_url) for item in children]
+        return list_files, case_folder.web_url
+
     api = MSGraphAPI()
 
     case_path = f"cases/{issue.id}"
@@ -199,6 +245,110 @@ def get_case_folder_info(issue):
     return list_files, folder_url
 
 
+def get_case_files(issue):
+    """
+    Return all files inside the case folder, including those in sub-folders.
+    Reads from the local copy of Sharepoint if the case folder has been synced.
+    """
+    if SharepointItem.objects.filter(issue=issue, parent=None).exists():
+        files = SharepointItem.objects.filter(issue=issue, is_folder=False)
+        return [
+            {"id": f.item_id, "name": f.name, "size": f.size, "webUrl": f.web_url}
+            for f in files.order_by("name")
+        ]
+
+    api = MSGraphAPI()
+    return api.folder.get_all_files(f"cases/{issue.id}")
+
+
+def sync_sharepoint_items():
+    """
+    Update the local copy of case folders on Sharepoint with all changes since the last sync.
+    """
+    api = MSGraphAPI()
+    sync = SharepointSync.objects.order_by("-created_at").first()
+    delta_link = sync.delta_link if sync else None
+    try:
+        _sync_sharepoint_items(api, delta_link)
+    except requests.HTTPError as e:
+        if delta_link and e.response is not None and e.response.status_code == 410:
+            # The delta link has expired, we need to start again from scratch.
+            logger.info("Sharepoint delta link expired, re-syncing all items")
+            _sync_sharepoint_items(api, None)
+        else:
+            raise
+
+
+@transaction.atomic
+def _sync_sharepoint_items(api, delta_link):
+    if not delta_link:
+        SharepointItem.objects.all().delete()
+
+    new_delta_link = None
+    for items, new_delta_link in api.folder.get_delta(delta_link):
+        # Changes arrive in order, so parents are always seen before their children.
+        parent_ids = {i.get("parentReference", {}).get("id") for i in items}
+        item_ids = {i["id"] for i in items}
+        known = {
+            item.item_id: item
+            for item in SharepointItem.objects.filter(item_id__in=parent_ids | item_ids)
+        }
+        for data in items:
+            _sync_sharepoint_item(data, known)
+
+    SharepointSync.objects.all().delete()
+    SharepointSync.objects.create(delta_link=new_delta_link)
+
+
+def _sync_sharepoint_item(data, known):
+    item_id = data["id"]
+    parent_id = data.get("parentReference", {}).get("id")
+    if "deleted" in data:
+        SharepointItem.objects.filter(item_id=item_id).delete()
+        known.pop(item_id, None)
+        return
+
+    parent = known.get(parent_id)
+    if parent:
+        issue_id = parent.issue_id
+    elif parent_id == settings.CASES_FOLDER_ID and "folder" in data:
+        issue_id = _get_case_folder_issue_id(data["name"])
+    else:
+        issue_id = None
+
+    if not issue_id:
+        # Not inside a case folder, or moved out of one.
+        if item_id in known:
+            known.pop(item_id).delete()
+
+        return
+
+    item, _ = SharepointItem.objects.update_or_create(
+        item_id=item_id, defaults=_get_item_fields(issue_id, parent, data)
+    )
+    known[item_id] = item
+
+
+def _get_item_fields(issue_id, parent, data):
+    return {
+        "issue_id": issue_id,
+        "parent": parent,
+        "name": data["name"],
+        "web_url": data.get("webUrl", ""),
+        "is_folder": "folder" in data,
+        "size": data.get("size", 0),
+    }
+
+
+def _get_case_folder_issue_id(name):
+    try:
+        issue_id = uuid.UUID(name)
+    except ValueError:
+        return None
+
+    return Issue.objects.filter(pk=issue_id).values_list("pk", flat=True).first()
+
+
 def set_up_coordinator(user):
     """
     Add User as Group member.
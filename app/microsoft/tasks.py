@@ -5,14 +5,18 @@ from django.utils import timezone
 from django.contrib.auth.models import Group
 
 from utils.sentry import sentry_task
-from core.models import Issue
+from core.models import Issue, IssueEvent
+from core.models.issue_event import EventType
 from accounts.models import User, CaseGroups
 from emails.service.send import send_email
 from .service import (
     set_up_new_case,
     set_up_new_user,
     add_user_to_case,
+    add_user_to_cases,
+    remove_user_from_case,
     set_up_coordinator,
+    sync_sharepoint_items,
 )
 
 
@@ -52,19 +56,16 @@ def refresh_ms_permissions(user):
     if is_coordinator_or_better:
         set_up_coordinator(user)
     elif is_paralegal:
-        sharepoint_issues = (
-            user.issue_set.select_related("paralegal")
-            .filter(is_sharepoint_set_up=True, created_at__year__gte=2022)
-            .all()
+        sharepoint_issues = list(
+            user.issue_set.filter(is_sharepoint_set_up=True, created_at__year__gte=2022)
         )
-        for issue in sharepoint_issues:
-            logger.info(
-                "Refreshing Sharepoint access for User<%s:%s> + Issue<%s>",
-                issue.paralegal.pk,
-                issue.paralegal.get_full_name(),
-                issue.pk,
-            )
-            add_user_to_case(issue.paralegal, issue)
+        logger.info(
+            "Refreshing Sharepoint access for User<%s:%s> + %s Issues",
+            user.pk,
+            user.get_full_name(),
+            len(sharepoint_issues),
+        )
+        add_user_to_cases(user, sharepoint_issues)
 
 
 @sentry_task
@@ -76,6 +77,69 @@ def set_up_new_case_task(issue_pk: str):
     logger.info("Finished setting up folder on Sharepoint for Issue<%s>", issue_pk)
 
 
+@sentry_task
+def update_case_paralegal_access_task(issue_pk: str, prev_paralegal_pk: int = None):
+    """
+    Give the case's paralegal access to the matching Sharepoint folder
+    and revoke the previous paralegal's access. Safe to run more than once.
+    """
+    issue = Issue.objects.select_related("paralegal").get(pk=issue_pk)
+    if prev_paralegal_pk and prev_paralegal_pk != issue.paralegal_id:
+        prev_paralegal = User.objects.get(pk=prev_paralegal_pk)
+        logger.info(
+            "Removing User<%s> from the Sharepoint folder matching Issue<%s>",
+            prev_paralegal.pk,
+            issue.pk,
+        )
+        remove_user_from_case(prev_paralegal, issue)
+
+    if issue.paralegal:
+        logger.info(
+            "Adding User<%s> to the Sharepoint folder matching Issue<%s>",
+            issue.paralegal.pk,
+            issue.pk,
+        )
+        add_user_to_case(issue.paralegal, issue)
+
+    # Another assignment may have happened while this task was running,
+    # in which case that assignment's task is responsible for the final state.
+    Issue.objects.filter(pk=issue.pk, paralegal=issue.paralegal).update(
+        is_paralegal_access_set_up=True
+    )
+
+
+def retry_case_paralegal_access():
+    """
+    Re-run Sharepoint access updates which failed.
+    Run as a scheduled task.
+    """
+    fifteen_minutes_ago = timezone.now() - timezone.timedelta(minutes=15)
+    issues = Issue.objects.filter(
+        is_paralegal_access_set_up=False, modified_at__lt=fifteen_minutes_ago
+    )
+    for issue in issues:
+        # The most recent paralegal change tells us whose access to revoke.
+        event = (
+            IssueEvent.objects.filter(issue=issue, event_type=EventType.PARALEGAL)
+            .order_by("-created_at")
+            .first()
+        )
+        prev_paralegal_pk = event.prev_user_id if event else None
+        logger.info("Retrying Sharepoint access update for Issue<%s>", issue.pk)
+        update_case_paralegal_access_task(str(issue.pk), prev_paralegal_pk)
+
+
+@sentry_task
+def sync_sharepoint_items_task():
+    """
+    Pull changes to case folders from Sharepoint into the local copy.
+    Run as a scheduled task.
+    """
+    logger.info("Syncing Sharepoint items")
+    sync_sharepoint_items()
+    logger.info("Finished syncing Sharepoint items")
+
+
 @sentry_task
 def set_up_new_user_task(user_pk: int):
     """
@@ -5,9 +5,12 @@ from unittest.mock import patch
 
 import pytest
 from django.contrib.auth.models import Group
+from django.utils import timezone
 
 from accounts.models import CaseGroups
 from core.factories import UserFactory, IssueFactory
+from core.models import Issue
+from microsoft.tasks import retry_case_paralegal_access
 
 
 @pytest.mark.django_db
@@ -82,36 +85,91 @@ def test_admin_to_coordinator(
 
 
 @pytest.mark.django_db
-@patch("core.signals.issue.remove_user_from_case")
-@patch("core.signals.issue.add_user_to_case")
-def test_add_paralegal_to_case(add_user_to_case, remove_user_from_case):
+@patch("core.services.slack.send_case_assignment_slack")
+@patch("microsoft.tasks.remove_user_from_case")
+@patch("microsoft.tasks.add_user_to_case")
+def test_add_paralegal_to_case(
+    add_user_to_case,
+    remove_user_from_case,
+    send_case_assignment_slack,
+    django_capture_on_commit_callbacks,
+):
     user = UserFactory()
     issue = IssueFactory(is_case_sent=True, paralegal=None)
     add_user_to_case.assert_not_called()
     issue.paralegal = user
     issue.lawyer = UserFactory()
-    issue.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        issue.save()
+
     add_user_to_case.assert_called_once_with(user, issue)
+    remove_user_from_case.assert_not_called()
+    send_case_assignment_slack.assert_called_once_with(issue)
+    issue.refresh_from_db()
+    assert issue.is_paralegal_access_set_up
+    assert issue.is_assignment_slack_sent
 
 
 @pytest.mark.django_db
-@patch("core.signals.issue.remove_user_from_case")
-@patch("core.signals.issue.add_user_to_case")
-def test_remove_paralegal_from_case(add_user_to_case, remove_user_from_case):
+@patch("core.services.slack.send_case_assignment_slack")
+@patch("microsoft.tasks.remove_user_from_case")
+@patch("microsoft.tasks.add_user_to_case")
+def test_remove_paralegal_from_case(
+    add_user_to_case,
+    remove_user_from_case,
+    send_case_assignment_slack,
+    django_capture_on_commit_callbacks,
+):
     user = UserFactory()
     issue = IssueFactory(is_case_sent=True, paralegal=user, lawyer=UserFactory())
     remove_user_from_case.assert_not_called()
     issue.paralegal = UserFactory()
-    issue.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        issue.save()
+
+    remove_user_from_case.assert_called_once_with(user, issue)
+    add_user_to_case.assert_called_once_with(issue.paralegal, issue)
+
+
+@pytest.mark.django_db
+@patch("core.services.slack.send_case_assignment_slack")
+@patch("microsoft.tasks.remove_user_from_case")
+@patch("microsoft.tasks.add_user_to_case")
+def test_paralegal_access_retried_after_failure(
+    add_user_to_case,
+    remove_user_from_case,
+    send_case_assignment_slack,
+    django_capture_on_commit_callbacks,
+):
+    user = UserFactory()
+    issue = IssueFactory(is_case_sent=True, paralegal=user, lawyer=UserFactory())
+    new_user = UserFactory()
+    issue.paralegal = new_user
+    add_user_to_case.side_effect = Exception("MS Graph is down")
+    with django_capture_on_commit_callbacks(execute=True):
+        issue.save()
+
+    issue.refresh_from_db()
+    assert not issue.is_paralegal_access_set_up
+
+    add_user_to_case.reset_mock(side_effect=True)
+    remove_user_from_case.reset_mock()
+    Issue.objects.filter(pk=issue.pk).update(
+        modified_at=timezone.now() - timezone.timedelta(hours=1)
+    )
+    retry_case_paralegal_access()
     remove_user_from_case.assert_called_once_with(user, issue)
+    add_user_to_case.assert_called_once_with(new_user, issue)
+    issue.refresh_from_db()
+    assert issue.is_paralegal_access_set_up
 
 
 @pytest.mark.django_db
 @patch("accounts.signals.remove_user_from_case")
 @patch("accounts.signals.set_up_coordinator")
 @patch("accounts.signals.tear_down_coordinator")
-@patch("core.signals.issue.remove_user_from_case")
-@patch("core.signals.issue.add_user_to_case")
+@patch("microsoft.tasks.remove_user_from_case")
+@patch("microsoft.tasks.add_user_to_case")
 def test_remove_paralegal_from_group(
     core_add_user_to_case,
     core_remove_user_from_case,
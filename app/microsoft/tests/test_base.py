@@ -1,3 +1,5 @@
+import json
+
 import pytest
 import responses
 import requests
@@ -109,3 +111,53 @@ def test_get_fail(base):
     result = base.get("users/" + userPrincipalName)
 
     assert result == None
+
+
+@responses.activate
+def test_batch(base):
+    """Batch method sends requests in chunks of 20 and returns bodies in order."""
+    paths = [f"users/user{i}@anikalegal.com" for i in range(25)]
+
+    def batch_callback(request):
+        batch = json.loads(request.body)
+        body = {
+            "responses": [
+                {
+                    "id": r["id"],
+                    # Return responses out of order, like MS Graph may do.
+                    "status": 404 if r["url"].endswith("user3@anikalegal.com") else 200,
+                    "body": {"url": r["url"]},
+                }
+                for r in reversed(batch["requests"])
+            ]
+        }
+        return 200, {}, json.dumps(body)
+
+    responses.add_callback(
+        responses.POST,
+        BASE_URL + "$batch",
+        callback=batch_callback,
+        content_type="application/json",
+    )
+
+    results = base.batch([{"method": "GET", "url": p} for p in paths])
+
+    assert len(responses.calls) == 2
+    assert len(results) == 25
+    assert results[3] is None
+    assert results[24] == {"url": "/users/user24@anikalegal.com"}
+    assert results[0] == {"url": "/users/user0@anikalegal.com"}
+
+
+@responses.activate
+def test_batch_fail(base):
+    """Batch method raises an error if a batched request fails."""
+    responses.add(
+        responses.POST,
+        BASE_URL + "$batch",
+        json={"responses": [{"id": "0", "status": 500, "body": {"error": "bad"}}]},
+        status=200,
+    )
+
+    with pytest.raises(requests.HTTPError):
+        base.batch([{"method": "GET", "url": "users/buy.bunny@anikalegal.com"}])
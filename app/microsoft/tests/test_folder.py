@@ -0,0 +1,50 @@
+import pytest
+import responses
+from django.conf import settings
+
+from microsoft.endpoints.folder import FolderEndpoint
+from microsoft.endpoints.helpers import BASE_URL
+
+ITEMS_URL = BASE_URL + f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/items/"
+
+
+@pytest.fixture
+def folder():
+    return FolderEndpoint("1812")
+
+
+@responses.activate
+def test_get_child_if_exists__caches_folders(folder):
+    """Child folders are looked up by name once, then served from the cache."""
+    responses.add(
+        responses.GET,
+        ITEMS_URL + "parent123:/Client%20uploads",
+        json={"id": "abc123", "name": "Client uploads", "folder": {}},
+        status=200,
+    )
+
+    result = folder.get_child_if_exists("Client uploads", "parent123")
+    assert result["id"] == "abc123"
+    result = folder.get_child_if_exists("Client uploads", "parent123")
+    assert result["id"] == "abc123"
+    assert len(responses.calls) == 1
+
+    responses.add(responses.DELETE, ITEMS_URL + "abc123", status=204)
+    folder.delete_file("abc123")
+    folder.get_child_if_exists("Client uploads", "parent123")
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_get_child_if_exists__missing(folder):
+    """Missing children return None and are not cached."""
+    responses.add(
+        responses.GET,
+        ITEMS_URL + "parent123:/file.pdf",
+        json={"error": {"code": "itemNotFound"}},
+        status=404,
+    )
+
+    assert folder.get_child_if_exists("file.pdf", "parent123") is None
+    assert folder.get_child_if_exists("file.pdf", "parent123") is None
+    assert len(responses.calls) == 2
@@ -1,3 +1,4 @@
+from io import StringIO
 from unittest import mock
 import pytest
 
@@ -6,21 +7,31 @@ from microsoft.service import (
     set_up_new_user,
     set_up_new_case,
     add_user_to_case,
+    add_user_to_cases,
+    get_user_permissions,
     remove_user_from_case,
     get_case_folder_info,
+    get_case_files,
+    sync_sharepoint_items,
+    save_email_attachment,
     set_up_coordinator,
     tear_down_coordinator,
 )
 from microsoft.endpoints import MSGraphAPI
-from core.factories import UserFactory, IssueFactory
+from microsoft.models import SharepointItem, SharepointSync
+from core.factories import UserFactory, IssueFactory, EmailFactory, get_dummy_file
+from emails.models import EmailAttachment
 
 from django.conf import settings
+from django.core.management import call_command
 
 
 @pytest.fixture
 def mock_client():
     """Stub helper methods called when MSGraphAPI object is created."""
-    with mock.patch("microsoft.endpoints.create_client") as mock_create_client:
+    with mock.patch(
+        "microsoft.endpoints.helpers.create_client"
+    ) as mock_create_client, mock.patch("microsoft.endpoints.helpers._client", None):
         mock_client = mock.Mock()
         mock_client.acquire_token_silent.return_value = {"access_token": "1812"}
         mock_create_client.return_value = mock_client
@@ -46,6 +57,16 @@ def test_MSGraphAPI(mock_client):
     assert api.folder.headers["Authorization"] == "Bearer 1812"
 
 
+def test_MSGraphAPI__reuses_client_and_session(mock_client):
+    """MSGraphAPI objects share one MSAL client (and its token cache) and one HTTP session."""
+    api_a = MSGraphAPI()
+    api_b = MSGraphAPI()
+
+    assert mock_client.acquire_token_silent.call_count == 2
+    mock_client.acquire_token_for_client.assert_not_called()
+    assert api_a.folder.session is api_b.user.session
+
+
 @pytest.mark.django_db
 def test_set_up_new_user_A(mock_api):
     """Check service function does not create MS account or assign license for existing user."""
@@ -103,6 +124,39 @@ def test_add_user_to_case(mock_api):
     )
 
 
+@pytest.mark.django_db
+def test_add_user_to_cases(mock_api):
+    """Check service function gives user write permissions to many case folders at once."""
+    user = UserFactory()
+    issues = [IssueFactory(), IssueFactory()]
+
+    add_user_to_cases(user, issues)
+
+    mock_api.folder.create_permissions_batch.assert_called_once_with(
+        [f"cases/{issue.id}" for issue in issues], "write", [user.email]
+    )
+
+
+@pytest.mark.django_db
+def test_get_user_permissions(mock_api):
+    """Check service function looks up all of a paralegal's case permissions in one batch."""
+    user = UserFactory()
+    issue_a = IssueFactory(paralegal=user)
+    issue_b = IssueFactory(paralegal=user)
+    mock_api.group.members.return_value = []
+    mock_api.folder.list_permissions_batch.side_effect = lambda paths: [
+        [("1", {"user": {"email": user.email}})] if p == f"cases/{issue_a.id}" else None
+        for p in paths
+    ]
+
+    perms = get_user_permissions(user)
+
+    mock_api.folder.list_permissions_batch.assert_called_once()
+    mock_api.folder.list_permissions.assert_not_called()
+    assert perms["paralegal_perm_issues"] == [issue_a]
+    assert perms["paralegal_perm_missing_issues"] == [issue_b]
+
+
 @pytest.mark.django_db
 def test_remove_user_from_case_A(mock_api):
     """Check service function when there are no permissions on the case folder."""
@@ -234,3 +288,118 @@ def test_tear_down_coordinator_B(mock_api):
     mock_api.group.members.assert_called_once()
     mock_api.user.get.assert_not_called()
     mock_api.group.remove_user.assert_not_called()
+
+
+def _drive_item(item_id, name, parent_id, is_folder=False, **kwargs):
+    item = {
+        "id": item_id,
+        "name": name,
+        "webUrl": f"https://example.sharepoint.com/{name}",
+        "parentReference": {"id": parent_id},
+        "size": 1024,
+        **kwargs,
+    }
+    if is_folder:
+        item["folder"] = {}
+    else:
+        item["file"] = {}
+
+    return item
+
+
+@pytest.mark.django_db
+def test_sync_sharepoint_items(mock_api):
+    """Check the local copy of case folders is built from delta changes and then updated."""
+    issue = IssueFactory()
+    mock_api.folder.get_delta.return_value = [
+        (
+            [
+                _drive_item("root", "root", None, is_folder=True),
+                _drive_item("cases", "cases", "root", is_folder=True),
+                _drive_item("case", str(issue.id), settings.CASES_FOLDER_ID, True),
+                _drive_item("other", "templates", "root", is_folder=True),
+                _drive_item("uploads", "client-uploads", "case", is_folder=True),
+            ],
+            None,
+        ),
+        (
+            [
+                _drive_item("lease", "lease.pdf", "uploads"),
+                _drive_item("notes", "notes.docx", "case"),
+                _drive_item("template", "template.docx", "other"),
+            ],
+            "https://graph/delta?token=1",
+        ),
+    ]
+
+    sync_sharepoint_items()
+
+    mock_api.folder.get_delta.assert_called_once_with(None)
+    assert SharepointSync.objects.get().delta_link == "https://graph/delta?token=1"
+    assert SharepointItem.objects.filter(issue=issue).count() == 4
+    documents, url = get_case_folder_info(issue)
+    assert documents == [
+        ("client-uploads", "https://example.sharepoint.com/client-uploads"),
+        ("notes.docx", "https://example.sharepoint.com/notes.docx"),
+    ]
+    assert url == f"https://example.sharepoint.com/{issue.id}"
+    assert [f["id"] for f in get_case_files(issue)] == ["lease", "notes"]
+    mock_api.folder.get_children.assert_not_called()
+
+    # Next sync picks up where the last one left off.
+    mock_api.folder.get_delta.return_value = [
+        (
+            [
+                {"id": "uploads", "deleted": {}, "parentReference": {"id": "case"}},
+                _drive_item("notes", "notes-v2.docx", "case"),
+            ],
+            "https://graph/delta?token=2",
+        ),
+    ]
+
+    sync_sharepoint_items()
+
+    mock_api.folder.get_delta.assert_called_with("https://graph/delta?token=1")
+    assert SharepointSync.objects.get().delta_link == "https://graph/delta?token=2"
+    assert [f["name"] for f in get_case_files(issue)] == ["notes-v2.docx"]
+
+
+@pytest.mark.django_db
+def test_save_email_attachment__updates_local_copy(mock_api):
+    """Check uploaded attachments are listed without waiting for the next sync."""
+    issue = IssueFactory()
+    case_folder = SharepointItem.objects.create(
+        item_id="case", issue=issue, name=str(issue.id), web_url="", is_folder=True
+    )
+    SharepointItem.objects.create(
+        item_id="old", issue=issue, parent=case_folder, name="old.pdf", is_folder=False
+    )
+    email = EmailFactory(issue=issue)
+    attachment = EmailAttachment.objects.create(
+        email=email, content_type="image/png", file=get_dummy_file("image.png")
+    )
+    mock_api.folder.get_child_if_exists.side_effect = [
+        _drive_item("case", str(issue.id), settings.CASES_FOLDER_ID, True),
+        _drive_item("attachments", "email-attachments", "case", True),
+    ]
+    name = attachment.file.name.split("/")[-1]
+    mock_api.folder.upload_file.return_value = _drive_item("att", name, "attachments")
+
+    save_email_attachment(email, attachment)
+
+    assert [f["id"] for f in get_case_files(issue)] == ["att", "old"]
+    documents, _ = get_case_folder_info(issue)
+    assert [name for name, _ in documents] == ["email-attachments", "old.pdf"]
+    mock_api.folder.get_all_files.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_sync_sharepoint_items_command__full(mock_api):
+    """Check a full sync ignores the last delta link."""
+    SharepointSync.objects.create(delta_link="https://graph/delta?token=1")
+    mock_api.folder.get_delta.return_value = [([], "https://graph/delta?token=2")]
+
+    call_command("sync_sharepoint_items", "--full", stdout=StringIO())
+
+    mock_api.folder.get_delta.assert_called_once_with(None)
+    assert SharepointSync.objects.get().delta_link == "https://graph/delta?token=2"
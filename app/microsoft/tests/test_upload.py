@@ -0,0 +1,93 @@
+import io
+import json
+from unittest import mock
+
+import pytest
+import requests
+import responses
+
+from microsoft.endpoints import folder
+from microsoft.endpoints.folder import UploadSession
+
+UPLOAD_URL = "https://sn3302.up.1drv.com/up/fe6987415ace7X4e1eF866337"
+
+
+class FakeFile(io.BytesIO):
+    @property
+    def size(self):
+        return len(self.getvalue())
+
+
+@pytest.fixture
+def upload_session():
+    with mock.patch.object(folder, "UPLOAD_CHUNK_SIZE", 10), mock.patch.object(
+        folder, "UPLOAD_RETRY_DELAY", 0
+    ):
+        yield UploadSession(
+            requests.Session(), UPLOAD_URL, {"Authorization": "Bearer 1812"}, 5
+        )
+
+
+def _get_range(request):
+    return request.headers["Content-Range"]
+
+
+@responses.activate
+def test_upload_session__uploads_chunks(upload_session):
+    """Upload sends the file in chunks and returns the driveItem from the last response."""
+    file = FakeFile(b"a" * 25)
+
+    def put_callback(request):
+        start, end = _get_range(request)[6:].split("/")[0].split("-")
+        if int(end) == 24:
+            return 201, {}, json.dumps({"id": "abc123", "name": "file.pdf"})
+        return 202, {}, json.dumps({"nextExpectedRanges": [f"{int(end) + 1}-"]})
+
+    responses.add_callback(responses.PUT, UPLOAD_URL, callback=put_callback)
+
+    result = upload_session.upload(file)
+
+    assert result == {"id": "abc123", "name": "file.pdf"}
+    assert [_get_range(c.request) for c in responses.calls] == [
+        "bytes 0-9/25",
+        "bytes 10-19/25",
+        "bytes 20-24/25",
+    ]
+
+
+@responses.activate
+def test_upload_session__resumes_failed_chunk(upload_session):
+    """Upload retries a failed chunk from the range that the session expects next."""
+    file = FakeFile(b"a" * 20)
+    responses.add(
+        responses.PUT, UPLOAD_URL, json={"nextExpectedRanges": ["10-"]}, status=202
+    )
+    responses.add(responses.PUT, UPLOAD_URL, status=500)
+    responses.add(
+        responses.GET, UPLOAD_URL, json={"nextExpectedRanges": ["10-19"]}, status=200
+    )
+    responses.add(responses.PUT, UPLOAD_URL, json={"id": "abc123"}, status=201)
+
+    result = upload_session.upload(file)
+
+    assert result == {"id": "abc123"}
+    ranges = [
+        _get_range(c.request) for c in responses.calls if c.request.method == "PUT"
+    ]
+    assert ranges == ["bytes 0-9/20", "bytes 10-19/20", "bytes 10-19/20"]
+
+
+@responses.activate
+def test_upload_session__gives_up_after_retries(upload_session):
+    """Upload raises an error if a chunk keeps failing."""
+    file = FakeFile(b"a" * 20)
+    responses.add(responses.PUT, UPLOAD_URL, status=500)
+    responses.add(
+        responses.GET, UPLOAD_URL, json={"nextExpectedRanges": ["0-"]}, status=200
+    )
+
+    with pytest.raises(requests.HTTPError):
+        upload_session.upload(file)
+
+    put_calls = [c for c in responses.calls if c.request.method == "PUT"]
+    assert len(put_calls) == folder.UPLOAD_MAX_RETRIES + 1
@@ -20,12 +20,8 @@ def pre_save_issue(sender, instance, **kwargs):
     Detect state changes for notifications
     """
     issue = instance
-    if not issue.pk:
-        return
-
-    try:
-        prev_issue = Issue.objects.get(pk=issue.pk)
-    except Issue.DoesNotExist:
+    prev_issue = issue.get_prev_issue()
+    if not prev_issue:
         return
 
     if issue.stage != prev_issue.stage:
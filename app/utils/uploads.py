@@ -1,6 +1,9 @@
 import hashlib
 from django.utils.text import slugify
 
+# Read files 1MB at a time when hashing them.
+HASH_CHUNK_SIZE = 1024 * 1024
+
 
 def get_s3_key(model, filename: str):
     """
@@ -9,9 +12,20 @@ def get_s3_key(model, filename: str):
 
     Assumes model has a FileField named 'file' and an attribute UPLOAD_KEY.
     """
-    file = model.file
-    file_bytes = file.read()
-    file.seek(0)
-    file_hash = hashlib.md5(file_bytes).hexdigest()
+    file_hash = get_file_hash(model.file)
     new_filename = ".".join([slugify(p) for p in filename.split(".")]).lower()
     return f"{model.UPLOAD_KEY}/{file_hash}/{new_filename}"
+
+
+def get_file_hash(file) -> str:
+    """
+    Returns the MD5 hash of the file, reading it in chunks so that large files
+    (which Django spools to disk on upload) are never held in memory all at once.
+    Leaves the file at the start so that it can be streamed to storage afterwards.
+    """
+    file_hash = hashlib.md5()
+    for chunk in file.chunks(chunk_size=HASH_CHUNK_SIZE):
+        file_hash.update(chunk)
+
+    file.seek(0)
+    return file_hash.hexdigest()
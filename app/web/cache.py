@@ -0,0 +1,51 @@
+import hashlib
+from functools import wraps
+
+from django.core.cache import caches
+from django.middleware.csrf import get_token
+
+PAGE_CACHE = "pages"
+
+
+def cache_public_page(view):
+    """
+    Caches the responses of a public page for anonymous visitors.
+    Logged in users always get a freshly rendered page.
+    The cache is cleared when Wagtail pages are published, see wagtail_hooks.py.
+    """
+
+    @wraps(view)
+    def cached_view(request, *args, **kwargs):
+        if request.method != "GET" or request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+
+        cache = caches[PAGE_CACHE]
+        cache_key = _get_cache_key(request)
+        response = cache.get(cache_key)
+        if response is not None:
+            # Cached pages read the CSRF token from the cookie, so make sure it is set.
+            get_token(request)
+            return response
+
+        response = view(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        if hasattr(response, "render") and not response.is_rendered:
+            response.add_post_render_callback(lambda r: cache.set(cache_key, r))
+        else:
+            cache.set(cache_key, response)
+
+        return response
+
+    return cached_view
+
+
+def clear_page_cache():
+    caches[PAGE_CACHE].clear()
+
+
+def _get_cache_key(request):
+    url = f"{request.get_host()}{request.get_full_path()}"
+    url_hash = hashlib.md5(url.encode()).hexdigest()
+    return f"public-page-{url_hash}"
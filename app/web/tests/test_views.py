@@ -2,9 +2,12 @@ import json
 
 import pytest
 from django.urls import reverse
-from django.test import RequestFactory
+from django.test import RequestFactory, override_settings
 from django.db import transaction
 
+from core.factories import IssueFactory
+from core.models.issue import CaseTopic
+from core.services.reporting import update_issue_daily_metrics
 from webhooks.models import WebflowContact
 from web.models import RootPage, BlogListPage, BlogPage
 
@@ -82,3 +85,56 @@ def test_contact_form(client):
 
 def streamfield(text):
     return json.dumps([{"type": "paragraph", "value": text}])
+
+
+@pytest.mark.django_db
+def test_impact_view_counts(client):
+    """
+    The impact page counts serviced issues from the daily issue metrics.
+    """
+    with DisableSignals():
+        IssueFactory(topic=CaseTopic.REPAIRS, provided_legal_services=True)
+        IssueFactory(topic=CaseTopic.REPAIRS, provided_legal_services=True)
+        IssueFactory(topic=CaseTopic.BONDS, provided_legal_services=True)
+        IssueFactory(topic=CaseTopic.BONDS, provided_legal_services=False)
+
+    resp = client.get(reverse("impact"))
+    assert resp.context["repairs_advice_count"] == 0
+    update_issue_daily_metrics()
+    resp = client.get(reverse("impact"))
+    assert resp.context["repairs_advice_count"] == 2
+    assert resp.context["evictions_advice_count"] == 0
+    assert resp.context["bonds_advice_count"] == 1
+
+
+PAGE_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "pages": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+@pytest.mark.django_db
+@override_settings(CACHES=PAGE_CACHES)
+def test_public_page_cache(client, django_user_model, blog_list_page):
+    """
+    Public pages are cached for anonymous users until a page is published.
+    """
+    url = reverse("about")
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert resp.context is not None
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert resp.context is None  # Served from the cache without rendering.
+    assert "csrftoken" in resp.cookies
+
+    # Publishing a page clears the cache.
+    blog_list_page.save_revision().publish()
+    resp = client.get(url)
+    assert resp.context is not None
+
+    # Logged in users are never served cached pages.
+    user = django_user_model.objects.create_user(username="staff", password="pw")
+    client.force_login(user)
+    resp = client.get(url)
+    assert resp.context is not None
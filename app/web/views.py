@@ -4,16 +4,17 @@ from django.shortcuts import render
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.utils import timezone
 
 from .models import BlogListPage, DashboardItem
 from .forms import ContactForm, ContentFeebackForm
+from .cache import cache_public_page
 
-from core.models import Issue
 from core.models.issue import CaseTopic
+from core.services.reporting import get_serviced_issue_counts
 
 
 @require_http_methods(["GET"])
+@cache_public_page
 def robots_view(request):
     """robots.txt for web crawlers"""
     return render(request, "web/robots.txt", content_type="text/plain")
@@ -22,7 +23,7 @@ def robots_view(request):
 @require_http_methods(["GET"])
 def landing_view(request):
     form = ContactForm()
-    issues_serviced = Issue.objects.filter(provided_legal_services=True).count()
+    issues_serviced = sum(get_serviced_issue_counts().values())
     context = {
         "form": form,
         "testimonials": TESTIMONIALS,
@@ -33,13 +34,10 @@ def landing_view(request):
 
 @require_http_methods(["GET"])
 def impact_view(request):
-    start_time = timezone.now() - timezone.timedelta(days=365)
-    issues_serviced = Issue.objects.filter(
-        created_at__gte=start_time, provided_legal_services=True
-    )
-    repairs_count = issues_serviced.filter(topic=CaseTopic.REPAIRS).count()
-    evictions_count = issues_serviced.filter(topic=CaseTopic.EVICTION).count()
-    bonds_count = issues_serviced.filter(topic=CaseTopic.BONDS).count()
+    issues_serviced = get_serviced_issue_counts(num_days=365)
+    repairs_count = issues_serviced.get(CaseTopic.REPAIRS, 0)
+    evictions_count = issues_serviced.get(CaseTopic.EVICTION, 0)
+    bonds_count = issues_serviced.get(CaseTopic.BONDS, 0)
     context = {
         "repairs_advice_count": repairs_count,
         "evictions_advice_count": evictions_count,
@@ -90,6 +88,7 @@ def content_feedback_form_view(request):
 
 
 @require_http_methods(["GET"])
+@cache_public_page
 def team_view(request):
     return render(
         request,
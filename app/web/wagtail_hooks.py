@@ -1,11 +1,14 @@
+from django.dispatch import receiver
 from django.utils.html import format_html
 from django.templatetags.static import static
 
 from wagtail.core import hooks
+from wagtail.core.signals import page_published, page_unpublished
 
 from wagtail.contrib.modeladmin.options import ModelAdmin, modeladmin_register
 
 from .models import ExternalNews, DashboardItem
+from .cache import clear_page_cache
 
 
 @hooks.register("insert_global_admin_css")
@@ -15,6 +18,21 @@ def global_admin_css():
     )
 
 
+@hooks.register("after_delete_page")
+@hooks.register("after_move_page")
+def clear_page_cache_hook(request, page):
+    clear_page_cache()
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def clear_page_cache_on_publish(sender, **kwargs):
+    """
+    Clear cached pages when a page is published, including scheduled publishing.
+    """
+    clear_page_cache()
+
+
 class ExternalNewsAdmin(ModelAdmin):
     model = ExternalNews
     menu_label = "External News"